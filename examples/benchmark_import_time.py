@@ -0,0 +1,64 @@
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Modules that are imported by short-lived workers and command line calls
+MODULES = ["pytsp.structures.Instance", "pytsp.methods.nearest_neighbor", "pytsp.methods.k_opt",
+           "pytsp.methods.christofides", "pytsp.structures.Experiment"]
+
+# Dependencies that must only be imported when they are used (plots, results, optional solver backends)
+HEAVY_DEPENDENCIES = ["pandas", "plotly", "tsplib95", "networkx", "pyvrp", "lk_heuristic", "scipy"]
+
+
+def measure_import(module: str):
+    """
+    Import a module in a fresh interpreter.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        tuple: (import time in seconds, list of heavy dependencies loaded by the import).
+    """
+    code = ("import sys, time\n"
+            "start = time.perf_counter()\n"
+            f"import {module}\n"
+            "runtime = time.perf_counter() - start\n"
+            f"print(runtime, *[name for name in {HEAVY_DEPENDENCIES!r} if name in sys.modules])")
+    output = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).resolve().parent.parent,
+                            capture_output=True, text=True, check=True).stdout.split()
+    return float(output[0]), output[1:]
+
+
+def benchmark_import_time(repetitions: int = 5, max_seconds: float = None):
+    """
+    Print the median import time of the pytsp modules and the heavy dependencies they load.
+
+    Args:
+        repetitions (int): Number of fresh interpreters per module (default is 5).
+        max_seconds (float, optional): Fail if a median import time exceeds this limit.
+
+    Returns:
+        bool: Whether all modules stayed within the limit and loaded no heavy dependency.
+    """
+    passed = True
+    for module in MODULES:
+        runs = [measure_import(module) for _ in range(repetitions)]
+        median = statistics.median(runtime for runtime, _ in runs)
+        loaded = sorted(set().union(*(dependencies for _, dependencies in runs)))
+
+        passed &= not loaded and (max_seconds is None or median <= max_seconds)
+        print(f"{module:<36} {1000 * median:7.1f} ms   heavy dependencies: {', '.join(loaded) or '-'}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the import time of the pytsp modules.")
+    parser.add_argument("--repetitions", type=int, default=5, help="Number of fresh interpreters per module (default is 5)")
+    parser.add_argument("--max-seconds", type=float, default=None, help="Fail if a median import time exceeds this limit")
+    arguments = parser.parse_args()
+
+    sys.exit(0 if benchmark_import_time(repetitions=arguments.repetitions, max_seconds=arguments.max_seconds) else 1)
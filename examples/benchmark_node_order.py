@@ -0,0 +1,102 @@
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+
+def nearest_neighbor_tour(instance):
+    """
+    Build a nearest neighbor tour by node index (starting at index 0).
+
+    Args:
+        instance (Instance): The TSP instance.
+
+    Returns:
+        np.ndarray: The node indices in tour order.
+    """
+    matrix = instance.get_distance_matrix()
+    n = instance.number_of_stops
+    visited = np.zeros(n, dtype=bool)
+    tour = np.empty(n, dtype=np.int64)
+    tour[0] = 0
+    visited[0] = True
+    for step in range(1, n):
+        row = matrix[tour[step - 1]].astype(np.float64)
+        row[visited] = np.inf
+        tour[step] = row.argmin()
+        visited[tour[step]] = True
+    return tour
+
+
+def two_opt_throughput(instance, tour: np.ndarray, k: int = 10, repetitions: int = 20):
+    """
+    Measure how many candidate 2-opt moves per second can be evaluated on a tour.
+
+    For every tour edge (a, b) and every candidate c of a with successor d, the move replaces the edges
+    (a, b) and (c, d) by (a, c) and (b, d). All n * k moves are evaluated with batched matrix lookups,
+    so the runtime is dominated by the memory access pattern into the distance matrix.
+
+    Args:
+        instance (Instance): The TSP instance.
+        tour (np.ndarray): The node indices in tour order.
+        k (int): Number of candidates per node (default is 10).
+        repetitions (int): Number of timed evaluations of the whole neighborhood (default is 20).
+
+    Returns:
+        tuple: (moves per second, number of improving moves).
+    """
+    n = instance.number_of_stops
+    successor = np.empty(n, dtype=np.int64)
+    successor[tour] = np.roll(tour, -1)
+
+    a = np.repeat(np.arange(n), k)
+    c = instance.get_candidates(k=k).ravel().astype(np.int64)
+    b, d = successor[a], successor[c]
+
+    start = perf_counter()
+    for _ in range(repetitions):
+        gain = instance.weights(a, b) + instance.weights(c, d) - instance.weights(a, c) - instance.weights(b, d)
+    runtime = perf_counter() - start
+
+    return repetitions * len(a) / runtime, int((gain > 0).sum())
+
+
+def benchmark_node_order(name: str = "rl11849", k: int = 10, repetitions: int = 20):
+    """
+    Compare the 2-opt move evaluation throughput of an instance in TSPLIB, Hilbert and Morton node order.
+
+    All orders evaluate the same nearest neighbor tour and the same candidate lists (permuted with the nodes),
+    so they do exactly the same work and only differ in where the accessed weights lie in memory.
+
+    Args:
+        name (str): The TSPLIB instance (default is rl11849).
+        k (int): Number of candidates per node (default is 10).
+        repetitions (int): Number of timed evaluations of the whole neighborhood (default is 20).
+    """
+    from pytsp.structures.Instance import create_instance_from_file
+
+    instance = create_instance_from_file(name=name)
+    instance.get_distance_matrix()
+    instance.get_candidates(k=k)
+    tour = nearest_neighbor_tour(instance)
+    print(f"{instance.get_info()}, distance matrix: {instance.get_distance_matrix().nbytes / 2**20:.0f} MB")
+
+    orders = {"tsplib": instance, "hilbert": instance.reorder("hilbert"), "morton": instance.reorder("morton")}
+
+    for label, ordered in orders.items():
+        # Map the tour into the index space of the reordered instance
+        inverse = np.empty(instance.number_of_stops, dtype=np.int64)
+        inverse[ordered.to_parent_indices(np.arange(instance.number_of_stops))] = np.arange(instance.number_of_stops)
+
+        moves_per_second, improving_moves = two_opt_throughput(ordered, inverse[tour], k=k, repetitions=repetitions)
+        print(f"  {label:>8} order: {moves_per_second / 1e6:6.1f} M moves/s ({improving_moves} improving moves)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark 2-opt move evaluation with locality-preserving node orders.")
+    parser.add_argument("--name", default="rl11849", help="TSPLIB instance (default is rl11849)")
+    parser.add_argument("--k", type=int, default=10, help="Number of candidates per node (default is 10)")
+    parser.add_argument("--repetitions", type=int, default=20, help="Number of timed neighborhood evaluations (default is 20)")
+    arguments = parser.parse_args()
+
+    benchmark_node_order(name=arguments.name, k=arguments.k, repetitions=arguments.repetitions)
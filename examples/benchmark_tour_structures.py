@@ -0,0 +1,52 @@
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+
+def benchmark_tour_structures(sizes=(10000, 30000, 85900), reversals: int = 2000, seed: int = 0):
+    """
+    Compare the reversal and query times of the array tour and the two-level list tour.
+
+    Both structures start from the same random route and perform the same random 2-opt reversals,
+    followed by the same succ() and between() queries.
+
+    Args:
+        sizes (tuple): Numbers of nodes (default is 10000, 30000 and 85900, the size of pla85900).
+        reversals (int): Number of timed reversals (and queries) per structure (default is 2000).
+        seed (int): Seed of the random routes and reversals (default is 0).
+    """
+    from pytsp.structures.ArrayTour import ArrayTour
+    from pytsp.structures.TwoLevelListTour import TwoLevelListTour
+
+    for n in sizes:
+        rng = np.random.default_rng(seed)
+        route = rng.permutation(n)
+        pairs = np.sort(rng.integers(0, n, size=(reversals, 2)), axis=1).tolist()
+        nodes = rng.integers(0, n, size=(reversals, 3)).tolist()
+
+        for structure in (ArrayTour, TwoLevelListTour):
+            tour = structure(route)
+
+            start = perf_counter()
+            for i, j in pairs:
+                tour.reverse(i, j)
+            reversal_time = (perf_counter() - start) / reversals
+
+            start = perf_counter()
+            for a, b, c in nodes:
+                tour.succ(a)
+                tour.between(a, b, c)
+            query_time = (perf_counter() - start) / reversals
+
+            print(f"n={n:>6} {structure.__name__:>16}: {1e6 * reversal_time:7.1f} us/reversal, {1e6 * query_time:5.1f} us/query")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the array tour against the two-level list tour.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 30000, 85900], help="Numbers of nodes (default is 10000 30000 85900)")
+    parser.add_argument("--reversals", type=int, default=2000, help="Number of timed reversals per structure (default is 2000)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random routes and reversals (default is 0)")
+    arguments = parser.parse_args()
+
+    benchmark_tour_structures(sizes=arguments.sizes, reversals=arguments.reversals, seed=arguments.seed)
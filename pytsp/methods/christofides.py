@@ -1,6 +1,5 @@
 from time import time
 from .utils import Instance, SolutionMethod, Tour
-from networkx.algorithms.approximation import christofides
 
 class Christofidesx(SolutionMethod):
     """
@@ -37,7 +36,8 @@ class Christofidesx(SolutionMethod):
             # Create networkx graph (directly via TSPLIB)
             graph = instance.TSPLIB.get_graph()
 
-            # Solve via christofides (from networkx)
+            # Solve via christofides (from networkx, imported here since networkx takes long to import)
+            from networkx.algorithms.approximation import christofides
             sequence = christofides(G=graph)
 
             # Covert to a sequence of node objects
@@ -0,0 +1,212 @@
+from time import time
+import numpy as np
+from .utils import Instance, SolutionMethod, Tour
+from pytsp.structures.candidates import pair_weights
+from pytsp.structures.SpatialGrid import SpatialGrid
+
+
+def candidate_edges(instance: Instance, k: int = 10):
+    """
+    Collect the undirected edges of the candidate graph, sorted by weight.
+
+    Args:
+        instance (Instance): The (symmetric) TSP instance.
+        k (int): Number of candidates per node (default is 10).
+
+    Returns:
+        tuple: (u, v) int64 arrays with u < v, sorted by weight (ties by u, then v).
+    """
+    n = instance.number_of_stops
+    neighbors = instance.get_candidates(k=min(k, n - 1)).astype(np.int64)
+
+    # Every edge once, no matter whether one or both of its nodes list the other as a candidate
+    sources = np.repeat(np.arange(n), neighbors.shape[1])
+    targets = neighbors.ravel()
+    keys = np.unique(np.minimum(sources, targets) * n + np.maximum(sources, targets))
+    u, v = keys // n, keys % n
+
+    order = np.lexsort((keys, pair_weights(instance, u, v)))
+    return u[order], v[order]
+
+
+def _find(parent: list, i: int):
+    """
+    Return the representative of the set of i (union-find with path halving).
+    """
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+class GreedyEdge(SolutionMethod):
+    """
+    Greedy edge (multi-fragment) heuristic: take the shortest edges that keep all node degrees at most 2
+    and close no cycle, until the fragments form a single path.
+
+    The edges are undirected, so only symmetric instances are supported.
+    """
+
+    def __init__(self, logging_level: int = 30, k: int = 10):
+        """
+        Initialize the greedy edge heuristic.
+
+        Args:
+            logging_level (int): Controls verbosity of output. Levels: NOTSET(0), DEBUG(10), INFO(20), WARNING(30), ERROR(40), CRITICAL(50)
+            k (int): Number of candidates per node whose edges are considered (default is 10).
+        """
+
+        # Initialize core attributes for the solution method
+        super().__init__(name="Greedy Edge",
+                         info=f"k={k}",
+                         logging_level=logging_level)
+
+        self.k = k
+
+    def solve(self, instance: Instance) -> Tour:
+        """
+        Solve a TSP instance using the greedy edge heuristic.
+
+        Only the edges of the candidate graph are sorted (O(n k log(n k)) instead of O(n^2 log n) for all
+        edges). Node degrees are kept in an array and fragments in a union-find structure. Once the
+        candidate edges are used up, the matching continues on the candidate graph of the free endpoints
+        (a subset instance), which shrinks with every round. Fragments that still remain are joined
+        nearest-endpoint first (with a SpatialGrid of the free endpoints if the instance allows it).
+
+        Args:
+            instance (Instance): An instance of the TSP instance class.
+
+        Returns:
+            Tour: A Tour object containing the computed sequence and metadata.
+
+        Raises:
+            ValueError: If the instance is asymmetric.
+        """
+        if not instance.is_symmetric():
+            raise ValueError(f"The greedy edge heuristic requires a symmetric instance, but {instance.name} is asymmetric.")
+
+        # Start timing the algorithm
+        start_time = time()
+
+        n = instance.number_of_stops
+        degree = [0] * n
+        parent = list(range(n))
+        neighbors = [[] for _ in range(n)]
+        number_of_edges = 0
+
+        # Greedy matching on the candidate graph, then again on the candidate graph of the free endpoints
+        # (nodes with degree < 2), until a single path remains or no candidate edge can be added
+        endpoints = np.arange(n)
+        while number_of_edges < n - 1:
+            sub_instance = instance if len(endpoints) == n else instance.subset(endpoints)
+            u, v = candidate_edges(sub_instance, k=self.k)
+            added = self._add_edges(endpoints[u].tolist(), endpoints[v].tolist(), degree, parent, neighbors, n - 1 - number_of_edges)
+            if added == 0:
+                break
+
+            number_of_edges += added
+            endpoints = np.flatnonzero(np.array(degree) < 2)
+
+        # Join the remaining fragments (paths and single nodes) at their free endpoints
+        self.logger.info(f"Greedy matching left {n - number_of_edges} fragments.")
+        route = self._join_fragments(instance, neighbors, endpoints)
+
+        # Let the tour start at the first node and add the return trip
+        route = np.roll(route, -int(np.flatnonzero(route == 0)[0]))
+        route = np.append(route, route[0])
+
+        # Create and return the final tour object
+        tour = Tour(
+            instance=instance,
+            solution_method=self,
+            sequence=route,
+            runtime_in_sec=time() - start_time
+        )
+
+        return tour
+
+    @staticmethod
+    def _add_edges(sources: list, targets: list, degree: list, parent: list, neighbors: list, max_edges: int):
+        """
+        Add the given edges in order, skipping those that exceed degree 2 or close a cycle.
+
+        Args:
+            sources, targets (list): The end nodes of the edges, sorted by weight.
+            degree (list): The degree of every node (updated in place).
+            parent (list): The union-find parents of the fragments (updated in place).
+            neighbors (list): The fragment neighbors of every node (updated in place).
+            max_edges (int): Stop after adding this many edges.
+
+        Returns:
+            int: The number of added edges.
+        """
+        added = 0
+        for u, v in zip(sources, targets):
+            if degree[u] == 2 or degree[v] == 2:
+                continue
+            root_u, root_v = _find(parent, u), _find(parent, v)
+            if root_u == root_v:
+                continue
+
+            parent[root_u] = root_v
+            degree[u] += 1
+            degree[v] += 1
+            neighbors[u].append(v)
+            neighbors[v].append(u)
+            added += 1
+            if added == max_edges:
+                break
+
+        return added
+
+    def _join_fragments(self, instance: Instance, neighbors: list, endpoints: np.ndarray):
+        """
+        Chain the fragments into one route, always continuing with the fragment whose endpoint is nearest.
+
+        Args:
+            instance (Instance): The TSP instance.
+            neighbors (list): The (at most 2) fragment neighbors of every node.
+            endpoints (np.ndarray): The nodes with less than 2 neighbors, in increasing order.
+
+        Returns:
+            np.ndarray: The node indices in route order.
+        """
+        # Free endpoints are looked up in a spatial grid (all other nodes are removed), or by scanning them
+        try:
+            grid = SpatialGrid(instance)
+            is_endpoint = np.zeros(instance.number_of_stops, dtype=bool)
+            is_endpoint[endpoints] = True
+            for node in np.flatnonzero(~is_endpoint).tolist():
+                grid.remove(node)
+        except ValueError:
+            grid = None
+        free = np.ones(len(endpoints), dtype=bool)
+        position = {node: i for i, node in enumerate(endpoints.tolist())}
+
+        route = []
+        node = int(endpoints[0])
+        while True:
+            # Walk along the fragment to its other end
+            fragment_start, previous = node, -1
+            while True:
+                route.append(node)
+                following = [neighbor for neighbor in neighbors[node] if neighbor != previous]
+                if not following:
+                    break
+                previous, node = node, following[0]
+
+            # Both ends of the fragment are no longer free (a single node is both ends)
+            for end in {fragment_start, route[-1]}:
+                free[position[end]] = False
+                if grid is not None:
+                    grid.remove(end)
+
+            if not free.any():
+                return np.array(route, dtype=np.int64)
+
+            if grid is not None:
+                node = grid.nearest(route[-1])
+            else:
+                candidates = endpoints[free]
+                weights = pair_weights(instance, np.full(len(candidates), route[-1]), candidates)
+                node = int(candidates[weights.argmin()])
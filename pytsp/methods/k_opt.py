@@ -1,7 +1,9 @@
 from time import time
 from .utils import Instance, SolutionMethod, Tour, get_sequence_weight
 from pytsp.methods.nearest_neighbor import NearestNeighbor
-from enum import Enum
+from pytsp.structures import moves
+from pytsp.structures.TwoLevelListTour import create_working_tour
+from pytsp.structures.moves import OptCase
 import numpy as np
 
 class TwoOpt(SolutionMethod):
@@ -9,21 +11,24 @@ class TwoOpt(SolutionMethod):
     Author: Matej Gazda (gazda.matej@gmail.com)
     """
 
-    def __init__(self, logging_level: int = 30, max_runtime_in_sec: float = 3):
+    def __init__(self, logging_level: int = 30, max_runtime_in_sec: float = 3, k: int = None):
         """
         Initialize the 2-Opt heuristic.
 
         Args:
             logging_level (int): Controls verbosity of output. Levels: NOTSET(0), DEBUG(10), INFO(20), WARNING(30), ERROR(40), CRITICAL(50)
             max_runtime_in_sec (int): Max. runtime in seconds
+            k (int, optional): Only try moves that add an edge from a node to one of its k nearest candidates
+                (see candidate_pairs) (default is None, try all pairs of positions).
         """
 
         # Initialize core attributes for the solution method
         super().__init__(name="2-opt", 
-                         info=f"max_runtime_in_sec={max_runtime_in_sec}", 
+                         info=f"max_runtime_in_sec={max_runtime_in_sec}" + (f", k={k}" if k else ""), 
                          logging_level=logging_level)
 
         self.max_runtime_in_sec = max_runtime_in_sec
+        self.k = k
 
 
     def solve(self, instance: Instance, tour: Tour = None) -> Tour:
@@ -47,8 +52,8 @@ class TwoOpt(SolutionMethod):
             tour = NearestNeighbor(logging_level=self.logger.level).solve(instance=instance)
 
         # Initialize the best known route and its cost
-        best_found_route = np.array(tour.sequence[:-1]) # Convert the initial tour (excluding the return to start) to a NumPy array
-        best_found_route_cost = get_sequence_weight(instance=instance, sequence=tour.sequence)
+        best_found_route = create_working_tour(tour.indices[:-1]) # Node indices of the initial tour (excluding the return to start)
+        best_found_route_cost = tour.get_total_weight()
 
         # Flag to track the functions runtime, improvements, and stat
         improved = True
@@ -56,62 +61,53 @@ class TwoOpt(SolutionMethod):
         initial_cost = best_found_route_cost
         count_improvements = 0
 
+        # Reversals change the weight of the reversed segment on asymmetric instances (exact, but O(n) deltas)
+        symmetric = instance.is_symmetric()
+
+        # Candidate lists restrict the moves to O(n k) pairs instead of O(n^2)
+        n = len(best_found_route)
+        candidate_lists = instance.get_candidates(k=min(self.k, n - 1)) if self.k and n > 3 else None
+
         # Repeat optimization until no improvement or time limit is reached
         while improved and below_max_runtime:
             improved = False
-            best_candidate_route = best_found_route.copy()
-            best_candidate_cost = best_found_route_cost
-
-            # Try all possible 2-opt swaps (i, k) where i < k
-            for i in range(1, len(best_found_route) - 1):
-                if improved or not below_max_runtime:
-                    break   # Restart outer loop after improvement or break after time limit
-
-                for k in range(i + 1, len(best_found_route) - 1):
-                    # Check if the time limit has been exceeded before continuing with the swap                    
-                    if (time() - start_time) > self.max_runtime_in_sec:
-                        self.logger.info(f"Stopping optimization early (time limit of {self.max_runtime_in_sec} seconds).")
-                        below_max_runtime = False
-                        break   # Stop method
-
-                    # Perform 2-opt swap: reverse the segment between i and k
-                    new_route = np.concatenate((
-                        best_found_route[:i],               # segment before i
-                        best_found_route[i:k + 1][::-1],    # reversed segment i to k
-                        best_found_route[k + 1:]            # segment after k
-                    ))
-
-                    # Calculate the cost of the new route
-                    new_route_cost = get_sequence_weight(
-                        instance=instance,
-                        sequence=new_route.tolist(),
-                        add_return_to_start=True
-                    )
-
-                    # If the new route is better, keep it as the best candidate
-                    if new_route_cost < best_candidate_cost:
-                        best_candidate_cost = new_route_cost
-                        best_candidate_route = new_route.copy()
-                        improved = True
-                        count_improvements += 1
-                        break   # Restart outer loop after improvement
-
-            # If any improvement was found, update the best known route
-            if improved:
-                best_found_route = best_candidate_route.copy()
-                best_found_route_cost = best_candidate_cost
+
+            # Try all possible 2-opt swaps (i, k) where i < k, or those of the candidate pairs
+            if candidate_lists is None:
+                pairs = ((i, k) for i in range(1, n - 1) for k in range(i + 1, n - 1))
+            else:
+                pairs = candidate_pairs(instance, best_found_route, candidate_lists)
+
+            for i, k in pairs:
+                # Check if the time limit has been exceeded before continuing with the swap                    
+                if (time() - start_time) > self.max_runtime_in_sec:
+                    self.logger.info(f"Stopping optimization early (time limit of {self.max_runtime_in_sec} seconds).")
+                    below_max_runtime = False
+                    break   # Stop method
+
+                # Cost change of the 2-opt swap: reverse the segment between i and k
+                delta = moves.two_opt_delta(instance, best_found_route, i, k, symmetric=symmetric)
+
+                # If the new route is better, apply the swap
+                if delta < 0:
+                    moves.apply_two_opt(best_found_route, i, k)
+                    best_found_route_cost += delta
+                    improved = True
+                    count_improvements += 1
+                    break   # Restart outer loop after improvement
         
         # Add the starting node to the end to complete the cycle
+        best_found_route = best_found_route.route()
         best_found_route = np.append(best_found_route, best_found_route[0])
 
         # Print statistics
-        self.logger.info(f"Initial tour improved from {initial_cost} to {best_candidate_cost} after {count_improvements} improvements.")
+        self.logger.info(f"Initial tour improved from {initial_cost} to {best_found_route_cost} after {count_improvements} improvements.")
 
         # Create and return the final Tour object
         return Tour(
             instance=instance,
             solution_method=self,
-            sequence=best_found_route.tolist(),
+            sequence=best_found_route,
             runtime_in_sec=time() - start_time
         )
 
@@ -121,21 +117,24 @@ class ThreeOpt(SolutionMethod):
     Author: Matej Gazda (gazda.matej@gmail.com)
     """
     
-    def __init__(self, logging_level: int = 30, max_runtime_in_sec: float = 3):
+    def __init__(self, logging_level: int = 30, max_runtime_in_sec: float = 3, k: int = None):
         """
         Initialize the 3-Opt heuristic.
 
         Args:
             logging_level (int): Controls verbosity of output. Levels: NOTSET(0), DEBUG(10), INFO(20), WARNING(30), ERROR(40), CRITICAL(50)
             max_runtime_in_sec (int): Max. runtime in seconds
+            k (int, optional): Only try segment combinations whose split points are next to the k nearest
+                candidates of the nodes before them (see candidate_segments) (default is None, try all combinations).
         """
 
         # Initialize core attributes for the solution method
         super().__init__(name="3-opt", 
-                         info=f"max_runtime_in_sec={max_runtime_in_sec}", 
+                         info=f"max_runtime_in_sec={max_runtime_in_sec}" + (f", k={k}" if k else ""), 
                          logging_level=logging_level)
 
         self.max_runtime_in_sec = max_runtime_in_sec
+        self.k = k
 
     def solve(self, instance: Instance, tour: Tour = None) -> Tour:
         """
@@ -157,63 +156,60 @@ class ThreeOpt(SolutionMethod):
             self.logger.info("Creating initial tour via Nearest Neighbor heuristic")
             tour = NearestNeighbor(logging_level=self.logger.level).solve(instance=instance)
 
-        # Convert the initial tour to a NumPy array (excluding the return to start)
-        route = np.array(tour.sequence[:-1])
+        # Node indices of the initial tour (excluding the return to start)
+        route = tour.indices[:-1]
 
         # Initialize cost tracking for each 3-opt case
         moves_cost = {opt_case: 0 for opt_case in OptCase}
 
         # Initialize improvement flag and best known route
         improved = True
-        best_found_route = route.copy()
+        best_found_route = create_working_tour(route)
 
         # Flag to track the functions runtime and stat
         below_max_runtime = True
-        initial_cost = get_sequence_weight(instance=instance, sequence=tour.sequence)
+        initial_cost = tour.get_total_weight()
         count_improvements = 0
 
+        # Candidate lists restrict the moves to O(n k^2) segment combinations instead of O(n^3)
+        n = len(route)
+        candidate_lists = instance.get_candidates(k=min(self.k, n - 1)) if self.k and n > 3 else None
+
         # Optimization loop
         while improved and below_max_runtime:
             improved = False
 
-            # Iterate over all valid segment combinations
-            for i, j, k in possible_segments(len(route)):
+            # Iterate over all valid segment combinations, or those of the candidates
+            if candidate_lists is None:
+                segments = possible_segments(n)
+            else:
+                segments = candidate_segments(best_found_route, candidate_lists)
+
+            for i, j, k in segments:
                 # Check if the time limit has been exceeded before continuing with the swap                    
                 if (time() - start_time) > self.max_runtime_in_sec:
                     self.logger.info(f"Stopping optimization early (time limit of {self.max_runtime_in_sec} seconds).")
                     below_max_runtime = False
                     break   # Stop method
 
-                # Evaluate all 3-opt cases for the current segment
+                # Evaluate all 3-opt cases for the current segment (cost reduction)
                 for opt_case in OptCase:
-                    moves_cost[opt_case] = get_solution_cost_change(
-                        instance,
-                        best_found_route.tolist(),
-                        opt_case,
-                        i,
-                        j,
-                        k
-                    )
+                    moves_cost[opt_case] = -moves.three_opt_delta(instance, best_found_route, opt_case, i, j, k)
 
                 # Select the best move (maximum cost reduction)
                 best_return = max(moves_cost, key=moves_cost.get)
 
                 # Apply the move if it improves the route
                 if moves_cost[best_return] > 0:
-                    best_found_route = np.array(reverse_segments(
-                        best_found_route.tolist(),
-                        best_return,
-                        i,
-                        j,
-                        k
-                    ))
+                    moves.apply_three_opt(best_found_route, best_return, i, j, k)
                     improved = True
                     count_improvements += 1
                     break  # Restart outer loop after improvement
 
         
         # Add the starting node to the end to complete the cycle
-        best_found_route = np.append(best_found_route, best_found_route[0]).tolist()
+        best_found_route = best_found_route.route()
+        best_found_route = np.append(best_found_route, best_found_route[0])
 
         # Print statistics
         self.logger.info(f"Initial tour improved from {initial_cost} to {get_sequence_weight(instance=instance, 
@@ -228,21 +224,6 @@ class ThreeOpt(SolutionMethod):
         )
 
 
-class OptCase(Enum):
-    """
-    Enumeration of the 8 possible 3-opt move cases.
-    Each case represents a different way to reconnect three segments.
-    """
-    OPT_CASE_1 = "opt_case_1"  # No change (original route)
-    OPT_CASE_2 = "opt_case_2"  # Reverse segment A
-    OPT_CASE_3 = "opt_case_3"  # Reverse segment C
-    OPT_CASE_4 = "opt_case_4"  # Reverse segments A and C
-    OPT_CASE_5 = "opt_case_5"  # Reverse segments A and B
-    OPT_CASE_6 = "opt_case_6"  # Reverse segment B
-    OPT_CASE_7 = "opt_case_7"  # Reverse segments B and C
-    OPT_CASE_8 = "opt_case_8"  # Reverse all segments
-
-
 def possible_segments(n):
     """
     Generate all valid (i, j, k) segment combinations for 3-opt.
@@ -261,6 +242,75 @@ def possible_segments(n):
     )
 
 
+def candidate_pairs(instance, route, candidate_lists):
+    """
+    Generate the 2-opt moves (i, j) that add an edge from a node to one of its candidates.
+
+    For every node a and candidate c, the move adds the edge (a, c) and either (succ(a), succ(c)) or
+    (pred(a), pred(c)). Candidates are sorted by weight, so the scan of a node stops at the first
+    candidate that is not closer than the tour neighbor whose edge would be removed (an improving
+    move shortens the edge at one of its nodes, so it is still found from that node). The positions
+    are computed from the current tour when a move is generated, so the generator has to be
+    restarted after a move.
+
+    Args:
+        instance (Instance): The TSP instance.
+        route (ArrayTour or TwoLevelListTour): The working tour.
+        candidate_lists (np.ndarray): The (n x k) candidate lists of the instance.
+
+    Returns:
+        generator: Yields (i, j) with i <= j, the positions of the segment to reverse (see moves.two_opt_delta).
+    """
+    for a in route.route().tolist():
+        for neighbor, following in ((route.succ, True), (route.pred, False)):
+            b = neighbor(a)
+            weight = instance.w(a, b)
+            for c in candidate_lists[a].tolist():
+                if instance.w(a, c) >= weight:
+                    break
+
+                # Remove (x1, x2) and (y1, y2), add (x1, y1) and (x2, y2): reverse the path from x2 to y1
+                d = neighbor(c)
+                x1, x2, y1, y2 = (a, b, c, d) if following else (b, a, d, c)
+                i, j = route.position(x2), route.position(y1)
+                if i > j:
+                    # The path wraps around the end of the route, reverse its complement from y2 to x1 instead
+                    i, j = route.position(y2), route.position(x1)
+                yield i, j
+
+
+def candidate_segments(route, candidate_lists):
+    """
+    Generate the segment combinations (i, j, k) of possible_segments() whose split points lie next to candidates.
+
+    A combination is generated if route[j - 1] or route[j] is a candidate of route[i - 1], and
+    route[k - 1] or route[k] is a candidate of route[j - 1], so every reconnection can add an edge
+    to a candidate. The positions are computed from the current tour when a combination is
+    generated, so the generator has to be restarted after a move.
+
+    Args:
+        route (ArrayTour or TwoLevelListTour): The working tour.
+        candidate_lists (np.ndarray): The (n x k) candidate lists of the instance.
+
+    Returns:
+        generator: Yields tuples of (i, j, k) indices.
+    """
+    n = len(route)
+
+    # Positions p and p + 1 of the candidates, so the candidate is at the start or the end of a split
+    def split_positions(node):
+        positions = [route.position(c) for c in candidate_lists[node].tolist()]
+        return sorted(set(positions) | {p + 1 for p in positions})
+
+    for i in range(n):
+        for j in split_positions(route[i - 1]):
+            if not i + 2 <= j < n - 1:
+                continue
+            for k in split_positions(route[j - 1]):
+                if j + 2 <= k < n - 1 + (i > 0):
+                    yield i, j, k
+
+
 def get_solution_cost_change(instance, route, case, i, j, k):
     """
     Compute the cost difference for a given 3-opt move.
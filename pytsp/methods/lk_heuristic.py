@@ -1,6 +1,5 @@
 import math
 from .utils import SolutionMethod, Instance, Tour, time
-from lk_heuristic.models.tsp import Tsp
 
 
 class LKHeuristic(SolutionMethod):
@@ -59,6 +58,9 @@ class LKHeuristic(SolutionMethod):
         # Start timing the entire solve process
         start_time = time()
 
+        # Imported here, since the solver backend is only needed when this method is used
+        from lk_heuristic.models.tsp import Tsp
+
         # Initialize tracking variables
         best_tour = None
         best_cost = math.inf
@@ -130,7 +132,10 @@ class LKHeuristic(SolutionMethod):
 
     def get_weight(self, source, target):
         """
-        Remaps node IDs and retrieves the weight between two nodes.
+        Retrieves the weight between two nodes renumbered by lk_heuristic.
+
+        lk_heuristic numbers the nodes by their position in instance.nodes, which is exactly the
+        index of the node in the instance's distance matrix.
 
         Parameters:
             source: Source node
@@ -139,6 +144,4 @@ class LKHeuristic(SolutionMethod):
         Returns:
             float: Weight between source and target nodes
         """
-        source_id = self.node_id_reassignment[source.id]
-        target_id = self.node_id_reassignment[target.id]
-        return self.instance.get_weight_via_id(source_id=source_id, target_id=target_id)
+        return self.instance.w(source.id, target.id)
@@ -1,64 +1,225 @@
 from time import time
 import numpy as np
 from .utils import Instance, SolutionMethod, Tour
+from pytsp.structures.candidates import pair_weights
+from pytsp.structures.SpatialGrid import SpatialGrid
+
+
+def _rows(matrix, nodes: np.ndarray):
+    """
+    Gather the distance matrix rows of several nodes as a (len(nodes) x n) float64 array.
+    """
+    if isinstance(matrix, np.ndarray):
+        return matrix[nodes].astype(np.float64)
+    return np.stack([np.asarray(matrix[i], dtype=np.float64) for i in nodes])
+
+
+def nearest_neighbor_routes(instance: Instance, starts):
+    """
+    Build nearest neighbor routes from several start nodes at once.
+
+    All routes advance in lockstep: each step gathers one matrix row per route and picks the closest
+    unvisited node of every route with a single masked argmin (ties go to the lowest index, as in
+    NearestNeighbor.solve).
+
+    Args:
+        instance (Instance): The TSP instance.
+        starts (array-like): The start node index of every route.
+
+    Returns:
+        np.ndarray: A (len(starts) x n) array with the node indices of the routes (without the return to the start).
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    n = instance.number_of_stops
+    matrix = instance.get_distance_matrix()
+    batch = np.arange(len(starts))
+
+    routes = np.empty((len(starts), n), dtype=np.int64)
+    routes[:, 0] = starts
+    visited = np.zeros((len(starts), n), dtype=bool)
+    visited[batch, starts] = True
+
+    for step in range(1, n):
+        rows = _rows(matrix, routes[:, step - 1])
+        rows[visited] = np.inf
+        routes[:, step] = rows.argmin(axis=1)
+        visited[batch, routes[:, step]] = True
+
+    return routes
+
+
+def _best_routes(instance: Instance, starts, top_k: int):
+    """
+    Build the nearest neighbor routes from the given starts and keep the top_k shortest ones.
+
+    Returns:
+        tuple: (weights, routes) of the kept routes, sorted by weight (ties by start order).
+    """
+    routes = nearest_neighbor_routes(instance, starts)
+    weights = instance.weights(routes, np.roll(routes, -1, axis=1)).sum(axis=1)
+    best = np.argsort(weights, kind="stable")[:top_k]
+    return weights[best], routes[best]
+
+
+def _multi_start_worker(handle, starts, top_k: int):
+    """
+    Worker of NearestNeighbor.solve_multi_start: attach the shared instance and build a batch of routes.
+    """
+    return _best_routes(handle.attach(), starts, top_k)
+
 
 class NearestNeighbor(SolutionMethod):
     """
     Author: Arne Heinold (arne.heinold@klu.org)
     """
 
-    def __init__(self, logging_level: int = 30):
+    def __init__(self, logging_level: int = 30, k: int = None, spatial_index: bool = False, starts=None,
+                 processes: int = 1, batch_size: int = 64):
         """
         Initialize the Nearest Neighbor heuristic.
 
         Args:
             logging_level (int): Controls verbosity of output. Levels: NOTSET(0), DEBUG(10), INFO(20), WARNING(30), ERROR(40), CRITICAL(50)
+            k (int, optional): Look for the next node among the k nearest candidates first, and only scan all nodes
+                if every candidate has been visited (default is None, always scan all nodes). The tour is the same.
+            spatial_index (bool): Find the nearest unvisited node with a SpatialGrid instead of scanning all nodes
+                (default is False). Requires 2D coordinates with a planar edge weight type, otherwise all nodes
+                are scanned. The tour is the same, but no distance matrix is needed and a step takes about O(log n).
+            starts (int or str, optional): Build tours from this many start nodes (spread evenly over the node indices),
+                or from every node with "all", and keep the shortest one (default is None, only start at the first node).
+            processes (int): Number of worker processes for multiple starts (default is 1, no pool).
+            batch_size (int): Number of starts whose tours are built together in one batch (default is 64).
         """
 
         # Initialize core attributes for the solution method
-        super().__init__(name="Nearest Neighbor", 
-                         info=None, 
+        info = ([f"k={k}"] if k else []) + (["spatial_index"] if spatial_index else []) + ([f"starts={starts}"] if starts else [])
+        super().__init__(name="Nearest Neighbor",
+                         info=", ".join(info) or None,
                          logging_level=logging_level)
 
+        self.k = k
+        self.spatial_index = spatial_index
+        self.starts = starts
+        self.processes = processes
+        self.batch_size = batch_size
+
     def solve(self, instance: Instance) -> Tour:
         """
         Solve a TSP instance using the Nearest Neighbor heuristic.
-        
+
+        The tour starts at the first node. Each step reads one row of the distance matrix and picks the
+        closest unvisited node with argmin (ties go to the lowest index), so a step costs O(n) NumPy work.
+        With spatial_index, a step queries a SpatialGrid of the unvisited nodes instead. With multiple
+        starts, the shortest tour of solve_multi_start() is returned.
+
         Args:
             instance (Instance): An instance of the TSP instance class.
 
         Returns:
             Tour: A Tour object containing the computed sequence and metadata.
         """
+        if self.starts:
+            return self.solve_multi_start(instance=instance)[0]
 
         # Start timing the algorithm
         start_time = time()
 
-        # Get number of stops and initial node sequence
         n = instance.number_of_stops
-        sequence = instance.nodes.copy()
+        candidates = instance.get_candidates(k=min(self.k, n - 1)) if self.k and n > 1 else None
+
+        # Look up the nearest unvisited node in a spatial grid or in the rows of the distance matrix
+        grid = None
+        if self.spatial_index and n > 1:
+            try:
+                grid = SpatialGrid(instance)
+                grid.remove(0)
+            except ValueError as error:
+                self.logger.info(f"Scanning all nodes instead of using a spatial grid: {error}")
+        matrix = instance.get_distance_matrix() if grid is None else None
+
+        # Node indices of the tour and the nodes that have been visited so far
+        route = np.zeros(n, dtype=np.int64)
+        visited = np.zeros(n, dtype=bool)
+        visited[0] = True
 
-        # Iterate through each node in the sequence (except first and last)
-        for i in range(1, n - 1):
+        for step in range(1, n):
+            x = route[step - 1]
 
-            # Get the previous node
-            x = sequence[i - 1]
+            # The nearest unvisited candidate, unless nodes beyond the candidate list might be just as close
+            if candidates is not None:
+                open_candidates = ~visited[candidates[x]]
+                if open_candidates.any():
+                    candidate_weights = pair_weights(instance, np.full(len(candidates[x]), x), candidates[x])
+                    nearest = candidate_weights[open_candidates].min()
+                    if nearest < candidate_weights[-1]:
+                        route[step] = candidates[x][open_candidates & (candidate_weights == nearest)].min()
 
-            # Find the nearest neighbor among remaining nodes
-            for j in range(i + 1, n):
-                if instance.get_weight(source=x, target=sequence[j]) < instance.get_weight(source=x, target=sequence[i]):
-                    # Swap current node with a closer one
-                    sequence[i], sequence[j] = sequence[j], sequence[i]
+            # Otherwise the nearest unvisited node of all nodes (the start node 0 marks that no candidate was taken)
+            if route[step] == 0:
+                if grid is not None:
+                    route[step] = grid.nearest(x)
+                else:
+                    row = np.asarray(matrix[x])
+                    route[step] = np.where(visited, np.inf, row).argmin()
+
+            visited[route[step]] = True
+            if grid is not None:
+                grid.remove(route[step])
 
         # Add return trip
-        sequence.append(sequence[0])
+        route = np.append(route, route[0])
 
         # Create and return the final tour object
         tour = Tour(
             instance=instance,
             solution_method=self,
-            sequence=sequence,            
+            sequence=route,
             runtime_in_sec=time() - start_time
         )
 
         return tour
+
+    def solve_multi_start(self, instance: Instance, top_k: int = 1):
+        """
+        Build nearest neighbor tours from multiple start nodes and return the shortest ones.
+
+        The starts are split into batches of batch_size, whose tours are built together by
+        nearest_neighbor_routes(). With processes > 1, the batches are spread across a process pool;
+        the workers read the distance matrix from shared memory (see SharedInstance). All tours scan
+        the full matrix rows, so k and spatial_index do not apply.
+
+        Args:
+            instance (Instance): An instance of the TSP instance class.
+            top_k (int): Number of tours to return, e.g., as initial tours for improvement methods (default is 1).
+
+        Returns:
+            list: The top_k shortest Tour objects, sorted by weight (ties by start index).
+        """
+        start_time = time()
+
+        n = instance.number_of_stops
+        if self.starts == "all" or (self.starts or 1) >= n:
+            starts = np.arange(n)
+        else:
+            starts = np.unique(np.linspace(0, n - 1, self.starts or 1).astype(np.int64))
+        batches = [starts[i:i + self.batch_size] for i in range(0, len(starts), self.batch_size)]
+
+        if self.processes > 1 and len(batches) > 1:
+            import multiprocessing
+            from pytsp.structures.SharedInstance import SharedInstance
+
+            with SharedInstance.publish(instance) as handle:
+                with multiprocessing.get_context("spawn").Pool(min(self.processes, len(batches))) as pool:
+                    results = pool.starmap(_multi_start_worker, [(handle, batch, top_k) for batch in batches])
+        else:
+            results = [_best_routes(instance, batch, top_k) for batch in batches]
+
+        # Merge the best tours of all batches (batches are in start order, so ties keep the lower start)
+        weights = np.concatenate([batch_weights for batch_weights, _ in results])
+        routes = np.concatenate([batch_routes for _, batch_routes in results])
+        best = np.argsort(weights, kind="stable")[:top_k]
+        self.logger.info(f"Built {len(starts)} nearest neighbor tours, the shortest has weight {weights[best[0]]}.")
+
+        runtime = time() - start_time
+        return [Tour(instance=instance, solution_method=self, sequence=np.append(routes[i], routes[i][0]), runtime_in_sec=runtime)
+                for i in best]
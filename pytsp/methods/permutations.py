@@ -1,4 +1,5 @@
 from time import time
+import numpy as np
 from .utils import Instance, SolutionMethod, Tour, get_sequence_weight
 from itertools import permutations
 from math import factorial
@@ -39,30 +40,27 @@ class Permutations(SolutionMethod):
         # Start timing the algorithm
         start_time = time()
 
-        # Apply max_nodes limit if set
-        nodes = instance.nodes[:max_nodes] if max_nodes else instance.nodes
-        self.logger.info(f"Node list truncated to first {max_nodes} nodes out of {len(instance.nodes)} nodes.")
+        # Apply max_nodes limit if set (the sub-instance shares the distance data of the instance)
+        sub_instance = instance.subset(slice(0, max_nodes)) if max_nodes else instance
+        self.logger.info(f"Node list truncated to first {max_nodes} nodes out of {instance.number_of_stops} nodes.")
 
         # Estimate number of tours
-        num_tours = factorial(len(nodes) - 1)
+        num_tours = factorial(sub_instance.number_of_stops - 1)
         self.logger.warning(f"Generating {num_tours} possible tours... This may take some time.")
 
         # Fix the starting node
-        start = nodes[0]
-        rest = nodes[1:]
+        start = 0
+        rest = range(1, sub_instance.number_of_stops)
 
-        # Generate all possible tours
-        sequences = []
-        for perm in permutations(rest):
-            sequence = [start] + list(perm) + [start]
-            sequences.append(sequence)
-
-        # Find the tour with the lowest weight
+        # Find the tour with the lowest weight (by node index)
         best_sequence = min(
-            sequences,
-            key=lambda sequence: get_sequence_weight(instance=instance, sequence=sequence)
+            ([start] + list(perm) + [start] for perm in permutations(rest)),
+            key=lambda sequence: get_sequence_weight(instance=sub_instance, sequence=np.array(sequence))
         )
 
+        # Map the indices back to the nodes of the instance
+        best_sequence = [instance.nodes[i] for i in sub_instance.to_parent_indices(best_sequence)]
+
         # Create and return the final tour object
         tour = Tour(
             instance=instance,
@@ -1,6 +1,5 @@
 from time import time
 from .utils import Instance, SolutionMethod, Tour, Node2D
-from pyvrp import Model, stop
 
 
 class pyVRP(SolutionMethod):
@@ -40,6 +39,9 @@ class pyVRP(SolutionMethod):
         start_time = time()
         self.logger.info("Creating pyVRP instance")
 
+        # Imported here, since the solver backend is only needed when this method is used
+        from pyvrp import Model, stop
+
         # Check if node coordinates are not provided in the instance
         if isinstance(instance.nodes[0], Node2D):
             # Use the provided node coordinates from the instance
@@ -1,6 +1,8 @@
 from time import time
-from .utils import Instance, SolutionMethod, Tour, get_sequence_weight
+from .utils import Instance, SolutionMethod, Tour
 from pytsp.methods.nearest_neighbor import NearestNeighbor
+from pytsp.structures import moves
+from pytsp.structures.TwoLevelListTour import create_working_tour
 import numpy as np
 
 
@@ -49,12 +51,12 @@ class SimulatedAnnealing(SolutionMethod):
             self.logger.info("Creating initial tour via Nearest Neighbor heuristic")
             tour = NearestNeighbor(logging_level=self.logger.level).solve(instance=instance)
 
-        # Remove the last node (duplicate of the first) to work with a linear sequence
-        current_sequence = tour.sequence[:-1]
-        current_sequence_costs = get_sequence_weight(instance=instance, sequence=tour.sequence)
+        # Remove the last node (duplicate of the first) to work with a linear sequence of node indices
+        current_sequence = create_working_tour(tour.indices[:-1])
+        current_sequence_costs = tour.get_total_weight()
 
         # Track best found solution
-        best_sequence = current_sequence.copy()
+        best_sequence = current_sequence.route()
         best_sequence_cost = current_sequence_costs
 
         # Flag to track the functions runtime and stat
@@ -64,8 +66,11 @@ class SimulatedAnnealing(SolutionMethod):
 
         BOLTZMANN = 5.670367e-08  # Arbitrary constant for temperature scaling
 
+        # Reversals change the weight of the reversed slice on asymmetric instances (exact, but O(n) deltas)
+        symmetric = instance.is_symmetric()
+
         while sequence_has_changed:
-            temp_solution = current_sequence.copy()
+            temp_solution = current_sequence.route()
 
             # Check if the time limit has been exceeded before continuing with the swap                    
             if (time() - start_time) > self.max_runtime_in_sec:
@@ -73,36 +78,27 @@ class SimulatedAnnealing(SolutionMethod):
                 break   # Stop method
 
             for _ in range(self.n_of_iter):
-                # Create a copy of the current sequence to modify
-                next_sequence = current_sequence.copy()
-
                 # Choose a random length for the subsequence to reverse (at least 2 elements)
                 left_index = np.random.randint(2, len(current_sequence))
 
                 # Choose a random starting index such that the subsequence fits within the array
                 right_index = np.random.randint(0, len(current_sequence) - left_index)
 
-                # Reverse the selected slice
-                next_sequence[right_index:right_index + left_index] = next_sequence[
-                    right_index:right_index + left_index][::-1]
-
-                # Evaluate the new sequence
-                next_sequence_costs = get_sequence_weight(
-                    instance=instance,
-                    sequence=next_sequence,
-                    add_return_to_start=True
+                # Evaluate reversing the selected slice (without building the new sequence)
+                next_sequence_costs = current_sequence_costs + moves.two_opt_delta(
+                    instance, current_sequence, right_index, right_index + left_index - 1, symmetric=symmetric
                 )
 
                 # Accept the new sequence
                 if next_sequence_costs < current_sequence_costs:
                     # ... if it's better
-                    current_sequence = next_sequence
+                    moves.apply_two_opt(current_sequence, right_index, right_index + left_index - 1)
                     current_sequence_costs = next_sequence_costs
                     
                     # Update best if improved
                     if next_sequence_costs < best_sequence_cost:
                         count_improvements += 1
-                        best_sequence = next_sequence.copy()
+                        best_sequence = current_sequence.route()
                         best_sequence_cost = next_sequence_costs
                         
                 else:
@@ -111,20 +107,14 @@ class SimulatedAnnealing(SolutionMethod):
                         (current_sequence_costs - next_sequence_costs) / (self.temperature * BOLTZMANN)
                     )
                     if acceptance_prob > np.random.random():
-                        current_sequence = next_sequence
+                        moves.apply_two_opt(current_sequence, right_index, right_index + left_index - 1)
                         current_sequence_costs = next_sequence_costs
-                    
-                    # Update best if improved
-                    if next_sequence_costs < best_sequence_cost:
-                        count_improvements += 1
-                        best_sequence = next_sequence.copy()
-                        best_sequence_cost = next_sequence_costs
 
             # Cool down the temperature
             self.temperature *= self.alpha
 
             # Stop if no change occurred
-            if np.array_equal(temp_solution, current_sequence):
+            if np.array_equal(temp_solution, current_sequence.route()):
                 sequence_has_changed = False
                 self.logger.info(f"Stopped simulation annealing as sequences has not changed.")
 
@@ -132,7 +122,7 @@ class SimulatedAnnealing(SolutionMethod):
         self.logger.info(f"Info (Simulated Annealing): Initial tour improved from {initial_cost} to {best_sequence_cost} after {count_improvements} improvements.")
 
         # Close the tour by returning to the start node
-        current_sequence.append(best_sequence[0])
+        current_sequence = np.append(current_sequence.route(), best_sequence[0])
 
         # Return the final tour
         return Tour(
@@ -0,0 +1,151 @@
+import numpy as np
+
+
+class ArrayTour:
+    """
+    Working representation of a tour for local search: an order[] array (the node at each position)
+    and its inverse pos[] (the position of each node), kept in sync.
+
+    succ(), pred(), between() and position lookups take O(1) time. Reversing a path takes
+    O(min(L, n - L)) time for a path of L nodes: if the path is longer than half of the tour, the
+    complementary path is reversed instead, which yields the same cycle in the opposite direction.
+    An orientation flag and the physical position of logical position 0 absorb this, so the tour
+    behaves exactly like a route array whose segment was reversed in place.
+
+    Positions are logical (position 0 is the start of the route), and indexing works like for a
+    route array: tour[i] is the node at position i (negative positions count from the end). The move
+    functions in pytsp.structures.moves accept an ArrayTour wherever they accept a route array.
+    """
+
+    def __init__(self, route):
+        """
+        Initialize the tour from a route.
+
+        Args:
+            route (array-like): The node indices of the tour (without the return to the start), a permutation of 0..n-1.
+        """
+        self.order = np.array(route, dtype=np.int64)
+        self.n = len(self.order)
+        self.pos = np.empty(self.n, dtype=np.int64)
+        self.pos[self.order] = np.arange(self.n)
+
+        # Physical position of logical position 0, and whether the route runs backward through order[]
+        self._origin = 0
+        self._reversed = False
+
+    def __len__(self):
+        return self.n
+
+    def _physical(self, i):
+        """
+        Translate logical positions into positions in order[].
+        """
+        return (self._origin - i) % self.n if self._reversed else (self._origin + i) % self.n
+
+    def __getitem__(self, i):
+        return int(self.order[self._physical(i)])
+
+    def position(self, a: int):
+        """
+        Return the (logical) position of node a.
+        """
+        p = int(self.pos[a])
+        return (self._origin - p) % self.n if self._reversed else (p - self._origin) % self.n
+
+    def succ(self, a: int):
+        """
+        Return the successor of node a.
+        """
+        step = -1 if self._reversed else 1
+        return int(self.order[(self.pos[a] + step) % self.n])
+
+    def pred(self, a: int):
+        """
+        Return the predecessor of node a.
+        """
+        step = 1 if self._reversed else -1
+        return int(self.order[(self.pos[a] + step) % self.n])
+
+    def between(self, a: int, b: int, c: int):
+        """
+        Check whether b lies on the path from a forward to c (inclusive).
+
+        Args:
+            a (int): Start node of the path.
+            b (int): The node to check.
+            c (int): End node of the path.
+
+        Returns:
+            bool: True if b is visited when walking from a to c along the tour.
+        """
+        pa = self.position(a)
+        return (self.position(b) - pa) % self.n <= (self.position(c) - pa) % self.n
+
+    def _reverse_physical(self, start: int, length: int):
+        """
+        Reverse the nodes at the physical positions start, start + 1, ..., start + length - 1 (cyclic).
+        """
+        positions = (start + np.arange(length)) % self.n
+        nodes = self.order[positions[::-1]]
+        self.order[positions] = nodes
+        self.pos[nodes] = positions
+
+    def reverse(self, i: int, j: int):
+        """
+        Reverse the nodes at the positions i, i + 1, ..., j (cyclic, so i > j wraps around the end of the route).
+
+        Args:
+            i (int): First position of the path.
+            j (int): Last position of the path.
+        """
+        i, j = i % self.n, j % self.n
+        length = (j - i) % self.n + 1
+
+        if 2 * length <= self.n:
+            # The physical range runs from the first to the last logical position (or back)
+            self._reverse_physical(self._physical(j) if self._reversed else self._physical(i), length)
+        else:
+            # Reverse the shorter complement, then walk the tour in the other direction
+            new_origin = self._physical((i + j) % self.n)
+            if length < self.n:
+                complement_start, complement_end = (j + 1) % self.n, (i - 1) % self.n
+                start = self._physical(complement_end) if self._reversed else self._physical(complement_start)
+                self._reverse_physical(start, self.n - length)
+            self._origin = new_origin
+            self._reversed = not self._reversed
+
+    def reverse_path(self, a: int, b: int):
+        """
+        Reverse the path from node a forward to node b.
+        """
+        self.reverse(self.position(a), self.position(b))
+
+    def two_opt_move(self, a: int, b: int, c: int, d: int):
+        """
+        Replace the edges (a, b) and (c, d) by (a, c) and (b, d), where b = succ(a) and d = succ(c).
+        """
+        self.reverse_path(b, c)
+
+    def swap(self, i: int, j: int):
+        """
+        Exchange the nodes at the positions i and j.
+        """
+        pi, pj = self._physical(i), self._physical(j)
+        a, b = self.order[pi], self.order[pj]
+        self.order[pi], self.order[pj] = b, a
+        self.pos[a], self.pos[b] = pj, pi
+
+    def rotate(self, i: int):
+        """
+        Let the route start at position i (the cycle does not change).
+        """
+        self._origin = self._physical(i)
+
+    def route(self):
+        """
+        Return the node indices in route order.
+
+        Returns:
+            np.ndarray: A new array with the n node indices, starting at position 0.
+        """
+        return self.order[self._physical(np.arange(self.n))]
@@ -0,0 +1,344 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from pytsp.structures import distances
+
+
+def select_dtype(min_weight, max_weight, is_integral: bool = True, allow_float32: bool = False):
+    """
+    Select the smallest dtype that stores all weights of an instance exactly.
+
+    Args:
+        min_weight (int or float): The smallest weight of the instance.
+        max_weight (int or float): The largest weight of the instance.
+        is_integral (bool): Whether all weights are integers.
+        allow_float32 (bool): Store non-integral weights as float32 (lossy) instead of float64.
+
+    Returns:
+        np.dtype: The selected dtype.
+    """
+    if is_integral:
+        if min_weight >= 0:
+            return np.min_scalar_type(int(max_weight))
+
+        # Promoting the types of both ends (e.g., int8 and uint16 to int32) can skip a signed type that holds both
+        for dtype in (np.int8, np.int16, np.int32, np.int64):
+            if np.iinfo(dtype).min <= min_weight and max_weight <= np.iinfo(dtype).max:
+                return np.dtype(dtype)
+        return np.result_type(np.min_scalar_type(int(min_weight)), np.min_scalar_type(int(max_weight)))
+
+    return np.dtype(np.float32) if allow_float32 else np.dtype(np.float64)
+
+
+def compact(weights: np.ndarray, allow_float32: bool = False):
+    """
+    Cast an array of weights to the smallest dtype that stores all of them exactly.
+
+    Args:
+        weights (np.ndarray): The weights to cast.
+        allow_float32 (bool): Store non-integral weights as float32 (lossy) instead of float64.
+
+    Returns:
+        np.ndarray: The weights with the selected dtype (no copy if the dtype is unchanged).
+    """
+    if weights.size == 0:
+        return weights
+
+    is_integral = np.issubdtype(weights.dtype, np.integer)
+    dtype = select_dtype(weights.min(), weights.max(), is_integral=is_integral, allow_float32=allow_float32)
+    return weights.astype(dtype, copy=False)
+
+
+class PackedSymmetricMatrix:
+    """
+    A symmetric (n x n) matrix that only stores the upper triangle (including the diagonal).
+
+    The entries are kept row-wise in a flat array of length n * (n + 1) / 2, which halves the memory
+    of a dense matrix. Indexing follows NumPy conventions for the cases used by the solvers:
+    matrix[i, j] for a single entry (or arrays of entries) and matrix[i] for a full row.
+    """
+
+    def __init__(self, size: int, dtype=np.int64, data: np.ndarray = None):
+        """
+        Initialize an empty packed matrix (or wrap an existing flat array).
+
+        Args:
+            size (int): The number of rows/columns n.
+            dtype (np.dtype): The dtype of the entries.
+            data (np.ndarray, optional): An existing flat array of length n * (n + 1) / 2.
+        """
+        self.size = size
+        self.data = np.empty(size * (size + 1) // 2, dtype=dtype) if data is None else data
+
+    @property
+    def shape(self):
+        return (self.size, self.size)
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def _row_offset(self, i):
+        """
+        Return the position of entry (i, i) in the flat array.
+        """
+        return i * self.size - i * (i - 1) // 2
+
+    def _flat_index(self, i, j):
+        """
+        Return the position of entry (i, j) in the flat array.
+        """
+        i = np.asarray(i, dtype=np.int64)
+        j = np.asarray(j, dtype=np.int64)
+        low, high = np.minimum(i, j), np.maximum(i, j)
+        return self._row_offset(low) + (high - low)
+
+    def set_row(self, i: int, row: np.ndarray):
+        """
+        Store the upper part (columns i..n-1) of a full matrix row.
+
+        Args:
+            i (int): The row index.
+            row (np.ndarray): The full row with n entries.
+        """
+        start = self._row_offset(i)
+        self.data[start:start + self.size - i] = row[i:]
+
+    def get_row(self, i: int):
+        """
+        Return row i as a dense array.
+
+        Args:
+            i (int): The row index.
+
+        Returns:
+            np.ndarray: The n entries of row i.
+        """
+        return self.data[self._flat_index(i, np.arange(self.size))]
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            return self.data[self._flat_index(i, j)]
+        return self.get_row(key)
+
+    def __array__(self, dtype=None, copy=None):
+        dense = np.empty(self.shape, dtype=self.dtype if dtype is None else dtype)
+        for i in range(self.size):
+            dense[i] = self.get_row(i)
+        return dense
+
+    def tolist(self):
+        return np.asarray(self).tolist()
+
+
+class DistanceOracle:
+    """
+    A distance "matrix" for instances that are too large to be stored densely.
+
+    Rows are computed on demand from the node coordinates with the vectorized distance functions,
+    and the most recently used rows are kept in an LRU cache with a fixed memory budget. Indexing
+    works like for a dense matrix: oracle[i, j] for single entries (or arrays of entries) and
+    oracle[i] for a full row.
+    """
+
+    def __init__(self, edge_weight_type: str, coordinates: np.ndarray, dtype=None, max_cache_bytes: int = 256 * 2**20):
+        """
+        Initialize the oracle for a set of node coordinates.
+
+        Args:
+            edge_weight_type (EdgeWeightType): The TSPLIB edge weight type (must be supported by distances.TYPES).
+            coordinates (np.ndarray): Node coordinates with shape (n, dimension).
+            dtype (np.dtype, optional): The dtype of the rows. Defaults to the smallest exact dtype.
+            max_cache_bytes (int): Memory budget of the row cache in bytes (default is 256 MB).
+
+        Raises:
+            ValueError: If the edge weight type has no vectorized implementation.
+        """
+        if edge_weight_type not in distances.TYPES:
+            raise ValueError(f"No vectorized distance function for edge weight type {edge_weight_type}.")
+
+        self.edge_weight_type = edge_weight_type
+        self.coordinates = coordinates
+        self.size = len(coordinates)
+        self.max_cache_bytes = max_cache_bytes
+
+        if dtype is None:
+            dtype = select_dtype(0, distances.weight_upper_bound(edge_weight_type, coordinates))
+        self._dtype = np.dtype(dtype)
+
+        # Row cache in least recently used order (oldest first)
+        self._rows = OrderedDict()
+
+    @property
+    def shape(self):
+        return (self.size, self.size)
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def nbytes(self):
+        return len(self._rows) * self.size * self._dtype.itemsize
+
+    def _cache_row(self, i: int, row: np.ndarray):
+        """
+        Add a row to the cache and evict the least recently used rows beyond the memory budget.
+        """
+        self._rows[i] = row
+        while len(self._rows) > 1 and self.nbytes > self.max_cache_bytes:
+            self._rows.popitem(last=False)
+
+    def get_row(self, i: int):
+        """
+        Return row i (computed on a cache miss).
+
+        Args:
+            i (int): The row index.
+
+        Returns:
+            np.ndarray: The n entries of row i.
+        """
+        i = int(i)
+        row = self._rows.get(i)
+        if row is None:
+            row = distances.compute_weights(self.edge_weight_type, self.coordinates, [i])[0].astype(self._dtype)
+            self._cache_row(i, row)
+        else:
+            self._rows.move_to_end(i)
+        return row
+
+    def get_rows(self, rows):
+        """
+        Return a block of rows, computing all cache misses in one vectorized call.
+
+        Args:
+            rows (array-like): The row indices.
+
+        Returns:
+            np.ndarray: An array with shape (len(rows), n).
+        """
+        rows = [int(i) for i in rows]
+        missing = [i for i in dict.fromkeys(rows) if i not in self._rows]
+
+        # Keep the computed rows locally, the cache may evict them again if the block exceeds the budget
+        computed = {}
+        if missing:
+            block = distances.compute_weights(self.edge_weight_type, self.coordinates, missing).astype(self._dtype)
+            for i, row in zip(missing, block):
+                computed[i] = row
+                self._cache_row(i, row)
+
+        result = np.empty((len(rows), self.size), dtype=self._dtype)
+        for k, i in enumerate(rows):
+            result[k] = computed[i] if i in computed else self.get_row(i)
+        return result
+
+    def get_weights(self, i_array, j_array):
+        """
+        Return the weights between the node pairs (i_array[k], j_array[k]).
+
+        Args:
+            i_array (array-like): Source indices.
+            j_array (array-like): Target indices (same shape as i_array).
+
+        Returns:
+            np.ndarray: The weights with the shape of i_array (a scalar for scalar indices).
+        """
+        i_array = np.asarray(i_array, dtype=np.int64)
+        j_array = np.asarray(j_array, dtype=np.int64)
+        weights = distances.compute_pairwise_weights(self.edge_weight_type, self.coordinates[i_array], self.coordinates[j_array])
+        return weights.astype(self._dtype)[()]
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            return self.get_row(key)
+
+        i, j = key
+        if np.ndim(i) == 0 and np.ndim(j) == 0:
+            # Serve single entries from cached rows if possible
+            if int(i) in self._rows:
+                return self.get_row(i)[j]
+            # All coordinate-based distance functions are symmetric
+            if int(j) in self._rows:
+                return self.get_row(j)[i]
+        return self.get_weights(i, j)
+
+    def __array__(self, dtype=None, copy=None):
+        dense = np.empty(self.shape, dtype=self._dtype if dtype is None else dtype)
+        block_size = max(1, 2**22 // max(1, self.size))
+        for start in range(0, self.size, block_size):
+            rows = slice(start, min(start + block_size, self.size))
+            dense[rows] = distances.compute_weights(self.edge_weight_type, self.coordinates, rows)
+        return dense
+
+    def tolist(self):
+        return np.asarray(self).tolist()
+
+
+class SubsetMatrix:
+    """
+    The distance matrix of a subset of nodes as a view of the parent's matrix.
+
+    Entry (i, j) is looked up as parent[indices[i], indices[j]], so the view costs O(m) memory for
+    m nodes regardless of the storage layout of the parent (dense, packed or oracle). Indexing works
+    like for a dense matrix: matrix[i, j] for single entries (or arrays of entries) and matrix[i] for a full row.
+    """
+
+    def __init__(self, parent, indices: np.ndarray):
+        """
+        Initialize the view.
+
+        Args:
+            parent (np.ndarray, PackedSymmetricMatrix or DistanceOracle): The distance matrix of the parent instance.
+            indices (np.ndarray): The parent indices of the subset nodes.
+        """
+        self.parent = parent
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.size = len(self.indices)
+
+    @property
+    def shape(self):
+        return (self.size, self.size)
+
+    @property
+    def dtype(self):
+        return self.parent.dtype
+
+    @property
+    def nbytes(self):
+        return self.indices.nbytes
+
+    def get_row(self, i: int):
+        """
+        Return row i as a dense array.
+
+        Args:
+            i (int): The row index.
+
+        Returns:
+            np.ndarray: The m entries of row i.
+        """
+        return np.asarray(self.parent[self.indices[i], self.indices])
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            return self.parent[self.indices[i], self.indices[j]]
+        return self.get_row(key)
+
+    def __array__(self, dtype=None, copy=None):
+        if isinstance(self.parent, np.ndarray):
+            dense = self.parent[np.ix_(self.indices, self.indices)]
+        else:
+            dense = np.stack([self.get_row(i) for i in range(self.size)]) if self.size else np.empty(self.shape, dtype=self.dtype)
+        return dense if dtype is None else dense.astype(dtype)
+
+    def tolist(self):
+        return np.asarray(self).tolist()
@@ -4,8 +4,6 @@ from pytsp.structures.SolutionMethod import SolutionMethod
 
 # Importing other modules
 import logging
-import pandas as pd
-import plotly.express as px
 from time import time
 
 # Info: For PDF export, kaleido needs to be in version 0.0.0post1 (pip install kaleido==0.1.0post1)
@@ -107,7 +105,8 @@ class Experiment:
             # Print completion message with runtime
             self.logger.info(f"{solution_method.name}: Completed in {round(time() - start_time, 4)} seconds.")
 
-        # Convert the list of dictionaries into a pandas DataFrame
+        # Convert the list of dictionaries into a pandas DataFrame (imported here, since pandas takes long to import)
+        import pandas as pd
         df_new_results = pd.DataFrame(results)
 
         # Merge with existing results if present
@@ -131,6 +130,8 @@ class Experiment:
         FileNotFoundError
             If any of the specified files do not exist.
         """
+        import pandas as pd
+
         # Start with existing results if available
         df_list = [] if self.df_results is None else [self.df_results]
 
@@ -168,7 +169,8 @@ class Experiment:
         plotly.graph_objs._figure.Figure
             A Plotly Figure object representing the grouped bar chart.
         """
-        # Create a grouped bar chart using Plotly Express
+        # Create a grouped bar chart using Plotly Express (imported here, since plotly takes long to import)
+        import plotly.express as px
         fig = px.bar(
             self.df_results,
             x="instance",                      # X-axis: instance names
@@ -195,7 +197,8 @@ class Experiment:
         plotly.graph_objs._figure.Figure
             A Plotly Figure object representing the box plot.
         """
-        # Create a box plot using Plotly Express
+        # Create a box plot using Plotly Express (imported here, since plotly takes long to import)
+        import plotly.express as px
         fig = px.box(
             self.df_results,
             x="solution_method",               # X-axis: solution methods
@@ -1,22 +1,38 @@
-import tsplib95
+import os
 
-from pyparsing import Path
-from .utils import EdgeWeightType, EdgeWeightFormat, DisplayDataType
+import numpy as np
+
+from pathlib import Path
+from .utils import EdgeWeightType, EdgeWeightFormat, DisplayDataType, DistanceStorage, CandidateMethod, NodeOrder
 from pytsp.structures.Benchmark import Benchmark
 from pytsp.structures.Node import Node, Node2D
+from pytsp.structures.DistanceMatrix import PackedSymmetricMatrix, DistanceOracle, SubsetMatrix, select_dtype, compact
+from pytsp.structures.tsplib import TSPLIBData, read_tsplib, expand_edge_weights, dimension_from_count
+from pytsp.structures.InstanceCache import InstanceCache
+from pytsp.structures import distances, candidates, held_karp, ordering
+
+# Without a distance matrix, instances with at least this many nodes compute w() and weights() from their
+# coordinates instead of building the matrix (a dense matrix of 85,900 nodes takes 27.5 GiB)
+PAIRWISE_WEIGHTS_MIN_NODES = 10000
 # from pytsp.structures.Tour import Tour
 
-import plotly.express as px
-import pandas as pd
-
 
-def create_instance_from_file(name: str, benchmark: Benchmark = None):
+def create_instance_from_file(name: str, benchmark: Benchmark = None, distance_storage: DistanceStorage = "dense", allow_float32: bool = False,
+                              oracle_cache_bytes: int = 256 * 2**20, cache_dir: str = None):
     """
     Loads a TSPLIB-formatted TSP instance from a file.
 
+    With a cache directory, the parsed arrays (and later the distance matrix and candidate lists) are
+    stored as .npy files keyed by the hash of the file and memory-mapped on the next load (see InstanceCache).
+
     Parameters:
         name (str): The name of the TSPLIB instance file (without extension).
         benchmark (Benchmark): A benchmark object to be added to the new instance.
+        distance_storage (DistanceStorage): Storage layout of the distance matrix (default is dense).
+        allow_float32 (bool): Store non-integral weights as float32 instead of float64 (default is False).
+        oracle_cache_bytes (int): Memory budget of the row cache for distance_storage="oracle" (default is 256 MB).
+        cache_dir (str, optional): Directory of the on-disk instance cache (defaults to the environment variable
+            PYTSP_CACHE_DIR; no caching if neither is set).
 
     Returns:
         Instance: A parsed TSP instance object.
@@ -35,9 +51,22 @@ def create_instance_from_file(name: str, benchmark: Benchmark = None):
     if not path_to_file.is_file():
         raise FileNotFoundError(f"TSPLIB file not found: {path_to_file}")
 
-    # Load and return the TSP instance using tsplib95
-    return Instance(TSPLIB=tsplib95.load(path_to_file), 
-                    benchmark=benchmark)
+    # Load the parsed arrays from the cache, or parse the file and fill the cache
+    cache_dir = cache_dir or os.environ.get("PYTSP_CACHE_DIR")
+    cache = InstanceCache(source_path=path_to_file, cache_dir=cache_dir) if cache_dir else None
+    data = cache.load_data() if cache else None
+    if data is None:
+        data = read_tsplib(path_to_file)
+        if cache:
+            cache.save_data(data)
+
+    # Load and return the TSP instance (tsplib95 only parses the file if instance.TSPLIB is used)
+    return Instance(TSPLIB=data, 
+                    benchmark=benchmark,
+                    distance_storage=distance_storage,
+                    allow_float32=allow_float32,
+                    oracle_cache_bytes=oracle_cache_bytes,
+                    cache=cache)
 
 
 def create_instance_from_coordinates(
@@ -47,47 +76,54 @@ def create_instance_from_coordinates(
     edge_weight_type: EdgeWeightType = "GEO",
     edge_weight_format: EdgeWeightFormat = "FUNCTION",
     display_data_type: DisplayDataType = "COORD_DISPLAY",
-    benchmark: Benchmark = None
+    benchmark: Benchmark = None,
+    distance_storage: DistanceStorage = "dense",
+    allow_float32: bool = False,
+    oracle_cache_bytes: int = 256 * 2**20
 ):
     """
-    Creates a TSPLIB-formatted TSP instance from a list of coordinates.
+    Creates a TSP instance from a list (or array) of coordinates.
+
+    The coordinates are used directly (without copy for float64 arrays); TSPLIB text is only
+    generated on export (see Instance.to_tsplib).
 
     Args:
         name (str): Name of the TSP instance.
-        coordinates (list): List of (x, y) tuples representing node coordinates.
+        coordinates (list or np.ndarray): List of (x, y) tuples or an (n x 2) array representing node coordinates.
         comment (str, optional): Optional comment describing the instance.
         edge_weight_type (EdgeWeightType, optional): Method used to calculate edge weights (default is GEO).
         edge_weight_format (EdgeWeightFormat, optional): Format of edge weights if explicit (default is FUNCTION).
         display_data_type (DisplayDataType, optional): Display type for graphical visualization (default is COORD_DISPLAY).
         benchmark (Benchmark): A benchmark object to be added to the new instance.
+        distance_storage (DistanceStorage): Storage layout of the distance matrix (default is dense).
+        allow_float32 (bool): Store non-integral weights as float32 instead of float64 (default is False).
+        oracle_cache_bytes (int): Memory budget of the row cache for distance_storage="oracle" (default is 256 MB).
 
     Returns:
-        Instance: A parsed TSPLIB instance using tsplib95.
+        Instance: A TSP instance with node IDs 1..n.
     """
-
-    # Build the TSPLIB header with metadata and configuration
-    text = f"""NAME: {name}
-TYPE: TSP
-COMMENT: {comment}
-DIMENSION: {len(coordinates)}
-EDGE_WEIGHT_TYPE: {edge_weight_type}
-EDGE_WEIGHT_FORMAT: {edge_weight_format} 
-DISPLAY_DATA_TYPE: {display_data_type}
-NODE_COORD_SECTION"""
-
-    # Append each coordinate with its node index (1-based)
-    for idx, c in enumerate(coordinates):
-        text += f"""
-   {idx + 1}   {c[0]}   {c[1]}"""
-
-    # Mark the end of the TSPLIB file
-    text += """
-EOF
-"""
-
-    # Parse the TSPLIB-formatted string and return the instance
-    return Instance(TSPLIB=tsplib95.parse(text), 
-                    benchmark=benchmark)
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+
+    specification = {
+        "name": name,
+        "type": "TSP",
+        "comment": comment,
+        "dimension": len(coordinates),
+        "edge_weight_type": edge_weight_type,
+        "edge_weight_format": edge_weight_format,
+        "display_data_type": display_data_type
+    }
+
+    # Node IDs begin at 1 (like in TSPLIB files)
+    data = TSPLIBData(specification=specification,
+                      node_ids=np.arange(1, len(coordinates) + 1),
+                      node_coords=coordinates)
+
+    return Instance(TSPLIB=data, 
+                    benchmark=benchmark,
+                    distance_storage=distance_storage,
+                    allow_float32=allow_float32,
+                    oracle_cache_bytes=oracle_cache_bytes)
 
 
 def create_instance_from_cost_matrix(
@@ -98,63 +134,63 @@ def create_instance_from_cost_matrix(
     edge_weight_format: EdgeWeightFormat = "FULL_MATRIX",
     display_data_type: DisplayDataType = "NO_DISPLAY",
     display_coordinates: list = None,
-    benchmark: Benchmark = None
+    benchmark: Benchmark = None,
+    distance_storage: DistanceStorage = "dense",
+    allow_float32: bool = False
 ):
     """
-    Creates a TSPLIB-formatted TSP instance from a cost matrix.
+    Creates a TSP instance from a cost matrix.
+
+    A full matrix given as array is used directly (without copy); TSPLIB text is only generated
+    on export (see Instance.to_tsplib).
 
     Args:
         name (str): Name of the TSP instance.
-        cost_matrix (list): 2D list representing the cost/distance matrix.
+        cost_matrix (list or np.ndarray): 2D list or (n x n) array representing the cost/distance matrix (for other
+            edge weight formats, the rows of the triangle in the respective order).
         comment (str, optional): Optional comment describing the instance.
         edge_weight_type (EdgeWeightType, optional): Type of edge weights (default is EXPLICIT).
         edge_weight_format (EdgeWeightFormat, optional): Format of edge weights (default is FULL_MATRIX).
         display_data_type (DisplayDataType, optional): Optional display type for graphical visualization.
         display_coordinates (list, optional): Optional list of (x, y) coordinates for display.
         benchmark (Benchmark): A benchmark object to be added to the new instance.
+        distance_storage (DistanceStorage): Storage layout of the distance matrix (default is dense).
+        allow_float32 (bool): Store non-integral weights as float32 instead of float64 (default is False).
 
     Returns:
-        Instance: A parsed TSPLIB instance using tsplib95.
+        Instance: A TSP instance with node IDs 0..n-1 (1..n if display coordinates are given).
     """
-
-    # Build the TSPLIB header with metadata and configuration
-    text = f"""NAME: {name}
-TYPE: TSP
-COMMENT: {comment}
-DIMENSION: {len(cost_matrix[0])}
-EDGE_WEIGHT_TYPE: {edge_weight_type}
-EDGE_WEIGHT_FORMAT: {edge_weight_format}"""
-
-    # Optionally include display data type if provided
-    if display_data_type is not None:
-        text += f"""
-DISPLAY_DATA_TYPE: {display_data_type}"""
-
-    # Add the edge weight section with the cost matrix values
-    text += f"""
-EDGE_WEIGHT_SECTION"""
-
-    for row in cost_matrix:
-        text += "\n"
-        for cost in row:
-            text += " " + str(cost)
-
-    # Add display coordinates if provided
-    if display_coordinates:
-        text += """
-DISPLAY_DATA_SECTION"""
-        for idx, c in enumerate(display_coordinates):
-            text += f"""
-   {idx + 1}   {c[0]}   {c[1]}"""
-
-    # Mark the end of the TSPLIB file
-    text += """
-EOF
-"""
-
-    # Parse the TSPLIB-formatted string and return the instance
-    return Instance(TSPLIB=tsplib95.parse(text), 
-                    benchmark=benchmark)
+    if edge_weight_format == "FULL_MATRIX":
+        edge_weights = np.asarray(cost_matrix)
+        dimension = len(edge_weights)
+    else:
+        values = np.concatenate([np.asarray(row).ravel() for row in cost_matrix])
+        dimension = dimension_from_count(len(values), edge_weight_format)
+        edge_weights = expand_edge_weights(values, edge_weight_format, dimension)
+
+    specification = {
+        "name": name,
+        "type": "TSP",
+        "comment": comment,
+        "dimension": dimension,
+        "edge_weight_type": edge_weight_type,
+        "edge_weight_format": edge_weight_format,
+        "display_data_type": display_data_type
+    }
+
+    # Like tsplib95, node IDs follow the display data if given (1..n), otherwise they begin at 0
+    display_data = np.asarray(display_coordinates, dtype=np.float64) if display_coordinates is not None and len(display_coordinates) else None
+    node_ids = np.arange(1, dimension + 1) if display_data is not None else np.arange(dimension)
+
+    data = TSPLIBData(specification=specification,
+                      node_ids=node_ids,
+                      display_data=display_data,
+                      edge_weights=edge_weights)
+
+    return Instance(TSPLIB=data, 
+                    benchmark=benchmark,
+                    distance_storage=distance_storage,
+                    allow_float32=allow_float32)
 
 
 class Instance:
@@ -164,43 +200,203 @@ class Instance:
     Provides convenient access to nodes, edges, and weight-related utilities.
     """
 
-    def __init__(self, TSPLIB, benchmark: Benchmark = None):
+    def __init__(self, TSPLIB, benchmark: Benchmark = None, distance_storage: DistanceStorage = "dense", allow_float32: bool = False,
+                 oracle_cache_bytes: int = 256 * 2**20, cache: InstanceCache = None):
         """
         Initializes the Instance with a parsed TSPLIB object.
 
         Args:
-            TSPLIB: A parsed TSPLIB95 instance.
+            TSPLIB: A parsed TSPLIB95 instance, or a TSPLIBData object from the native parser (then the
+                tsplib95 object is only built if the TSPLIB attribute is accessed).
             benchmark (Benchmark): A benchmark object to be added to the new instance.
+            distance_storage (DistanceStorage): Storage layout of the distance matrix. "packed" keeps only the
+                upper triangle and requires a symmetric instance. "oracle" computes rows on demand and requires
+                node coordinates with a vectorized edge weight type (default is dense).
+            allow_float32 (bool): Store non-integral weights as float32 instead of float64 (default is False).
+            oracle_cache_bytes (int): Memory budget of the row cache for distance_storage="oracle" (default is 256 MB).
+            cache (InstanceCache, optional): On-disk cache entry for the dense distance matrix and the candidate lists.
         """
-        # Set TSPLIB instance
-        self.TSPLIB = TSPLIB
+        # Set TSPLIB data (the tsplib95 object is available via the TSPLIB property)
+        self.tsplib_data = TSPLIB if isinstance(TSPLIB, TSPLIBData) else TSPLIBData.from_problem(TSPLIB)
 
         # Set benchmark 
         self.benchmark = benchmark
         
         # Set name from TSPLIB instance
-        self.name = self.TSPLIB.name
-
-        # Get nodes from TSPLIB data (if available, add coordinates)
-        if 'node_coords' in self.TSPLIB.as_name_dict():
-            self.nodes = [Node2D(id=n, x=self.TSPLIB.node_coords[n][0], y=self.TSPLIB.node_coords[n][1]) 
-                          for n in self.TSPLIB.get_nodes()]
-        elif 'display_data' in self.TSPLIB.as_name_dict() and self.TSPLIB.display_data_type == "TWOD_DISPLAY":
-            self.nodes = [Node2D(id=n, x=self.TSPLIB.display_data[n][0], y=self.TSPLIB.display_data[n][1]) 
-                          for n in self.TSPLIB.get_nodes()]
-        else:
-            self.nodes = [Node(id=n) for n in self.TSPLIB.get_nodes()]
+        self.name = self.tsplib_data.name
+
+        # Store node IDs and coordinates as arrays (Node objects are only created on demand, see nodes)
+        self.node_ids = self.tsplib_data.node_ids
 
         # Compute number of stops/nodes
-        self.number_of_stops = len(self.nodes)
-        
-    def get_weight(self, source, target):
+        self.number_of_stops = len(self.node_ids)
+
+        # Keep the node coordinates as an array for the vectorized distance functions
+        self.edge_weight_type = self.tsplib_data.edge_weight_type
+        self.coordinates = self.tsplib_data.node_coords
+
+        # 2D positions for Node2D objects and plots (node coordinates, else explicit display data)
+        if self.coordinates is not None:
+            self.display_coordinates = self.coordinates[:, :2]
+        elif self.tsplib_data.display_data is not None and self.tsplib_data.display_data_type == "TWOD_DISPLAY":
+            self.display_coordinates = self.tsplib_data.display_data
+        else:
+            self.display_coordinates = None
+        self._nodes = None
+
+        # Map node IDs to rows/columns of the distance matrix (and back)
+        self.index_to_id = self.node_ids.tolist()
+        self.id_to_index = {node_id: idx for idx, node_id in enumerate(self.index_to_id)}
+
+        # The distance matrix is built on first use (see get_distance_matrix)
+        self.distance_storage = distance_storage
+        self.allow_float32 = allow_float32
+        self.oracle_cache_bytes = oracle_cache_bytes
+        self._distance_matrix = None
+
+        # Candidate neighbor lists are computed on first use (see get_candidates)
+        self._candidates = {}
+
+        # Set on-disk cache entry
+        self.cache = cache
+
+        # Held-Karp bound and penalties are computed on first use (see get_held_karp_bound)
+        self._held_karp = None
+
+        # Whether w(i, j) == w(j, i) for all nodes, checked on first use (see is_symmetric)
+        self._symmetric = None
+
+        # Set by subset() and reorder(): the parent instance and the parent index of every node
+        self.parent = None
+        self.parent_indices = None
+
+        # Set by collapse_duplicates(): maps a node index to the parent indices of its duplicates
+        self.duplicates = None
+
+        # Set by SharedInstance.attach(): the handle whose shared segments hold the arrays of this instance
+        self.shared = None
+
+    @property
+    def nodes(self):
         """
-        Retrieve the weight (distance or cost) between two nodes.
+        The nodes of the instance as Node objects (Node2D if the instance has 2D positions).
+
+        The objects are created on first access; the solvers work on the node_ids and coordinates arrays.
+        """
+        if self._nodes is None:
+            if self.display_coordinates is not None:
+                self._nodes = [Node2D(id=n, x=x, y=y) for n, (x, y) in zip(self.index_to_id, self.display_coordinates.tolist())]
+            else:
+                self._nodes = [Node(id=n) for n in self.index_to_id]
+
+        return self._nodes
+
+    @property
+    def TSPLIB(self):
+        """
+        The tsplib95 object of the instance (parsed on first access for instances loaded with the native parser).
+        """
+        return self.tsplib_data.problem
+
+    def get_distance_matrix(self):
+        """
+        Return the distance matrix of the instance.
+
+        The matrix is computed once on first use and cached afterwards. Row and column k
+        belong to the node with ID index_to_id[k] (use id_to_index for the reverse lookup).
+        Weights are stored with the smallest dtype that holds them exactly (see select_dtype).
+        With an on-disk cache, dense matrices are stored there and memory-mapped on later loads.
+
+        Returns:
+            np.ndarray, PackedSymmetricMatrix or DistanceOracle: An (n x n) matrix holding the weights between all pairs of nodes.
+        """
+        if self._distance_matrix is None:
+            # Only dense matrices are cached on disk
+            cache_name = "distance_matrix_float32" if self.allow_float32 else "distance_matrix"
+            if self.cache and self.distance_storage == "dense":
+                self._distance_matrix = self.cache.load_array(cache_name)
+
+            if self._distance_matrix is None:
+                self._distance_matrix = self._build_distance_matrix()
+                if self.cache and self.distance_storage == "dense":
+                    self.cache.save_array(cache_name, self._distance_matrix)
+
+        return self._distance_matrix
+
+    def _build_distance_matrix(self, max_block_entries: int = 2**22):
+        """
+        Compute the distance matrix in the configured storage layout.
+
+        Instances with node coordinates and a supported edge weight type are computed with the
+        vectorized distance functions, one block of rows at a time. Explicit instances use the
+        parsed EDGE_WEIGHT_SECTION. All other instances query the TSPLIB object for every pair of nodes.
+
+        Args:
+            max_block_entries (int): Max. number of matrix entries computed per vectorized call.
+
+        Returns:
+            np.ndarray, PackedSymmetricMatrix or DistanceOracle: An (n x n) matrix holding the weights between all pairs of nodes.
+
+        Raises:
+            ValueError: If the packed layout is requested for an asymmetric instance, or the oracle for an
+                instance without vectorized distance function.
+        """
+        n = self.number_of_stops
+
+        if self.distance_storage == "oracle":
+            if self.coordinates is None:
+                raise ValueError(f"Oracle distance storage requires node coordinates, but {self.name} has none.")
+            return DistanceOracle(edge_weight_type=self.edge_weight_type,
+                                  coordinates=self.coordinates,
+                                  max_cache_bytes=self.oracle_cache_bytes)
+
+        if self.coordinates is None or self.edge_weight_type not in distances.TYPES:
+            # Explicit weights come parsed, special distance functions need the TSPLIB object
+            if self.tsplib_data.edge_weights is not None:
+                distance_matrix = compact(self.tsplib_data.edge_weights, allow_float32=self.allow_float32)
+            else:
+                distance_matrix = compact(np.array([[self._get_weight_from_tsplib(source_id, target_id) for target_id in self.index_to_id]
+                                                    for source_id in self.index_to_id]),
+                                          allow_float32=self.allow_float32)
+            if self.distance_storage != "packed":
+                return distance_matrix
+
+            if not np.array_equal(distance_matrix, distance_matrix.T):
+                raise ValueError(f"Packed distance storage requires a symmetric instance, but {self.name} is asymmetric.")
+
+            packed_matrix = PackedSymmetricMatrix(size=n, dtype=distance_matrix.dtype)
+            for i in range(n):
+                packed_matrix.set_row(i, distance_matrix[i])
+            return packed_matrix
+
+        # Pick the dtype from an upper bound, so the matrix never exists in int64
+        dtype = select_dtype(0, distances.weight_upper_bound(self.edge_weight_type, self.coordinates))
+
+        if self.distance_storage == "packed":
+            distance_matrix = PackedSymmetricMatrix(size=n, dtype=dtype)
+        else:
+            distance_matrix = np.empty((n, n), dtype=dtype)
+
+        block_size = max(1, max_block_entries // n)
+        for start in range(0, n, block_size):
+            rows = slice(start, min(start + block_size, n))
+            block = distances.compute_weights(self.edge_weight_type, self.coordinates, rows)
+
+            if self.distance_storage == "packed":
+                for i, row in enumerate(block, start=start):
+                    distance_matrix.set_row(i, row)
+            else:
+                distance_matrix[rows] = block
+
+        return distance_matrix
+
+    def _get_weight_from_tsplib(self, source_id, target_id):
+        """
+        Retrieve the weight between two nodes directly from the TSPLIB object.
 
         Args:
-            source (int): The source node.
-            target (int): The target node.
+            source_id (int): The source node ID.
+            target_id (int): The target node ID.
 
         Returns:
             float: The weight between the source and target nodes.
@@ -209,18 +405,37 @@ class Instance:
             Exception: If the weight cannot be retrieved due to invalid node IDs or internal errors.
         """
         try:
-            return self.TSPLIB.get_weight(source.id, target.id)
+            return self.TSPLIB.get_weight(source_id, target_id)
         except Exception as e:
-            print(f"Error: Unable to retrieve weight between source={source} and target={target}. Please ensure that node IDs are correctly defined. Exception: {e}")
+            print(f"Error: Unable to retrieve weight between source={source_id} and target={target_id}. Please ensure that node IDs are correctly defined. Exception: {e}")
             raise
-        
+
+    def get_weight(self, source, target):
+        """
+        Retrieve the weight (distance or cost) between two nodes.
+
+        Args:
+            source (Node): The source node.
+            target (Node): The target node.
+
+        Returns:
+            float: The weight between the source and target nodes.
+
+        Raises:
+            Exception: If the weight cannot be retrieved due to invalid node IDs or internal errors.
+        """
+        return self.get_weight_via_id(source.id, target.id)
+
     def get_weight_via_id(self, source_id, target_id):
         """
         Retrieve the weight (distance or cost) between two nodes.
 
+        The weight is looked up in the cached distance matrix (see w()). The TSPLIB object is only
+        consulted for node IDs that are not part of the matrix.
+
         Args:
-            source (int): The source node ID.
-            target (int): The target node ID.
+            source_id (int): The source node ID.
+            target_id (int): The target node ID.
 
         Returns:
             float: The weight between the source and target nodes.
@@ -229,11 +444,352 @@ class Instance:
             Exception: If the weight cannot be retrieved due to invalid node IDs or internal errors.
         """
         try:
-            return self.TSPLIB.get_weight(source_id, target_id)
-        except Exception as e:
-            print(f"Error: Unable to retrieve weight between source={source_id} and target={target_id}. Please ensure that node IDs are correctly defined. Exception: {e}")
-            raise
-        
+            source_idx = self.id_to_index[source_id]
+            target_idx = self.id_to_index[target_id]
+        except KeyError:
+            return self._get_weight_from_tsplib(source_id, target_id)
+
+        return self.w(source_idx, target_idx)
+
+    def w(self, i, j):
+        """
+        Retrieve the weight between two nodes given by their index (position in self.nodes).
+
+        Args:
+            i (int): The source index.
+            j (int): The target index.
+
+        Returns:
+            float: The weight between the source and target nodes.
+        """
+        # Convert to a native Python number (keeps int weights as int)
+        if self._uses_pairwise_weights():
+            return self.weights(i, j).item()
+        return self.get_distance_matrix()[i, j].item()
+
+    def weights(self, src_idx, dst_idx):
+        """
+        Retrieve the weights between many pairs of nodes given by their indices in a single gather.
+
+        The result is upcast to int64 (or float64), so sums and differences cannot overflow the
+        compact dtype of the distance matrix. Large instances (PAIRWISE_WEIGHTS_MIN_NODES) whose
+        distance matrix has not been built compute the weights from their coordinates instead.
+
+        Args:
+            src_idx (array-like): Source indices.
+            dst_idx (array-like): Target indices (broadcastable against src_idx).
+
+        Returns:
+            np.ndarray: The weights between src_idx[k] and dst_idx[k].
+        """
+        src_idx = np.asarray(src_idx, dtype=np.intp)
+        dst_idx = np.asarray(dst_idx, dtype=np.intp)
+        if self._uses_pairwise_weights():
+            weights = distances.compute_pairwise_weights(self.edge_weight_type, self.coordinates[src_idx], self.coordinates[dst_idx])
+        else:
+            weights = np.asarray(self.get_distance_matrix()[src_idx, dst_idx])
+        return weights.astype(np.result_type(weights.dtype, np.int64), copy=False)
+
+    def _uses_pairwise_weights(self):
+        """
+        Check whether weights are computed from the coordinates, because the distance matrix of this large
+        instance has not been built (yet).
+        """
+        return (self._distance_matrix is None and self.number_of_stops >= PAIRWISE_WEIGHTS_MIN_NODES
+                and self.coordinates is not None and self.edge_weight_type in distances.TYPES)
+
+    def is_symmetric(self):
+        """
+        Check whether the weights are symmetric, i.e., w(i, j) == w(j, i) for all nodes.
+
+        Weights computed from coordinates always are, explicit weights are compared with their
+        transpose once and the result is cached.
+
+        Returns:
+            bool: True if the instance is symmetric.
+        """
+        if self._symmetric is None:
+            if self.coordinates is not None and self.edge_weight_type in distances.TYPES:
+                self._symmetric = True
+            else:
+                nodes = np.arange(self.number_of_stops)
+                weights = self.weights(nodes[:, np.newaxis], nodes)
+                self._symmetric = bool(np.array_equal(weights, weights.T))
+        return self._symmetric
+
+    def get_indices(self, nodes):
+        """
+        Translate a sequence of nodes into their indices (position in self.nodes).
+
+        Args:
+            nodes (list): A list of Node objects.
+
+        Returns:
+            np.ndarray: The indices of the nodes.
+
+        Raises:
+            KeyError: If a node ID is not part of the instance.
+        """
+        return np.fromiter((self.id_to_index[n.id] for n in nodes), dtype=np.intp, count=len(nodes))
+
+    def get_candidates(self, k: int = 10, method: CandidateMethod = "nearest"):
+        """
+        Return the candidate neighbor lists of the instance.
+
+        The candidates are computed once per (method, k) and cached, so all solution methods
+        working on the same instance (e.g., within an Experiment) share them. With an on-disk
+        cache, they are also shared across processes and runs.
+
+        Args:
+            k (int): Number of candidates per node (default is 10, at most n - 1).
+            method (CandidateMethod): How the candidates are selected (default is nearest).
+
+        Returns:
+            np.ndarray: An (n x k) int32 array; row i holds the indices of the candidates of node i, sorted by weight
+                (by alpha value for method="alpha").
+        """
+        key = (method, k)
+        if key not in self._candidates and self.cache:
+            self._candidates[key] = self.cache.load_array(f"candidates_{method}_{k}")
+
+        if self._candidates.get(key) is None:
+            self._candidates[key] = candidates.TYPES[method](self, k)
+            if self.cache:
+                self.cache.save_array(f"candidates_{method}_{k}", self._candidates[key])
+
+        return self._candidates[key]
+
+    def get_held_karp_bound(self, max_iterations: int = 1000):
+        """
+        Return the Held-Karp lower bound on the optimal tour length.
+
+        The bound is the length of a minimum 1-tree under subgradient-optimized node penalties pi
+        (see held_karp.subgradient_optimization). It is computed once and cached; the alpha-nearness
+        candidates reuse the penalties.
+
+        Args:
+            max_iterations (int): Max. number of 1-trees computed by the subgradient optimization (default is 1000).
+
+        Returns:
+            tuple: (lower_bound, pi) with the lower bound (float) and the node penalties (np.ndarray, by node index).
+
+        Raises:
+            ValueError: If the instance has less than 3 nodes.
+        """
+        if self.number_of_stops < 3:
+            raise ValueError(f"The Held-Karp bound requires at least 3 nodes, but {self.name} has {self.number_of_stops}.")
+
+        if self._held_karp is None:
+            self._held_karp = held_karp.subgradient_optimization(self, max_iterations=max_iterations)
+
+        return self._held_karp
+
+    def subset(self, indices):
+        """
+        Return a sub-instance on some of the nodes that shares the data of this instance.
+
+        The distance matrix of the sub-instance is a view of this instance's matrix (see SubsetMatrix),
+        so nothing is parsed or copied; with a slice, coordinates and dense matrices are plain NumPy views.
+        Instances with vectorized weights and no matrix yet only gather the coordinates, and the
+        sub-instance computes its (smaller) matrix on first use. Node IDs are kept, so node-based tours
+        of the sub-instance are valid for this instance, and index-based tours map back with to_parent_indices().
+
+        Args:
+            indices (array-like or slice): The indices (positions in self.nodes) of the nodes, in their order in the sub-instance.
+
+        Returns:
+            Instance: The sub-instance (without benchmark, candidates and on-disk cache).
+        """
+        if isinstance(indices, slice):
+            rows = indices
+            indices = np.arange(self.number_of_stops)[indices]
+        else:
+            indices = np.asarray(indices, dtype=np.int64)
+            rows = indices
+
+        # Share the parent's matrix unless the sub-instance can compute its own from coordinates
+        distance_matrix = self._distance_matrix
+        if distance_matrix is None and (self.coordinates is None or self.edge_weight_type not in distances.TYPES):
+            distance_matrix = self.get_distance_matrix()
+
+        if isinstance(distance_matrix, np.ndarray) and isinstance(rows, slice):
+            distance_matrix = distance_matrix[rows, rows]
+        elif distance_matrix is not None:
+            distance_matrix = SubsetMatrix(distance_matrix, indices)
+
+        data = self.tsplib_data
+        select = lambda array: None if array is None else array[rows]
+
+        # Explicit weights stay a full matrix (a view for slices), so the sub-instance can be exported in any format
+        if data.edge_weights is None:
+            edge_weights = None
+        elif isinstance(rows, slice):
+            edge_weights = data.edge_weights[rows, rows]
+        else:
+            edge_weights = data.edge_weights[np.ix_(indices, indices)]
+
+        sub_data = TSPLIBData(specification=dict(data.specification, dimension=len(indices)),
+                              node_ids=select(data.node_ids),
+                              node_coords=select(data.node_coords),
+                              display_data=select(data.display_data),
+                              edge_weights=edge_weights)
+
+        sub_instance = Instance(TSPLIB=sub_data,
+                                distance_storage=self.distance_storage,
+                                allow_float32=self.allow_float32,
+                                oracle_cache_bytes=self.oracle_cache_bytes)
+        sub_instance._distance_matrix = distance_matrix
+        sub_instance.parent = self
+        sub_instance.parent_indices = indices
+
+        return sub_instance
+
+    def reorder(self, order: NodeOrder = "hilbert"):
+        """
+        Return a copy of the instance with the nodes renumbered along a space-filling curve.
+
+        Nearby nodes get nearby indices, so the matrix rows and columns visited by tours and candidate
+        lists lie close together in memory (fewer cache misses on large instances). Coordinates, explicit
+        weights, a dense distance matrix, the candidate lists and the Held-Karp penalties are permuted
+        (nothing is recomputed). Node IDs are kept, so tours map back to the TSPLIB IDs as they are;
+        index-based tours map back with to_parent_indices().
+
+        Args:
+            order (NodeOrder): The space-filling curve (default is hilbert).
+
+        Returns:
+            Instance: The reordered instance.
+
+        Raises:
+            ValueError: If the instance has no 2D positions.
+        """
+        permutation = ordering.TYPES[order](self)
+        inverse = np.empty_like(permutation)
+        inverse[permutation] = np.arange(len(permutation))
+
+        data = self.tsplib_data
+        select = lambda array: None if array is None else array[permutation]
+        reordered_data = TSPLIBData(specification=dict(data.specification),
+                                    node_ids=select(data.node_ids),
+                                    node_coords=select(data.node_coords),
+                                    display_data=select(data.display_data),
+                                    edge_weights=None if data.edge_weights is None else data.edge_weights[np.ix_(permutation, permutation)])
+
+        reordered = Instance(TSPLIB=reordered_data,
+                             benchmark=self.benchmark,
+                             distance_storage=self.distance_storage,
+                             allow_float32=self.allow_float32,
+                             oracle_cache_bytes=self.oracle_cache_bytes)
+
+        # Other layouts are rebuilt on first use (as cheap as permuting them)
+        if isinstance(self._distance_matrix, np.ndarray):
+            reordered._distance_matrix = self._distance_matrix[np.ix_(permutation, permutation)]
+
+        # Candidate row i of the reordered instance is row permutation[i], with renumbered entries
+        for key, candidate_lists in self._candidates.items():
+            if candidate_lists is not None:
+                reordered._candidates[key] = inverse[candidate_lists[permutation]].astype(candidate_lists.dtype)
+
+        if self._held_karp is not None:
+            lower_bound, pi = self._held_karp
+            reordered._held_karp = (lower_bound, pi[permutation])
+
+        reordered.parent = self
+        reordered.parent_indices = permutation
+
+        return reordered
+
+    def collapse_duplicates(self):
+        """
+        Return a reduced instance with one representative node per group of duplicate nodes.
+
+        Duplicates are nodes 0 apart with identical coordinates (or identical rows and columns of the
+        distance matrix for instances without coordinates). They have the same weight to every other
+        node, so a tour of the reduced instance expands into a tour of this instance with the same
+        weight by visiting the duplicates right after their representative (see expand_tour()).
+        The representative is the first node of each group, and the reduced instance is a subset view.
+
+        Returns:
+            Instance: The reduced instance (this instance if it has no duplicates).
+        """
+        if self.coordinates is not None:
+            keys = self.coordinates
+        else:
+            distance_matrix = np.asarray(self.get_distance_matrix())
+            keys = np.hstack((distance_matrix, distance_matrix.T))
+
+        _, first, labels = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        groups = first[labels.reshape(-1)]
+        is_duplicate = groups != np.arange(self.number_of_stops)
+
+        # Only nodes 0 apart can be visited at no cost (e.g., GEO weights identical points 1 apart)
+        nodes = np.flatnonzero(is_duplicate)
+        is_zero = (candidates.pair_weights(self, groups[nodes], nodes) == 0) & (candidates.pair_weights(self, nodes, groups[nodes]) == 0)
+        is_duplicate[nodes[~is_zero]] = False
+        if not is_duplicate.any():
+            return self
+
+        representatives = np.flatnonzero(~is_duplicate)
+        reduced = self.subset(representatives)
+        reduced.benchmark = self.benchmark
+
+        # Group the duplicates by the reduced index of their representative (in node order)
+        nodes = np.flatnonzero(is_duplicate)
+        reduced.duplicates = {}
+        for node, group in zip(nodes.tolist(), np.searchsorted(representatives, groups[nodes]).tolist()):
+            reduced.duplicates.setdefault(group, []).append(node)
+
+        return reduced
+
+    def expand_tour(self, tour):
+        """
+        Translate a tour of a reduced (or other derived) instance into a tour of its parent instance.
+
+        The duplicates collapsed by collapse_duplicates() are inserted right after their representative,
+        which does not change the weight of the tour.
+
+        Args:
+            tour (Tour): A tour of this instance (that may end with its first node).
+
+        Returns:
+            Tour: The tour of the parent instance (the given tour if this instance has no parent).
+        """
+        # Imported here, since the Tour module refers to instances
+        from pytsp.structures.Tour import Tour
+
+        if self.parent is None:
+            return tour
+
+        indices = tour.indices
+        is_closed = len(indices) > 1 and indices[0] == indices[-1]
+        duplicates = self.duplicates or {}
+
+        expanded = []
+        for index in (indices[:-1] if is_closed else indices).tolist():
+            expanded.append(self.parent_indices[index])
+            expanded.extend(duplicates.get(index, ()))
+        if is_closed:
+            expanded.append(expanded[0])
+
+        return Tour(instance=self.parent,
+                    solution_method=tour.solution_method,
+                    sequence=np.array(expanded, dtype=np.int64),
+                    runtime_in_sec=tour.runtime_in_sec)
+
+    def to_parent_indices(self, indices):
+        """
+        Translate indices of a sub-instance into indices of its parent instance.
+
+        Args:
+            indices (array-like): Node indices (positions in self.nodes), e.g., an index-based tour.
+
+        Returns:
+            np.ndarray: The indices in the parent instance (unchanged if the instance is no subset).
+        """
+        if self.parent_indices is None:
+            return np.asarray(indices)
+        return self.parent_indices[np.asarray(indices, dtype=np.int64)]
+
     def get_full_cost_matrix(self):
         """
         Constructs and returns the full cost matrix of the TSP instance.
@@ -241,16 +797,23 @@ class Instance:
         Returns:
             A 2D list representing the cost matrix.
         """
-        cost_matrix = []
+        return np.asarray(self.get_distance_matrix()).tolist()
+
+    def to_tsplib(self, path=None):
+        """
+        Export the instance as TSPLIB text.
 
-        # Iterate over all node pairs to compute weights
-        for source in self.nodes:
-            cost_matrix_row = []
-            for target in self.nodes:
-                cost_matrix_row.append(self.get_weight(source, target))
-            cost_matrix.append(cost_matrix_row)
+        Args:
+            path (str or Path, optional): Write the text to this file.
 
-        return cost_matrix
+        Returns:
+            str: The TSPLIB-formatted text.
+        """
+        text = self.tsplib_data.to_text()
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(text)
+        return text
 
     def get_info(self):
         """
@@ -259,7 +822,7 @@ class Instance:
         Returns:
             str: A string describing the number of nodes and edges.
         """
-        return f"TSP {self.name} with {len(self.nodes)} nodes."
+        return f"TSP {self.name} with {self.number_of_stops} nodes."
 
     def __str__(self):
         """
@@ -284,24 +847,24 @@ class Instance:
         """
 
         # Exit if instance does not include node coordinates
-        if not isinstance(self.nodes[0], Node2D):
+        if self.display_coordinates is None:
             print("Error: Plotting failed because no node coordinates were provided.")
             return None
-        
-        # Retrieve node coordinates
-        node_coords = {n.id: (n.x, n.y) for n in self.nodes}
+
+        # Imported here, since plotly and pandas take long to import and are only needed for plots
+        import plotly.express as px
+        import pandas as pd
 
         if tour is None:
             # Plot only the nodes if no tour is provided
-            x_values = [v[0] for v in node_coords.values()]
-            y_values = [v[1] for v in node_coords.values()]
+            x_values, y_values = self.display_coordinates.T
 
             df = pd.DataFrame(dict(x=x_values, y=y_values))
 
             fig = px.scatter(df, x="x", y="y", title=f"Instance: {self.get_info()}")
         else:
             # Plot the tour path including return to the start
-            x_values, y_values = zip(*(node_coords[n.id] for n in tour.sequence + [tour.sequence[0]]))
+            x_values, y_values = self.display_coordinates[np.append(tour.indices, tour.indices[0])].T
 
             df = pd.DataFrame(dict(x=x_values, y=y_values))
 
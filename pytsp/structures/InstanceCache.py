@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from pytsp.structures.tsplib import TSPLIBData
+
+# Arrays of a TSPLIBData object that are stored in a cache entry
+DATA_ARRAYS = ["node_ids", "node_coords", "display_data", "edge_weights"]
+
+
+def file_hash(path, chunk_size: int = 2**20):
+    """
+    Compute the SHA-256 hash of a file.
+
+    Args:
+        path (Path): The file.
+        chunk_size (int): Number of bytes read at once.
+
+    Returns:
+        str: The hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class InstanceCache:
+    """
+    On-disk cache entry of a TSPLIB file: one directory of .npy files per file content.
+
+    The entry is keyed by the hash of the source file, so edited files get a new entry. Arrays are
+    loaded memory-mapped (read-only), which lets all worker processes loading the same instance share
+    the page cache instead of keeping private copies. Files are written to a temporary name and renamed,
+    so concurrent workers never see partially written arrays.
+    """
+
+    def __init__(self, source_path, cache_dir):
+        """
+        Initialize the cache entry of a TSPLIB file.
+
+        Args:
+            source_path (Path): The TSPLIB file.
+            cache_dir (str or Path): The root directory of the cache.
+        """
+        self.source_path = Path(source_path)
+        self.directory = Path(cache_dir) / f"{self.source_path.stem}-{file_hash(self.source_path)[:16]}"
+
+    def _array_path(self, name: str):
+        return self.directory / f"{name}.npy"
+
+    def load_array(self, name: str):
+        """
+        Load an array of the entry memory-mapped.
+
+        Args:
+            name (str): The name of the array.
+
+        Returns:
+            np.ndarray or None: The read-only memory-mapped array, or None if the entry has no such array.
+        """
+        path = self._array_path(name)
+        if not path.is_file():
+            return None
+
+        return np.load(path, mmap_mode="r")
+
+    def save_array(self, name: str, array):
+        """
+        Store an array in the entry (atomically replacing an existing one).
+
+        Args:
+            name (str): The name of the array.
+            array (np.ndarray): The array.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".npy.tmp")
+        with os.fdopen(descriptor, "wb") as file:
+            np.save(file, np.asarray(array))
+        os.replace(temporary_path, self._array_path(name))
+
+    def load_data(self):
+        """
+        Load the parsed TSPLIB data of the entry.
+
+        Returns:
+            TSPLIBData or None: The data with memory-mapped arrays, or None if the entry is empty.
+        """
+        specification_path = self.directory / "specification.json"
+        if not specification_path.is_file():
+            return None
+
+        with open(specification_path) as file:
+            specification = json.load(file)
+
+        arrays = {name: self.load_array(name) for name in DATA_ARRAYS}
+        return TSPLIBData(specification=specification, path=self.source_path, **arrays)
+
+    def save_data(self, data: TSPLIBData):
+        """
+        Store parsed TSPLIB data in the entry.
+
+        Args:
+            data (TSPLIBData): The parsed data.
+        """
+        for name in DATA_ARRAYS:
+            if getattr(data, name) is not None:
+                self.save_array(name, getattr(data, name))
+
+        # The specification is written last and marks the entry as complete
+        self.directory.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".json.tmp")
+        with os.fdopen(descriptor, "w") as file:
+            json.dump(data.specification, file)
+        os.replace(temporary_path, self.directory / "specification.json")
@@ -13,6 +13,9 @@ class Node:
     The node class represent a node in space. It is implemented as a doubly linked list, where each node has its predecessor and successor node defined.
     """
 
+    # Fixed attributes instead of a __dict__ per node (succ, pred and pos are set by the lk_heuristic tour)
+    __slots__ = ("id", "succ", "pred", "pos")
+
     def __init__(self, id: int):
         """
         Initialize a node
@@ -79,6 +82,8 @@ class Node2D(Node):
     The node 2D class represent a node in 2D cartesian space.
     """
 
+    __slots__ = ("x", "y")
+
     def __init__(self, id: int, x: float, y: float):
         """
         Initialize a node with its cartesian values
@@ -118,6 +123,8 @@ class Node3D(Node):
     The node 3D class represent a node in 3D cartesian space.
     """
 
+    __slots__ = ("x", "y", "z")
+
     def __init__(self, id: int, x: float, y: float, z: float):
         """
         Initialize a node with its cartesian values
@@ -159,4 +166,5 @@ class NodePivot(Node):
     """
     The pivot node is a dummy node used at hamiltonian path tours, where edges containing these nodes will have zero cost
     """
-    pass
+
+    __slots__ = ()
@@ -0,0 +1,217 @@
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from pytsp.structures.Instance import Instance
+from pytsp.structures.DistanceMatrix import PackedSymmetricMatrix
+from pytsp.structures.tsplib import TSPLIBData
+
+
+def _open_segment(name: str = None, size: int = 0):
+    """
+    Create (without name) or attach (with name) a shared memory segment.
+
+    Only the publisher tracks its segments, so they are unlinked if it dies, but not when a worker
+    exits. Python < 3.13 always tracks attached segments as well; this is harmless for workers
+    started by multiprocessing from the publishing process, since they share its resource tracker.
+    """
+    if name is None:
+        return shared_memory.SharedMemory(create=True, size=size)
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedInstance:
+    """
+    Handle of an instance whose arrays are published in shared memory.
+
+    The handle is small and cheap to pickle, so it can be sent to worker processes instead of the
+    instance itself. Each worker calls attach() to get an Instance whose coordinates, distance matrix
+    and candidate lists are read-only views of the shared segments, so N workers share a single copy.
+
+    The publishing process owns the segments and must release them with unlink() (or use the handle
+    as a context manager) once all workers are done. A process only unmaps its segments once no array
+    handed out by attach() is alive, so attached instances stay valid after unlink().
+    """
+
+    def __init__(self, specification: dict, arrays: dict, distance_storage: str, allow_float32: bool,
+                 oracle_cache_bytes: int, path=None):
+        """
+        Initialize the handle (use SharedInstance.publish to create one).
+
+        Args:
+            specification (dict): The TSPLIB header fields of the instance.
+            arrays (dict): Maps array names to (segment name, shape, dtype) of the shared arrays.
+            distance_storage (DistanceStorage): The storage layout of the distance matrix.
+            allow_float32 (bool): Whether non-integral weights are stored as float32.
+            oracle_cache_bytes (int): Memory budget of the row cache for distance_storage="oracle".
+            path (Path, optional): The TSPLIB file of the instance (for the lazy tsplib95 object).
+        """
+        self.specification = specification
+        self.arrays = arrays
+        self.distance_storage = distance_storage
+        self.allow_float32 = allow_float32
+        self.oracle_cache_bytes = oracle_cache_bytes
+        self.path = path
+
+        # Segments created (publisher) or attached by this process, and weak references to the arrays
+        # handed out by attach() (views of an array keep it alive, so these cover all views of the segments)
+        self._segments = {}
+        self._views = []
+
+    def __getstate__(self):
+        # Segments are process-local, workers attach by name
+        state = self.__dict__.copy()
+        state["_segments"] = {}
+        state["_views"] = []
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.unlink()
+
+    @classmethod
+    def publish(cls, instance: Instance, distance_matrix: bool = True, candidates: bool = True):
+        """
+        Copy the arrays of an instance into shared memory.
+
+        Args:
+            instance (Instance): The instance to publish.
+            distance_matrix (bool): Publish the distance matrix (computed now if necessary; oracles are not
+                published, since workers compute their rows from the shared coordinates) (default is True).
+            candidates (bool): Publish all candidate lists computed so far (default is True).
+
+        Returns:
+            SharedInstance: The handle to send to the workers.
+        """
+        data = instance.tsplib_data
+        to_publish = {"node_ids": data.node_ids, "node_coords": data.node_coords, "display_data": data.display_data}
+
+        matrix = instance.get_distance_matrix() if distance_matrix and instance.distance_storage != "oracle" else None
+        if isinstance(matrix, PackedSymmetricMatrix):
+            to_publish["packed_distance_matrix"] = matrix.data
+        elif matrix is not None:
+            to_publish["distance_matrix"] = matrix
+
+        # Explicit weights are restored from a dense distance matrix (same values in a compact dtype)
+        if "distance_matrix" not in to_publish:
+            to_publish["edge_weights"] = data.edge_weights
+
+        if candidates:
+            for (method, k), candidate_lists in instance._candidates.items():
+                if candidate_lists is not None:
+                    to_publish[f"candidates/{method}/{k}"] = candidate_lists
+
+        handle = cls(specification=dict(data.specification), arrays={}, distance_storage=instance.distance_storage,
+                     allow_float32=instance.allow_float32, oracle_cache_bytes=instance.oracle_cache_bytes, path=data.path)
+
+        for name, array in to_publish.items():
+            if array is None:
+                continue
+            array = np.asarray(array)
+            segment = _open_segment(size=max(1, array.nbytes))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+            handle._segments[segment.name] = segment
+            handle.arrays[name] = (segment.name, array.shape, array.dtype.str)
+
+        return handle
+
+    def _attach_array(self, name: str):
+        """
+        Return a read-only view of a shared array (None if it was not published).
+        """
+        if name not in self.arrays:
+            return None
+
+        segment_name, shape, dtype = self.arrays[name]
+        if segment_name not in self._segments:
+            self._segments[segment_name] = _open_segment(name=segment_name)
+
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=self._segments[segment_name].buf)
+        array.flags.writeable = False
+        self._views.append(weakref.ref(array))
+        return array
+
+    def attach(self, benchmark=None):
+        """
+        Build an Instance on top of the shared arrays (no copy of coordinates, distance matrix or candidates).
+
+        Args:
+            benchmark (Benchmark, optional): A benchmark object to be added to the instance.
+
+        Returns:
+            Instance: The instance (keeps this handle alive, so the segments stay mapped).
+        """
+        distance_matrix = self._attach_array("distance_matrix")
+        edge_weights = self._attach_array("edge_weights")
+        if edge_weights is None and self.specification.get("edge_weight_type") == "EXPLICIT":
+            edge_weights = distance_matrix
+
+        data = TSPLIBData(specification=dict(self.specification),
+                          node_ids=self._attach_array("node_ids"),
+                          node_coords=self._attach_array("node_coords"),
+                          display_data=self._attach_array("display_data"),
+                          edge_weights=edge_weights,
+                          path=self.path)
+
+        instance = Instance(TSPLIB=data, benchmark=benchmark, distance_storage=self.distance_storage,
+                            allow_float32=self.allow_float32, oracle_cache_bytes=self.oracle_cache_bytes)
+        instance.shared = self
+
+        packed_data = self._attach_array("packed_distance_matrix")
+        if packed_data is not None:
+            instance._distance_matrix = PackedSymmetricMatrix(size=instance.number_of_stops, data=packed_data)
+        elif distance_matrix is not None:
+            instance._distance_matrix = distance_matrix
+
+        for name in self.arrays:
+            if name.startswith("candidates/"):
+                _, method, k = name.split("/")
+                instance._candidates[(method, int(k))] = self._attach_array(name)
+
+        return instance
+
+    def _has_views(self):
+        """
+        Check whether an array handed out by attach() (or a view of it) is still alive in this process.
+        """
+        self._views = [view for view in self._views if view() is not None]
+        return bool(self._views)
+
+    def close(self):
+        """
+        Unmap the segments in this process.
+
+        Raises:
+            BufferError: If an array of an attached instance is still alive (unmapping it would crash later reads).
+        """
+        if self._has_views():
+            raise BufferError("Cannot close the shared segments while arrays of attached instances are alive.")
+
+        for segment in self._segments.values():
+            segment.close()
+        self._segments = {}
+
+    def unlink(self):
+        """
+        Release the shared memory (publisher only, once all workers are done).
+
+        The names are removed right away; the memory is freed once no process maps it anymore. Segments
+        used by attached instances of this process stay mapped until close() is called after the
+        instances were dropped.
+        """
+        for segment_name, _, _ in self.arrays.values():
+            segment = self._segments.get(segment_name)
+            if segment is None:
+                segment = _open_segment(name=segment_name)
+                segment.close()
+            segment.unlink()
+
+        if not self._has_views():
+            self.close()
@@ -0,0 +1,185 @@
+from functools import lru_cache
+
+import numpy as np
+
+from pytsp.structures import candidates, distances
+
+
+class SpatialGrid:
+    """
+    Dynamic uniform grid over the 2D nodes of an instance for "nearest remaining node" queries.
+
+    Every cell holds the indices of its remaining nodes in a slice of one array (CSR layout), so
+    removing a node swaps it behind the end of its cell in O(1). A query scans the rings of cells
+    around a node until no cell further out can hold a node with a smaller weight, which takes close
+    to O(log n) time for points that are not extremely clustered. Once only a quarter of the nodes
+    remain, the grid is rebuilt with fewer cells, so queries late in a construction do not scan
+    large empty areas (the rebuilds add O(n) time in total).
+
+    Queries are exact: nearest() returns the node with the smallest TSPLIB weight (the lowest index
+    among equal weights), the same node as a scan of the whole distance matrix row.
+    """
+
+    def __init__(self, instance, points_per_cell: float = 2.0):
+        """
+        Build the grid over all nodes of an instance.
+
+        Args:
+            instance (Instance): The TSP instance.
+            points_per_cell (float): Average number of remaining nodes per cell (default is 2).
+
+        Raises:
+            ValueError: If the weights of the instance do not grow with the distance between 2D coordinates.
+        """
+        embedding = candidates.spatial_points(instance)
+        if embedding is None or embedding[0].shape[1] != 2 or instance.edge_weight_type == "GEO":
+            raise ValueError(f"A spatial grid requires 2D coordinates with a planar edge weight type, "
+                             f"but {instance.name} has {instance.edge_weight_type}.")
+
+        self.edge_weight_type = instance.edge_weight_type
+        self.points = np.asarray(embedding[0], dtype=np.float64)
+        self.points_per_cell = points_per_cell
+
+        self.n = len(self.points)
+        self.remaining = np.ones(self.n, dtype=bool)
+        self.size = self.n
+        self._build(np.arange(self.n))
+
+    def __len__(self):
+        return self.size
+
+    def _build(self, nodes: np.ndarray):
+        """
+        Distribute the given (remaining) nodes over a grid of square cells.
+        """
+        self._built_size = len(nodes)
+        points = self.points[nodes]
+        self._lower = points.min(axis=0)
+        span = points.max(axis=0) - self._lower
+
+        cells = max(1, int(np.ceil(np.sqrt(len(nodes) / self.points_per_cell))))
+        self._cell_size = span.max() / cells if span.max() > 0 else 1.0
+        self._shape = np.minimum(np.floor(span / self._cell_size).astype(np.int64) + 1, cells)
+
+        # Sort the nodes by cell: the nodes of cell c are members[start[c]:start[c] + count[c]]
+        self.cell = np.full(self.n, -1, dtype=np.int64)
+        self.cell[nodes] = self._cell_of(points)
+        order = np.argsort(self.cell[nodes], kind="stable")
+        self.members = nodes[order]
+        number_of_cells = int(self._shape.prod())
+        self.start = np.searchsorted(self.cell[self.members], np.arange(number_of_cells))
+        self.count = np.diff(np.append(self.start, len(self.members)))
+        self.slot = np.full(self.n, -1, dtype=np.int64)
+        self.slot[self.members] = np.arange(len(self.members))
+
+        # The weights are translation invariant, so the smallest weight of a node outside of the rings 0..r-1
+        # around a query (at least (r - 1) * cell_size away in x or y) only depends on r
+        offsets = np.zeros((int(self._shape.max()) + 1, 2))
+        offsets[1:, 0] = np.arange(len(offsets) - 1) * self._cell_size
+        self._ring_bounds = distances.compute_pairwise_weights(self.edge_weight_type, np.zeros_like(offsets), offsets)
+
+    def _cell_xy(self, points: np.ndarray):
+        """
+        Return the (clipped) cell coordinates of points.
+        """
+        xy = np.floor((points - self._lower) / self._cell_size).astype(np.int64)
+        return np.clip(xy, 0, self._shape - 1)
+
+    def _cell_of(self, points: np.ndarray):
+        xy = self._cell_xy(points)
+        return xy[..., 1] * self._shape[0] + xy[..., 0]
+
+    def remove(self, i: int):
+        """
+        Remove a node from the grid.
+
+        Args:
+            i (int): The node index.
+        """
+        if not self.remaining[i]:
+            return
+
+        # Swap the node with the last remaining node of its cell
+        c = self.cell[i]
+        last = self.start[c] + self.count[c] - 1
+        other = self.members[last]
+        self.members[self.slot[i]], self.members[last] = other, i
+        self.slot[other], self.slot[i] = self.slot[i], last
+        self.count[c] -= 1
+
+        self.remaining[i] = False
+        self.size -= 1
+        if 0 < self.size and 4 * self.size < self._built_size:
+            self._build(np.flatnonzero(self.remaining))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _ring_offsets(r: int):
+        """
+        Return the (x, y) offsets of the cells at Chebyshev distance r from a cell (at most 1 for r = 1).
+        """
+        if r == 1:
+            # Queries start with the 3 x 3 block around their cell
+            dx, dy = np.meshgrid(np.arange(-1, 2), np.arange(-1, 2))
+            return dx.ravel(), dy.ravel()
+
+        row = np.arange(-r, r + 1)
+        column = np.arange(-r + 1, r)
+        dx = np.concatenate((row, row, np.full(len(column), -r), np.full(len(column), r)))
+        dy = np.concatenate((np.full(len(row), -r), np.full(len(row), r), column, column))
+        return dx, dy
+
+    def _ring(self, x: int, y: int, r: int):
+        """
+        Return the cells at Chebyshev distance r (at most 1 for r = 1) from cell (x, y) that lie within the grid.
+        """
+        dx, dy = self._ring_offsets(r)
+        xs, ys = x + dx, y + dy
+        inside = (xs >= 0) & (xs < self._shape[0]) & (ys >= 0) & (ys < self._shape[1])
+        return ys[inside] * self._shape[0] + xs[inside]
+
+    def nearest(self, i: int):
+        """
+        Find the remaining node with the smallest weight from node i.
+
+        Args:
+            i (int): The node index (it may have been removed already).
+
+        Returns:
+            int: The nearest remaining node (the lowest index among equal weights).
+
+        Raises:
+            ValueError: If no node remains.
+        """
+        if self.size == 0 or (self.size == 1 and self.remaining[i]):
+            raise ValueError("No other node remains in the spatial grid.")
+
+        origin = self.points[i]
+        x, y = self._cell_xy(origin)
+        max_ring = max(x, y, self._shape[0] - 1 - x, self._shape[1] - 1 - y)
+        best_node, best_weight = None, None
+
+        for r in range(1, max(max_ring, 1) + 1):
+            # Nodes in ring r or beyond are at least (r - 1) * cell_size away in x or y, and weights grow with the distance
+            if best_node is not None and self._ring_bounds[r] > best_weight:
+                break
+
+            # Gather the remaining nodes of all cells in the ring
+            cells = self._ring(x, y, r)
+            counts = self.count[cells]
+            total = counts.sum()
+            if total == 0:
+                continue
+            first = np.repeat(self.start[cells] - np.cumsum(counts) + counts, counts)
+            nodes = self.members[first + np.arange(total)]
+            nodes = nodes[nodes != i]
+            if len(nodes) == 0:
+                continue
+
+            weights = distances.compute_pairwise_weights(self.edge_weight_type, origin[np.newaxis], self.points[nodes])
+            weight = weights.min()
+            node = nodes[weights == weight].min()
+            if best_node is None or weight < best_weight or (weight == best_weight and node < best_node):
+                best_node, best_weight = int(node), weight
+
+        return best_node
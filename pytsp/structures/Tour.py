@@ -1,15 +1,36 @@
 
+from collections.abc import Sequence
 from datetime import datetime
+import numpy as np
 
 def get_sequence_weight(instance: "Instance", sequence: list, add_return_to_start: bool = False):
     """
     Calculate the total weight (cost) of a sequence.
 
+    The sequence is either a list of Node objects or an integer array of node indices (positions in
+    instance.nodes). Both are evaluated with a single gather from the distance matrix.
+
     Returns:
         float: The total weight of the tour including return to the start.
     """
 
-    local_sequence = sequence.copy()
+    # Translate nodes into indices (nodes unknown to the distance matrix fall back to single lookups)
+    if isinstance(sequence, np.ndarray) and np.issubdtype(sequence.dtype, np.integer):
+        indices = sequence
+    elif isinstance(sequence, NodeSequence) and sequence.instance is instance:
+        indices = sequence.indices
+    else:
+        try:
+            indices = instance.get_indices(sequence)
+        except KeyError:
+            indices = None
+
+    if indices is not None:
+        if add_return_to_start and len(indices) > 0:
+            indices = np.append(indices, indices[0])
+        return instance.weights(indices[:-1], indices[1:]).sum().item()
+
+    local_sequence = list(sequence)
 
     if add_return_to_start:
         local_sequence.append(local_sequence[0])
@@ -24,37 +45,112 @@ def get_sequence_weight(instance: "Instance", sequence: list, add_return_to_star
     return total_weights
 
 
+class NodeSequence(Sequence):
+    """
+    Read-only view of a tour as Node objects.
+
+    The view only holds the index array of the tour; Node objects are looked up in instance.nodes
+    on access. Slices and concatenations return lists of nodes.
+    """
+
+    def __init__(self, instance: "Instance", indices: np.ndarray):
+        self.instance = instance
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, key):
+        nodes = self.instance.nodes
+        if isinstance(key, slice):
+            return [nodes[i] for i in self.indices[key].tolist()]
+        return nodes[self.indices[key]]
+
+    def __iter__(self):
+        nodes = self.instance.nodes
+        return (nodes[i] for i in self.indices.tolist())
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        return f"NodeSequence({[self.instance.index_to_id[i] for i in self.indices.tolist()]})"
+
+
 class Tour:
     """
     Represents a solution (tour) for a TSP instance.
 
+    The tour is stored as an int32 array of node indices (positions in instance.nodes); the sequence
+    of Node objects is a lazy view of it. The total weight is computed once and cached until a new
+    sequence is assigned (the index array is read-only, so the tour cannot change otherwise).
+
     Attributes:
         instance (Instance): The TSP problem instance.
         solution_method (str): The name of the method used to generate the tour.
-        sequence (list): The ordered list of node indices representing the tour.        
+        indices (np.ndarray): The node indices of the tour (including the return to the start).
+        sequence (NodeSequence): The tour as Node objects.
         runtime_in_sec (float or None): Time taken to compute the tour.
     """
 
-    def __init__(self, instance: "Instance", solution_method: "SolutionMethod", sequence: list, runtime_in_sec: float = None):
+    def __init__(self, instance: "Instance", solution_method: "SolutionMethod", sequence, runtime_in_sec: float = None):
+        """
+        Initialize a tour.
+
+        Args:
+            instance (Instance): The TSP problem instance.
+            solution_method (SolutionMethod): The method used to generate the tour.
+            sequence (list or np.ndarray): The tour as a list of Node objects or as node indices.
+            runtime_in_sec (float, optional): Time taken to compute the tour.
+        """
         # Store basic tour information
         self.instance = instance
         self.solution_method = solution_method
-        self.sequence = sequence        
+        self.sequence = sequence
         self.runtime_in_sec = runtime_in_sec
 
         # Warn if the tour length doesn't match the instance size
-        if len(sequence) != instance.number_of_stops + 1:
-            solution_method.logger.warning(f"Tour length ({len(sequence)}) does not match instance size ({instance.number_of_stops}). Tour size should be {instance.number_of_stops + 1}")
+        if len(self.indices) != instance.number_of_stops + 1:
+            solution_method.logger.warning(f"Tour length ({len(self.indices)}) does not match instance size ({instance.number_of_stops}). Tour size should be {instance.number_of_stops + 1}")
+
+    @property
+    def indices(self):
+        return self._indices
+
+    @indices.setter
+    def indices(self, indices):
+        self._indices = np.array(indices, dtype=np.int32)
+        self._indices.flags.writeable = False
+        self._total_weight = None
+
+    @property
+    def sequence(self):
+        return NodeSequence(self.instance, self._indices)
+
+    @sequence.setter
+    def sequence(self, sequence):
+        # Node objects are translated into their indices
+        if isinstance(sequence, np.ndarray) and np.issubdtype(sequence.dtype, np.integer):
+            self.indices = sequence
+        elif isinstance(sequence, NodeSequence) and sequence.instance is self.instance:
+            self.indices = sequence.indices
+        else:
+            self.indices = self.instance.get_indices(sequence)
 
     def get_total_weight(self):
         """
-        Calculate the total weight (cost) of the tour.
+        Calculate the total weight (cost) of the tour (cached).
 
         Returns:
             float: The total weight of the tour including return to the start.
         """
+        if self._total_weight is None:
+            self._total_weight = get_sequence_weight(instance=self.instance, sequence=self._indices)
 
-        return get_sequence_weight(instance=self.instance, sequence=self.sequence)
+        return self._total_weight
 
     def plot(self):
         """
@@ -103,12 +199,13 @@ class Tour:
         print(f"  Solution method: {self.solution_method.name} ({self.solution_method.info})")
 
         # Print full tour if short, otherwise abbreviated
-        if len(self.sequence) <= 8:
-            print(f"  Tour: {[n.id for n in self.sequence]}")
+        ids = self.instance.node_ids[self._indices].tolist()
+        if len(ids) <= 8:
+            print(f"  Tour: {ids}")
         else:
             print(
-                f"  Tour: [{self.sequence[0].id}, {self.sequence[1].id}, {self.sequence[2].id}, {self.sequence[3].id}, "
-                f"..., {self.sequence[-4].id}, {self.sequence[-3].id}, {self.sequence[-2].id}, {self.sequence[-1].id}]"
+                f"  Tour: [{ids[0]}, {ids[1]}, {ids[2]}, {ids[3]}, "
+                f"..., {ids[-4]}, {ids[-3]}, {ids[-2]}, {ids[-1]}]"
             )
 
         # Print total weight and benchmark gap if available
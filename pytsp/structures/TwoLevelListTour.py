@@ -0,0 +1,316 @@
+import numpy as np
+
+from pytsp.structures.ArrayTour import ArrayTour
+
+# Routes with at least this many nodes use a TwoLevelListTour as working representation (see create_working_tour)
+TWO_LEVEL_MIN_NODES = 50000
+
+
+class TwoLevelListTour:
+    """
+    Two-level list representation of a tour for local search on large instances.
+
+    The tour is split into segments of about sqrt(n) nodes. Each segment owns a slice of the order[]
+    array and has a reversal bit, and the segments form the upper-level list in tour order. A
+    reversal splits at most two segments at the ends of the path and then reverses the sequence of
+    the segments in between (flipping their bits), so it takes O(sqrt(n)) time instead of the O(n)
+    of an array tour. succ(), pred(), between() and position lookups take O(1) time, and
+    tour[i] takes O(log n) time. Splits only shrink segments, so the segments are rebuilt once
+    their number doubled, which keeps the amortized cost of a reversal at O(sqrt(n)).
+
+    The interface (logical positions, succ/pred/between, reversals, swap and rotate) is the same as
+    of an ArrayTour, so the move functions in pytsp.structures.moves accept both.
+    """
+
+    def __init__(self, route, segment_size: int = None):
+        """
+        Initialize the tour from a route.
+
+        Args:
+            route (array-like): The node indices of the tour (without the return to the start), a permutation of 0..n-1.
+            segment_size (int, optional): Number of nodes per segment (default is ceil(sqrt(n))).
+        """
+        route = np.array(route, dtype=np.int64)
+        self.n = len(route)
+        self.segment_size = segment_size or max(1, int(np.ceil(np.sqrt(self.n))))
+        self._build(route)
+
+    def _build(self, route: np.ndarray):
+        """
+        Lay out a route in segments of segment_size nodes (the route starts at position 0, in forward direction).
+        """
+        size = self.segment_size
+        count = -(-self.n // size)
+
+        self.order = route.copy()
+        self.idx = np.empty(self.n, dtype=np.int64)
+        self.idx[self.order] = np.arange(self.n)
+        self.parent = np.empty(self.n, dtype=np.int64)
+        self.parent[self.order] = np.arange(self.n) // size
+
+        # Every reversal splits at most two segments, the segments are rebuilt when there are more than twice as many
+        self._max_segments = 2 * count
+        capacity = self._max_segments + 2
+        self._lo = np.zeros(capacity, dtype=np.int64)
+        self._hi = np.zeros(capacity, dtype=np.int64)
+        self._rev = np.zeros(capacity, dtype=bool)
+        self._lo[:count] = np.arange(count) * size
+        self._hi[:count] = np.minimum(self._lo[:count] + size, self.n)
+
+        # Upper level: the segments in (physical) tour order, their rank in it and their first physical position
+        self._sequence = np.arange(count)
+        self._count = count
+        self._rank = np.zeros(capacity, dtype=np.int64)
+        self._segment_start = np.zeros(capacity, dtype=np.int64)
+
+        # Node at logical position 0, and whether the route runs backward through the segments
+        self._start = int(route[0]) if self.n else 0
+        self._reversed = False
+        self._update()
+
+    def _update(self):
+        """
+        Recompute the ranks and start positions of the segments after the upper level changed.
+        """
+        sizes = self._hi[self._sequence] - self._lo[self._sequence]
+        self._starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        self._rank[self._sequence] = np.arange(len(self._sequence))
+        self._segment_start[self._sequence] = self._starts
+
+    def __len__(self):
+        return self.n
+
+    def _offset(self, a: int):
+        """
+        Return the physical position of node a within its segment.
+        """
+        s = self.parent[a]
+        return self._hi[s] - 1 - self.idx[a] if self._rev[s] else self.idx[a] - self._lo[s]
+
+    def _physical_position(self, a: int):
+        return int(self._segment_start[self.parent[a]] + self._offset(a))
+
+    def _node_at(self, p: int):
+        """
+        Return the node at physical position p.
+        """
+        rank = int(np.searchsorted(self._starts, p, side="right")) - 1
+        s = self._sequence[rank]
+        offset = p - self._starts[rank]
+        return int(self.order[self._hi[s] - 1 - offset] if self._rev[s] else self.order[self._lo[s] + offset])
+
+    def __getitem__(self, i):
+        origin = self._physical_position(self._start)
+        return self._node_at((origin - i) % self.n if self._reversed else (origin + i) % self.n)
+
+    def position(self, a: int):
+        """
+        Return the (logical) position of node a.
+        """
+        p, origin = self._physical_position(a), self._physical_position(self._start)
+        return (origin - p) % self.n if self._reversed else (p - origin) % self.n
+
+    def _first(self, s: int):
+        return int(self.order[self._hi[s] - 1] if self._rev[s] else self.order[self._lo[s]])
+
+    def _last(self, s: int):
+        return int(self.order[self._lo[s]] if self._rev[s] else self.order[self._hi[s] - 1])
+
+    def _next(self, a: int):
+        """
+        Return the physical successor of node a.
+        """
+        s, i = self.parent[a], self.idx[a]
+        if self._rev[s] and i > self._lo[s]:
+            return int(self.order[i - 1])
+        if not self._rev[s] and i < self._hi[s] - 1:
+            return int(self.order[i + 1])
+        return self._first(self._sequence[(self._rank[s] + 1) % len(self._sequence)])
+
+    def _prev(self, a: int):
+        """
+        Return the physical predecessor of node a.
+        """
+        s, i = self.parent[a], self.idx[a]
+        if self._rev[s] and i < self._hi[s] - 1:
+            return int(self.order[i + 1])
+        if not self._rev[s] and i > self._lo[s]:
+            return int(self.order[i - 1])
+        return self._last(self._sequence[self._rank[s] - 1])
+
+    def succ(self, a: int):
+        """
+        Return the successor of node a.
+        """
+        return self._prev(a) if self._reversed else self._next(a)
+
+    def pred(self, a: int):
+        """
+        Return the predecessor of node a.
+        """
+        return self._next(a) if self._reversed else self._prev(a)
+
+    def between(self, a: int, b: int, c: int):
+        """
+        Check whether b lies on the path from a forward to c (inclusive).
+
+        Args:
+            a (int): Start node of the path.
+            b (int): The node to check.
+            c (int): End node of the path.
+
+        Returns:
+            bool: True if b is visited when walking from a to c along the tour.
+        """
+        pa = self.position(a)
+        return (self.position(b) - pa) % self.n <= (self.position(c) - pa) % self.n
+
+    def _split(self, a: int):
+        """
+        Split the segment of node a, so that a is the first node (physically) of its segment.
+        """
+        s = self.parent[a]
+        if a == self._first(s):
+            return
+
+        # The new segment t takes the part from a to the physical end of s
+        t = self._count
+        self._count += 1
+        if self._rev[s]:
+            self._lo[t], self._hi[t] = self._lo[s], self.idx[a] + 1
+            self._lo[s] = self.idx[a] + 1
+        else:
+            self._lo[t], self._hi[t] = self.idx[a], self._hi[s]
+            self._hi[s] = self.idx[a]
+        self._rev[t] = self._rev[s]
+        self.parent[self.order[self._lo[t]:self._hi[t]]] = t
+
+        self._sequence = np.insert(self._sequence, self._rank[s] + 1, t)
+        self._update()
+
+    def _reverse_physical(self, a: int, b: int):
+        """
+        Reverse the physical path from node a to node b (which is not the whole tour).
+        """
+        # The path lies within one segment: reverse its slice of order[]
+        if self.parent[a] == self.parent[b] and self._offset(a) <= self._offset(b):
+            first, last = sorted((int(self.idx[a]), int(self.idx[b])))
+            nodes = self.order[first:last + 1][::-1].copy()
+            self.order[first:last + 1] = nodes
+            self.idx[nodes] = np.arange(first, last + 1)
+            return
+
+        # Split the segments at both ends, so that the path consists of whole segments
+        self._split(a)
+        self._split(self._next(b))
+
+        # Reverse the order of these segments and flip their reversal bits (rotate the path to the front first)
+        first = self._rank[self.parent[a]]
+        self._sequence = np.roll(self._sequence, -first)
+        last = self._rank[self.parent[b]] - first
+        last = last % len(self._sequence)
+        segments = self._sequence[:last + 1][::-1].copy()
+        self._sequence[:last + 1] = segments
+        self._rev[segments] = ~self._rev[segments]
+        self._update()
+
+        if self._count > self._max_segments:
+            self._rebuild()
+
+    def _rebuild(self):
+        """
+        Lay out the tour in segments of segment_size nodes again (the tour does not change).
+        """
+        route = self._physical_route()
+        reversed_, start = self._reversed, self._start
+        self._build(route)
+        self._reversed, self._start = reversed_, start
+
+    def reverse(self, i: int, j: int):
+        """
+        Reverse the nodes at the positions i, i + 1, ..., j (cyclic, so i > j wraps around the end of the route).
+
+        Args:
+            i (int): First position of the path.
+            j (int): Last position of the path.
+        """
+        i, j = i % self.n, j % self.n
+        length = (j - i) % self.n + 1
+
+        # The node at position 0 changes if the path contains it
+        start = self[(i + j) % self.n] if (-i) % self.n <= (j - i) % self.n else self._start
+
+        if length < self.n:
+            if 2 * length <= self.n:
+                a, b = self[i], self[j]
+            else:
+                # Reverse the shorter complement, then walk the tour in the other direction
+                a, b = self[j + 1], self[i - 1]
+            self._reverse_physical(*((b, a) if self._reversed else (a, b)))
+
+        if 2 * length > self.n:
+            self._reversed = not self._reversed
+        self._start = start
+
+    def reverse_path(self, a: int, b: int):
+        """
+        Reverse the path from node a forward to node b.
+        """
+        self.reverse(self.position(a), self.position(b))
+
+    def two_opt_move(self, a: int, b: int, c: int, d: int):
+        """
+        Replace the edges (a, b) and (c, d) by (a, c) and (b, d), where b = succ(a) and d = succ(c).
+        """
+        self.reverse_path(b, c)
+
+    def swap(self, i: int, j: int):
+        """
+        Exchange the nodes at the positions i and j.
+        """
+        a, b = self[i], self[j]
+        ia, ib = self.idx[a], self.idx[b]
+        self.order[ia], self.order[ib] = b, a
+        self.idx[a], self.idx[b] = ib, ia
+        self.parent[a], self.parent[b] = self.parent[b], self.parent[a]
+
+        if self._start in (a, b):
+            self._start = a + b - self._start
+
+    def rotate(self, i: int):
+        """
+        Let the route start at position i (the cycle does not change).
+        """
+        self._start = self[i]
+
+    def _physical_route(self):
+        """
+        Return the node indices in physical order, starting at the start node.
+        """
+        physical = np.concatenate([self.order[self._lo[s]:self._hi[s]][::-1] if self._rev[s] else self.order[self._lo[s]:self._hi[s]]
+                                   for s in self._sequence])
+        origin = self._physical_position(self._start)
+        return np.roll(physical, -origin)
+
+    def route(self):
+        """
+        Return the node indices in route order.
+
+        Returns:
+            np.ndarray: A new array with the n node indices, starting at position 0.
+        """
+        physical = self._physical_route()
+        return np.concatenate((physical[:1], physical[:0:-1])) if self._reversed else physical
+
+
+def create_working_tour(route):
+    """
+    Create the working representation of a tour for local search.
+
+    Args:
+        route (array-like): The node indices of the tour (without the return to the start).
+
+    Returns:
+        ArrayTour or TwoLevelListTour: A TwoLevelListTour for routes with at least TWO_LEVEL_MIN_NODES nodes, else an ArrayTour.
+    """
+    return TwoLevelListTour(route) if len(route) >= TWO_LEVEL_MIN_NODES else ArrayTour(route)
@@ -0,0 +1,509 @@
+"""
+Candidate neighbor lists for local search.
+
+A candidate structure is an (n x k) int32 array: row i holds the indices (positions in instance.nodes)
+of the k nodes that local search moves should try to connect to node i, sorted by increasing weight.
+Instances cache their candidate structures, see Instance.get_candidates().
+"""
+import numpy as np
+
+from pytsp.structures import distances, held_karp
+
+
+def _has_vectorized_weights(instance):
+    """
+    Check whether the weights of an instance can be computed from its coordinates.
+    """
+    return instance.coordinates is not None and instance.edge_weight_type in distances.TYPES
+
+
+def pair_weights(instance, i, j):
+    """
+    Compute the weights between the node pairs (i[k], j[k]) without building the distance matrix.
+
+    Args:
+        instance (Instance): The TSP instance.
+        i (np.ndarray): Source indices.
+        j (np.ndarray): Target indices (same shape as i).
+
+    Returns:
+        np.ndarray: The weights with the shape of i.
+    """
+    if _has_vectorized_weights(instance):
+        coordinates = instance.coordinates
+        return distances.compute_pairwise_weights(instance.edge_weight_type, coordinates[i], coordinates[j])
+
+    return instance.weights(i, j)
+
+
+def row_weights(instance, rows):
+    """
+    Compute a block of rows of the distance matrix without building the whole matrix.
+
+    Args:
+        instance (Instance): The TSP instance.
+        rows (np.ndarray): The row indices.
+
+    Returns:
+        np.ndarray: An array with shape (len(rows), n).
+    """
+    if _has_vectorized_weights(instance):
+        return distances.compute_weights(instance.edge_weight_type, instance.coordinates, rows)
+
+    matrix = instance.get_distance_matrix()
+    return np.stack([np.asarray(matrix[i]) for i in rows]) if len(rows) else np.empty((0, instance.number_of_stops))
+
+
+def spatial_points(instance):
+    """
+    Embed the nodes of an instance into a space where a Minkowski distance orders node pairs like the TSPLIB weights.
+
+    Args:
+        instance (Instance): The TSP instance.
+
+    Returns:
+        tuple or None: (points, p) with an (n x d) array of points and the Minkowski norm p, or None if the
+        edge weight type has no such embedding.
+    """
+    if instance.coordinates is None:
+        return None
+
+    edge_weight_type = instance.edge_weight_type
+    coordinates = instance.coordinates
+
+    if edge_weight_type in ("EUC_2D", "EUC_3D", "CEIL_2D", "ATT"):
+        return coordinates, 2
+    if edge_weight_type in ("MAN_2D", "MAN_3D"):
+        return coordinates, 1
+    if edge_weight_type in ("MAX_2D", "MAX_3D"):
+        return coordinates, np.inf
+    if edge_weight_type == "GEO":
+        # Great-circle distances grow with the chord length between points on the unit sphere
+        latitude, longitude = distances.geo_radians(coordinates).T
+        points = np.column_stack((np.cos(latitude) * np.cos(longitude),
+                                  np.cos(latitude) * np.sin(longitude),
+                                  np.sin(latitude)))
+        return points, 2
+
+    return None
+
+
+def _kd_tree(points):
+    """
+    Build a scipy KD-tree, or return None if scipy is not installed.
+    """
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        return None
+    return cKDTree(points)
+
+
+def _sort_by_weight(instance, neighbors):
+    """
+    Sort each row of a neighbor array by the exact weight to its node (ties keep their order).
+
+    Args:
+        instance (Instance): The TSP instance.
+        neighbors (np.ndarray): An (n x m) array of neighbor indices (-1 marks padding).
+
+    Returns:
+        np.ndarray: The sorted (n x m) array.
+    """
+    rows = np.repeat(np.arange(len(neighbors))[:, np.newaxis], neighbors.shape[1], axis=1)
+    weights = pair_weights(instance, rows, neighbors).astype(np.float64)
+    weights[neighbors < 0] = np.inf     # Padding goes last
+    order = np.argsort(weights, axis=1, kind="stable")
+    return np.take_along_axis(neighbors, order, axis=1)
+
+
+def _drop_self(neighbors, m, rows=None):
+    """
+    Remove each node from its own neighbor row and keep the first m remaining neighbors.
+
+    Args:
+        neighbors (np.ndarray): An (r x m+1) array of neighbor indices (the row of node i may contain i).
+        m (int): The number of neighbors to keep.
+        rows (np.ndarray, optional): The node of each row (defaults to 0..r-1).
+
+    Returns:
+        np.ndarray: An (r x m) array of neighbor indices.
+    """
+    rows = np.arange(len(neighbors)) if rows is None else rows
+    is_self = neighbors == rows[:, np.newaxis]
+    order = np.argsort(is_self, axis=1, kind="stable")
+    return np.take_along_axis(neighbors, order, axis=1)[:, :m]
+
+
+def _first_unique(neighbors, k: int):
+    """
+    Keep the first k distinct neighbors of every row (in row order), skipping -1 padding.
+
+    Args:
+        neighbors (np.ndarray): An (n x m) array of neighbor indices; every row holds at least k distinct indices.
+        k (int): The number of neighbors to keep.
+
+    Returns:
+        np.ndarray: An (n x k) array of neighbor indices.
+    """
+    # A stable sort puts repeated indices right after their first occurrence
+    order = np.argsort(neighbors, axis=1, kind="stable")
+    sorted_neighbors = np.take_along_axis(neighbors, order, axis=1)
+    is_repeat = np.zeros(neighbors.shape, dtype=bool)
+    is_repeat[:, 1:] = sorted_neighbors[:, 1:] == sorted_neighbors[:, :-1]
+
+    keep = np.empty(neighbors.shape, dtype=bool)
+    np.put_along_axis(keep, order, ~is_repeat, axis=1)
+    keep &= neighbors >= 0
+    keep &= np.cumsum(keep, axis=1) <= k
+
+    return neighbors[keep].reshape(len(neighbors), k)
+
+
+def nearest_by_rows(instance, k: int, block_size: int = None):
+    """
+    Compute the k nearest neighbors of every node exactly from blocks of matrix rows (partial argsort).
+
+    Args:
+        instance (Instance): The TSP instance.
+        k (int): Number of neighbors per node.
+        block_size (int, optional): Number of rows processed per block (defaults to about 2**22 entries per block).
+
+    Returns:
+        np.ndarray: An (n x k) int32 array of neighbor indices, sorted by weight.
+    """
+    n = instance.number_of_stops
+    k = min(k, n - 1)
+    block_size = block_size or max(1, 2**22 // max(1, n))
+    candidates = np.empty((n, k), dtype=np.int32)
+
+    for start in range(0, n, block_size):
+        rows = np.arange(start, min(start + block_size, n))
+        weights = row_weights(instance, rows).astype(np.float64)
+        weights[np.arange(len(rows)), rows] = np.inf    # A node is no candidate of itself
+
+        nearest = np.argpartition(weights, k - 1, axis=1)[:, :k] if k < n - 1 else np.argsort(weights, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(weights, nearest, axis=1), axis=1, kind="stable")
+        candidates[rows] = np.take_along_axis(nearest, order, axis=1)
+
+    return candidates
+
+
+def nearest_neighbor_candidates(instance, k: int = 10, spatial_index: bool = True):
+    """
+    Compute the k nearest neighbors of every node.
+
+    Coordinate instances are queried with a KD-tree in O(n log n) (if scipy is installed); the tree only
+    preselects the neighbors, which are then sorted by their exact TSPLIB weights. Other instances use
+    a partial argsort of the distance matrix rows.
+
+    Args:
+        instance (Instance): The TSP instance.
+        k (int): Number of neighbors per node (default is 10).
+        spatial_index (bool): Use a KD-tree for coordinate instances if possible (default is True).
+
+    Returns:
+        np.ndarray: An (n x k) int32 array of neighbor indices, sorted by weight.
+    """
+    n = instance.number_of_stops
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int32)
+
+    embedding = spatial_points(instance) if spatial_index else None
+    tree = _kd_tree(embedding[0]) if embedding is not None else None
+    if tree is None:
+        return nearest_by_rows(instance, k)
+
+    # Query one extra neighbor, since every node is its own nearest point
+    points, p = embedding
+    _, neighbors = tree.query(points, k=k + 1, p=p)
+    neighbors = _drop_self(neighbors, k)
+
+    return _sort_by_weight(instance, neighbors).astype(np.int32)
+
+
+def _require_2d(instance, method: str):
+    """
+    Raise a ValueError unless the instance has 2D node coordinates.
+    """
+    if instance.coordinates is None or instance.coordinates.shape[1] != 2:
+        raise ValueError(f"{method} candidates require 2D node coordinates, but {instance.name} has none.")
+
+
+def _coordinate_ranks(coordinates):
+    """
+    Rank the nodes by x and by y coordinate (ties are broken by node index).
+
+    Using ranks instead of raw coordinates turns "left of" and "below" into strict orders, so every
+    other node lies in exactly one quadrant of a node, including nodes with identical coordinates.
+
+    Args:
+        coordinates (np.ndarray): Node coordinates with shape (n, 2).
+
+    Returns:
+        tuple: Two int arrays (rank_x, rank_y) with the rank of each node.
+    """
+    n = len(coordinates)
+    rank_x = np.empty(n, dtype=np.int64)
+    rank_y = np.empty(n, dtype=np.int64)
+    rank_x[np.argsort(coordinates[:, 0], kind="stable")] = np.arange(n)
+    rank_y[np.argsort(coordinates[:, 1], kind="stable")] = np.arange(n)
+    return rank_x, rank_y
+
+
+def _quadrant_labels(rank_x, rank_y, rows, neighbors):
+    """
+    Return the quadrant (0..3) of each neighbor relative to the node of its row.
+    """
+    left = rank_x[neighbors] < rank_x[rows][:, np.newaxis]
+    below = rank_y[neighbors] < rank_y[rows][:, np.newaxis]
+    return left * 1 + below * 2
+
+
+def _nonempty_quadrants(rank_x, rank_y):
+    """
+    Check which quadrants of every node contain at least one other node (in O(n log n)).
+
+    Args:
+        rank_x (np.ndarray): Rank of each node by x coordinate.
+        rank_y (np.ndarray): Rank of each node by y coordinate.
+
+    Returns:
+        np.ndarray: An (n x 4) boolean array, indexed like _quadrant_labels.
+    """
+    # y ranks in order of increasing x rank
+    y_by_x = np.empty(len(rank_x), dtype=np.int64)
+    y_by_x[rank_x] = rank_y
+
+    # Smallest/largest y rank strictly left and strictly right of each x rank
+    n = len(rank_x)
+    min_left = np.concatenate(([n], np.minimum.accumulate(y_by_x)[:-1]))
+    max_left = np.concatenate(([-1], np.maximum.accumulate(y_by_x)[:-1]))
+    min_right = np.concatenate((np.minimum.accumulate(y_by_x[::-1])[::-1][1:], [n]))
+    max_right = np.concatenate((np.maximum.accumulate(y_by_x[::-1])[::-1][1:], [-1]))
+
+    nonempty = np.empty((n, 4), dtype=bool)
+    nonempty[:, 0] = max_right[rank_x] > rank_y     # right, above
+    nonempty[:, 1] = max_left[rank_x] > rank_y      # left, above
+    nonempty[:, 2] = min_right[rank_x] < rank_y     # right, below
+    nonempty[:, 3] = min_left[rank_x] < rank_y      # left, below
+    return nonempty
+
+
+def _select_quadrants(neighbors, labels, per_quadrant: int, k: int):
+    """
+    Pick the first per_quadrant neighbors of every quadrant and fill up to k with the remaining nearest neighbors.
+
+    Args:
+        neighbors (np.ndarray): An (r x m) array of neighbor indices sorted by distance (m >= k).
+        labels (np.ndarray): The quadrant of each neighbor.
+        per_quadrant (int): Number of neighbors per quadrant.
+        k (int): Number of neighbors per node.
+
+    Returns:
+        tuple: The (r x k) selected neighbors and an (r x 4) array with the number of neighbors found per quadrant.
+    """
+    selected = np.zeros(neighbors.shape, dtype=bool)
+    counts = np.zeros((len(neighbors), 4), dtype=np.int64)
+    for quadrant in range(4):
+        in_quadrant = labels == quadrant
+        first = in_quadrant & (np.cumsum(in_quadrant, axis=1) <= per_quadrant)
+        selected |= first
+        counts[:, quadrant] = first.sum(axis=1)
+
+    preferred = np.where(selected, neighbors, -1)
+    return _first_unique(np.concatenate((preferred, neighbors), axis=1), k), counts
+
+
+def _quadrant_by_rows(instance, rows, k: int, per_quadrant: int, rank_x, rank_y):
+    """
+    Compute quadrant candidates exactly from blocks of matrix rows (one partial argsort per quadrant).
+
+    Args:
+        instance (Instance): The TSP instance.
+        rows (np.ndarray): The nodes to compute candidates for.
+        k (int): Number of neighbors per node.
+        per_quadrant (int): Number of neighbors per quadrant.
+        rank_x (np.ndarray): Rank of each node by x coordinate.
+        rank_y (np.ndarray): Rank of each node by y coordinate.
+
+    Returns:
+        np.ndarray: A (len(rows) x k) array of neighbor indices.
+    """
+    n = instance.number_of_stops
+    block_size = max(1, 2**22 // max(1, n))
+    result = np.empty((len(rows), k), dtype=np.int64)
+
+    for start in range(0, len(rows), block_size):
+        block = rows[start:start + block_size]
+        weights = row_weights(instance, block).astype(np.float64)
+        weights[np.arange(len(block)), block] = np.inf    # A node is no candidate of itself
+        labels = _quadrant_labels(rank_x, rank_y, block, np.arange(n)[np.newaxis, :])
+
+        # The per_quadrant nearest neighbors of each quadrant (-1 if the quadrant has fewer nodes)
+        preferred = []
+        for quadrant in range(4 if per_quadrant > 0 else 0):
+            quadrant_weights = np.where(labels == quadrant, weights, np.inf)
+            nearest = np.argpartition(quadrant_weights, per_quadrant - 1, axis=1)[:, :per_quadrant]
+            preferred.append(np.where(np.take_along_axis(quadrant_weights, nearest, axis=1) < np.inf, nearest, -1))
+
+        # Filled up with the nearest neighbors overall
+        nearest = np.argpartition(weights, k - 1, axis=1)[:, :k] if k < n - 1 else np.argsort(weights, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(weights, nearest, axis=1), axis=1, kind="stable")
+        preferred.append(np.take_along_axis(nearest, order, axis=1))
+
+        result[start:start + len(block)] = _first_unique(np.concatenate(preferred, axis=1), k)
+
+    return result
+
+
+def quadrant_candidates(instance, k: int = 12, spatial_index: bool = True, max_query: int = None):
+    """
+    Compute quadrant candidates for 2D instances: the k/4 nearest neighbors in each of the four quadrants
+    around a node, filled up to k with the nearest remaining neighbors.
+
+    Unlike pure nearest neighbor lists, quadrant candidates connect nodes at the border of a cluster to
+    the neighboring clusters. The neighbors are preselected with a KD-tree (if scipy is installed) whose
+    query is widened only for the nodes with under-filled quadrants; nodes whose quadrants stay under-filled
+    (e.g., at the border of the instance) are computed exactly from their matrix rows.
+
+    Args:
+        instance (Instance): The TSP instance (with 2D node coordinates).
+        k (int): Number of neighbors per node (default is 12).
+        spatial_index (bool): Use a KD-tree if possible (default is True).
+        max_query (int, optional): Widest KD-tree query before switching to matrix rows (default is 256 * k).
+
+    Returns:
+        np.ndarray: An (n x k) int32 array of neighbor indices, sorted by weight.
+
+    Raises:
+        ValueError: If the instance has no 2D node coordinates.
+    """
+    _require_2d(instance, "Quadrant")
+
+    n = instance.number_of_stops
+    k = min(k, n - 1)
+    per_quadrant = k // 4
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int32)
+
+    rank_x, rank_y = _coordinate_ranks(instance.coordinates)
+    embedding = spatial_points(instance) if spatial_index else None
+    tree = _kd_tree(embedding[0]) if embedding is not None else None
+    if tree is None:
+        return _sort_by_weight(instance, _quadrant_by_rows(instance, np.arange(n), k, per_quadrant, rank_x, rank_y)).astype(np.int32)
+
+    points, p = embedding
+    max_query = max_query or 256 * k
+    nonempty = _nonempty_quadrants(rank_x, rank_y)
+    result = np.empty((n, k), dtype=np.int64)
+
+    # Query the nearest neighbors and double the query size for nodes with under-filled quadrants
+    pending = np.arange(n)
+    m = min(n - 1, 2 * k)
+    while len(pending) and m <= max_query:
+        _, neighbors = tree.query(points[pending], k=m + 1, p=p)
+        neighbors = _drop_self(neighbors, m, rows=pending)
+        labels = _quadrant_labels(rank_x, rank_y, pending, neighbors)
+        selected, counts = _select_quadrants(neighbors, labels, per_quadrant, k)
+
+        underfilled = ((counts < per_quadrant) & nonempty[pending]).any(axis=1) & (m < n - 1)
+        result[pending[~underfilled]] = selected[~underfilled]
+        pending = pending[underfilled]
+        m = min(n - 1, 2 * m)
+
+    # Nodes that remain under-filled after the widest query
+    if len(pending):
+        result[pending] = _quadrant_by_rows(instance, pending, k, per_quadrant, rank_x, rank_y)
+
+    return _sort_by_weight(instance, result).astype(np.int32)
+
+
+def delaunay_candidates(instance, k: int = 10):
+    """
+    Compute Delaunay candidates for 2D instances: the neighbors of each node in the Delaunay triangulation
+    (at most k, nearest first), filled up to k with the nearest remaining neighbors.
+
+    The triangulation has at most 3n edges and connects neighboring clusters, which makes it a sparse
+    and robust candidate graph for clustered instances. Requires scipy.
+
+    Args:
+        instance (Instance): The TSP instance (with 2D node coordinates).
+        k (int): Number of neighbors per node (default is 10).
+
+    Returns:
+        np.ndarray: An (n x k) int32 array of neighbor indices, sorted by weight.
+
+    Raises:
+        ValueError: If the instance has no 2D node coordinates.
+        ImportError: If scipy is not installed.
+    """
+    _require_2d(instance, "Delaunay")
+
+    n = instance.number_of_stops
+    k = min(k, n - 1)
+    if k <= 0 or n < 4:
+        return nearest_neighbor_candidates(instance, k)
+
+    try:
+        from scipy.spatial import Delaunay
+    except ImportError as error:
+        raise ImportError("Delaunay candidates require scipy (pip install scipy).") from error
+
+    # Joggled input keeps duplicate and collinear nodes in the triangulation
+    indptr, indices = Delaunay(instance.coordinates, qhull_options="QJ").vertex_neighbor_vertices
+
+    # Pad the varying number of Delaunay neighbors per node with -1
+    degrees = np.diff(indptr)
+    rows = np.repeat(np.arange(n), degrees)
+    padded = np.full((n, max(1, degrees.max())), -1, dtype=np.int64)
+    padded[rows, np.arange(len(indices)) - indptr[rows]] = indices
+
+    preferred = _sort_by_weight(instance, padded)[:, :k]
+    nearest = nearest_neighbor_candidates(instance, k)
+    return _sort_by_weight(instance, _first_unique(np.concatenate((preferred, nearest), axis=1), k)).astype(np.int32)
+
+
+def alpha_nearness_candidates(instance, k: int = 5, block_size: int = None):
+    """
+    Compute alpha-nearness candidates: the k nodes with the smallest alpha values (ties broken by weight).
+
+    The alpha values are computed from a minimum 1-tree under the subgradient-optimized penalties of
+    Instance.get_held_karp_bound(), one block of rows at a time (see held_karp.alpha_rows). This takes
+    O(n^2) time per 1-tree but only O(n) memory, so no distance matrix is needed for coordinate instances.
+
+    Args:
+        instance (Instance): The (symmetric) TSP instance.
+        k (int): Number of neighbors per node (default is 5).
+        block_size (int, optional): Number of rows processed per block (defaults to about 2**22 entries per block).
+
+    Returns:
+        np.ndarray: An (n x k) int32 array of neighbor indices, sorted by alpha value.
+    """
+    n = instance.number_of_stops
+    k = min(k, n - 1)
+    if k <= 0 or n < 3:
+        return nearest_neighbor_candidates(instance, k)
+
+    _, pi = instance.get_held_karp_bound()
+    tree = held_karp.minimum_one_tree(instance, pi)
+
+    block_size = block_size or max(1, 2**22 // max(1, n))
+    candidates = np.empty((n, k), dtype=np.int32)
+    for start in range(0, n, block_size):
+        rows = np.arange(start, min(start + block_size, n))
+        alpha = held_karp.alpha_rows(instance, tree, pi, rows)
+        weights = row_weights(instance, rows)
+        candidates[rows] = np.lexsort((weights, alpha), axis=1)[:, :k]
+
+    return candidates
+
+
+# Map candidate methods to the functions generating them
+TYPES = {
+    "nearest": nearest_neighbor_candidates,
+    "quadrant": quadrant_candidates,
+    "delaunay": delaunay_candidates,
+    "alpha": alpha_nearness_candidates,
+}
@@ -0,0 +1,225 @@
+"""
+Vectorized implementations of the TSPLIB distance functions.
+
+Each function mirrors its scalar counterpart in tsplib95.distances (including the TSPLIB
+`nint` rounding) but works on NumPy arrays of coordinates. The coordinate arrays `start`
+and `end` have the shape (..., dimension) and are broadcast against each other, so a single
+call computes either a batch of node pairs or a whole block of the distance matrix.
+"""
+import numpy as np
+
+# Earth radius used by TSPLIB for GEO instances
+GEO_RADIUS = 6378.388
+
+
+def nint(x):
+    """
+    Round non-negative values to the nearest integer (TSPLIB's nint, i.e. int(x + 0.5)).
+
+    Args:
+        x (np.ndarray): Values to round.
+
+    Returns:
+        np.ndarray: Rounded values as int64.
+    """
+    return (x + 0.5).astype(np.int64)
+
+
+def ceil(x):
+    """
+    Round values up to the next integer.
+
+    Args:
+        x (np.ndarray): Values to round.
+
+    Returns:
+        np.ndarray: Rounded values as int64.
+    """
+    return np.ceil(x).astype(np.int64)
+
+
+def deltas(start, end):
+    """
+    Yield the coordinate differences (end - start) for every dimension.
+
+    Args:
+        start (np.ndarray): Start coordinates with shape (..., dimension).
+        end (np.ndarray): End coordinates with shape (..., dimension).
+
+    Returns:
+        generator: One broadcast array of differences per dimension.
+    """
+    return (end[..., k] - start[..., k] for k in range(start.shape[-1]))
+
+
+def euclidean(start, end, round=nint):
+    """
+    Euclidean distance (EUC_2D, EUC_3D and, with round=ceil, CEIL_2D).
+    """
+    square_distance = 0
+    for d in deltas(start, end):
+        square_distance = square_distance + d * d
+    return round(np.sqrt(square_distance))
+
+
+def manhattan(start, end, round=nint):
+    """
+    Manhattan distance (MAN_2D, MAN_3D).
+    """
+    distance = 0
+    for d in deltas(start, end):
+        distance = distance + np.abs(d)
+    return round(distance)
+
+
+def maximum(start, end, round=nint):
+    """
+    Maximum distance (MAX_2D, MAX_3D).
+    """
+    distance = None
+    for d in deltas(start, end):
+        distance = np.abs(d) if distance is None else np.maximum(distance, np.abs(d))
+    return round(distance)
+
+
+def geo_radians(coordinates):
+    """
+    Convert TSPLIB GEO coordinates (DDD.MM format) to latitude/longitude in radians.
+
+    Args:
+        coordinates (np.ndarray): GEO coordinates with shape (..., 2).
+
+    Returns:
+        np.ndarray: Latitude and longitude in radians with shape (..., 2).
+    """
+    degrees = np.trunc(coordinates)
+    minutes = coordinates - degrees
+    return np.radians(degrees + minutes * 5 / 3)
+
+
+def geographical(start, end):
+    """
+    Geographical distance on the idealized sphere (GEO).
+    """
+    start = geo_radians(start)
+    end = geo_radians(end)
+
+    q1 = np.cos(start[..., 1] - end[..., 1])
+    q2 = np.cos(start[..., 0] - end[..., 0])
+    q3 = np.cos(start[..., 0] + end[..., 0])
+    distance = GEO_RADIUS * np.arccos(0.5 * ((1 + q1) * q2 - (1 - q1) * q3)) + 1
+
+    return distance.astype(np.int64)
+
+
+def pseudo_euclidean(start, end):
+    """
+    Pseudo-Euclidean distance (ATT).
+    """
+    square_sum = 0
+    for d in deltas(start, end):
+        square_sum = square_sum + d * d
+    value = np.sqrt(square_sum / 10)
+
+    # Round up whenever nint rounded down
+    distance = nint(value)
+    return distance + (distance < value)
+
+
+def xray(start, end, sx=1.0, sy=1.0, sz=1.0):
+    """
+    X-ray crystallography distance (XRAY1, and XRAY2 with sx=1.25, sy=1.5, sz=1.15).
+    """
+    dx = np.abs(start[..., 0] - end[..., 0])
+    dx = np.minimum(dx, np.abs(dx - 360))
+    dy = np.abs(start[..., 1] - end[..., 1])
+    dz = np.abs(start[..., 2] - end[..., 2])
+
+    distance = np.maximum(np.maximum(dx / sx, dy / sy), dz / sz)
+    return nint(100.0 * distance)
+
+
+# Map TSPLIB edge weight types to their vectorized distance function
+TYPES = {
+    "EUC_2D": euclidean,
+    "EUC_3D": euclidean,
+    "MAX_2D": maximum,
+    "MAX_3D": maximum,
+    "MAN_2D": manhattan,
+    "MAN_3D": manhattan,
+    "CEIL_2D": lambda start, end: euclidean(start, end, round=ceil),
+    "GEO": geographical,
+    "ATT": pseudo_euclidean,
+    "XRAY1": xray,
+    "XRAY2": lambda start, end: xray(start, end, sx=1.25, sy=1.5, sz=1.15),
+}
+
+
+def weight_upper_bound(edge_weight_type, coordinates):
+    """
+    Return an upper bound on all weights of an instance without computing the matrix.
+
+    All distance functions except GEO grow with the per-dimension coordinate differences, so the
+    weight between the corners of the bounding box bounds every pair. GEO weights are bounded
+    by half the circumference of the sphere.
+
+    Args:
+        edge_weight_type (EdgeWeightType): The TSPLIB edge weight type.
+        coordinates (np.ndarray): Node coordinates with shape (n, dimension).
+
+    Returns:
+        int: An upper bound on the weight of any pair of nodes.
+    """
+    if edge_weight_type == "GEO":
+        return int(GEO_RADIUS * np.pi) + 1
+
+    ranges = coordinates.max(axis=0) - coordinates.min(axis=0)
+
+    # The x-ray motor speeds are >= 1 and the 360 degree wrap-around only shortens dx
+    if edge_weight_type in ("XRAY1", "XRAY2"):
+        return int(nint(100.0 * ranges.max()))
+
+    return int(TYPES[edge_weight_type](np.zeros_like(ranges), ranges))
+
+
+def compute_weights(edge_weight_type, coordinates, rows=None):
+    """
+    Compute a block of rows (or the whole) distance matrix in one vectorized call.
+
+    Args:
+        edge_weight_type (EdgeWeightType): The TSPLIB edge weight type.
+        coordinates (np.ndarray): Node coordinates with shape (n, dimension).
+        rows (slice or np.ndarray, optional): The rows to compute. Defaults to all rows.
+
+    Returns:
+        np.ndarray: An int64 array with shape (len(rows), n).
+
+    Raises:
+        ValueError: If the edge weight type has no vectorized implementation.
+    """
+    if edge_weight_type not in TYPES:
+        raise ValueError(f"No vectorized distance function for edge weight type {edge_weight_type}.")
+
+    start = coordinates if rows is None else coordinates[rows]
+    return TYPES[edge_weight_type](start[:, np.newaxis, :], coordinates[np.newaxis, :, :])
+
+
+def compute_pairwise_weights(edge_weight_type, start, end):
+    """
+    Compute the weights between pairs of coordinates (start[k], end[k]).
+
+    Args:
+        edge_weight_type (EdgeWeightType): The TSPLIB edge weight type.
+        start (np.ndarray): Start coordinates with shape (m, dimension).
+        end (np.ndarray): End coordinates with shape (m, dimension).
+
+    Returns:
+        np.ndarray: An int64 array with shape (m,).
+
+    Raises:
+        ValueError: If the edge weight type has no vectorized implementation.
+    """
+    if edge_weight_type not in TYPES:
+        raise ValueError(f"No vectorized distance function for edge weight type {edge_weight_type}.")
+
+    return TYPES[edge_weight_type](start, end)
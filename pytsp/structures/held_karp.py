@@ -0,0 +1,270 @@
+"""
+Held-Karp lower bound and alpha-nearness values from minimum 1-trees.
+
+A 1-tree is a spanning tree on the nodes 1..n-1 (positions in instance.nodes) plus two edges from
+the special node 0. Every tour is a 1-tree, so the length of a minimum 1-tree is a lower bound on
+the optimal tour length. The bound is tightened by the node penalties pi, which transform the weights
+into d(i, j) = c(i, j) + pi[i] + pi[j] without changing the optimal tour (see subgradient_optimization).
+
+The alpha-nearness of an edge (i, j) is the increase of the minimum 1-tree length if the 1-tree is
+forced to contain (i, j). Edges of optimal tours have small alpha values, which makes them a much
+better candidate criterion than plain weights (Helsgaun, "An Effective Implementation of the
+Lin-Kernighan Traveling Salesman Heuristic", 2000).
+
+All functions compute the matrix rows on demand, so they run in O(n^2) time and O(n) memory
+(plus a block of rows with a bounded number of entries).
+"""
+import numpy as np
+
+# Position of the special node of the 1-trees in instance.nodes
+SPECIAL_NODE = 0
+
+
+def transformed_rows(instance, rows, pi):
+    """
+    Compute a block of rows of the transformed weights d(i, j) = c(i, j) + pi[i] + pi[j].
+
+    Args:
+        instance (Instance): The TSP instance.
+        rows (np.ndarray): The row indices.
+        pi (np.ndarray): The node penalties.
+
+    Returns:
+        np.ndarray: A float64 array with shape (len(rows), n).
+    """
+    # Imported here, since the candidates module builds on this one
+    from pytsp.structures.candidates import row_weights
+
+    # Adding the penalties first keeps d(i, j) == d(j, i) exactly
+    return row_weights(instance, rows) + (pi[rows, np.newaxis] + pi[np.newaxis, :])
+
+
+class OneTree:
+    """
+    A minimum 1-tree of an instance under the node penalties pi.
+
+    The spanning tree on the nodes 1..n-1 is rooted at order[0] and stored as a parent array: node x
+    is connected to dad[x] with the transformed weight dad_weight[x]. The nodes in order are listed
+    parents first (the order in which Prim's algorithm added them). The special node 0 is connected to
+    the nodes special[0] and special[1] with the transformed weights special_weight[0] <= special_weight[1].
+    """
+
+    def __init__(self, dad: np.ndarray, dad_weight: np.ndarray, order: np.ndarray, special: np.ndarray, special_weight: np.ndarray):
+        self.dad = dad
+        self.dad_weight = dad_weight
+        self.order = order
+        self.special = special
+        self.special_weight = special_weight
+
+    @property
+    def root(self):
+        return self.order[0]
+
+    @property
+    def length(self):
+        """
+        The transformed length of the 1-tree.
+        """
+        return self.dad_weight[self.order[1:]].sum() + self.special_weight.sum()
+
+    def get_degrees(self):
+        """
+        Return the degree of every node in the 1-tree.
+
+        Returns:
+            np.ndarray: An int64 array with n entries.
+        """
+        children = self.order[1:]
+        degrees = np.bincount(self.dad[children], minlength=len(self.dad)) + np.bincount(children, minlength=len(self.dad))
+        degrees[self.special] += 1
+        degrees[SPECIAL_NODE] = 2
+        return degrees
+
+    def get_depths(self):
+        """
+        Return the depth of every node of the spanning tree (0 for the root and the special node).
+
+        Returns:
+            np.ndarray: An int64 array with n entries.
+        """
+        depths = np.zeros(len(self.dad), dtype=np.int64)
+        for x in self.order[1:]:
+            depths[x] = depths[self.dad[x]] + 1
+        return depths
+
+
+def minimum_one_tree(instance, pi: np.ndarray = None):
+    """
+    Compute a minimum 1-tree with Prim's algorithm in O(n^2) time and O(n) memory.
+
+    Args:
+        instance (Instance): The (symmetric) TSP instance with at least 3 nodes.
+        pi (np.ndarray, optional): The node penalties (default is all zeros).
+
+    Returns:
+        OneTree: The minimum 1-tree.
+    """
+    # Imported here, since the candidates module builds on this one
+    from pytsp.structures.candidates import pair_weights
+
+    n = instance.number_of_stops
+    pi = np.zeros(n) if pi is None else pi
+
+    dad = np.full(n, -1, dtype=np.int64)
+    dad_weight = np.zeros(n)
+    order = np.empty(n - 1, dtype=np.int64)
+
+    # Nodes outside the tree with their distance to the tree (shrinks by one node per step)
+    remaining = np.arange(2, n)
+    remaining_key = np.full(n - 2, np.inf)
+    remaining_dad = np.full(n - 2, 1)
+    node = 1
+    for step in range(n - 1):
+        order[step] = node
+        if step == n - 2:
+            break
+
+        weights = pair_weights(instance, node, remaining) + (pi[node] + pi[remaining])
+        closer = weights < remaining_key
+        remaining_key[closer] = weights[closer]
+        remaining_dad[closer] = node
+
+        # Add the closest node and move the last remaining node into its slot
+        nearest = remaining_key.argmin()
+        node = remaining[nearest]
+        dad[node], dad_weight[node] = remaining_dad[nearest], remaining_key[nearest]
+        last = len(remaining) - 1
+        remaining[nearest], remaining_key[nearest], remaining_dad[nearest] = remaining[last], remaining_key[last], remaining_dad[last]
+        remaining, remaining_key, remaining_dad = remaining[:last], remaining_key[:last], remaining_dad[:last]
+
+    # Connect the special node with its two nearest nodes
+    row = transformed_rows(instance, np.array([SPECIAL_NODE]), pi)[0]
+    row[SPECIAL_NODE] = np.inf
+    special = np.argpartition(row, 1)[:2]
+    special = special[np.argsort(row[special], kind="stable")]
+
+    return OneTree(dad=dad, dad_weight=dad_weight, order=order, special=special, special_weight=row[special])
+
+
+def subgradient_optimization(instance, max_iterations: int = 1000, initial_step_size: float = 1.0, initial_period: int = None):
+    """
+    Maximize the 1-tree lower bound w(pi) = L(T_pi) - 2 * sum(pi) by subgradient optimization.
+
+    The penalties move along the subgradient v = degrees - 2 (nodes of degree > 2 become more expensive).
+    The step size schedule follows LKH: the step size is doubled as long as the bound increases in the
+    initial phase, and step size and period are halved after every period. The ascent stops once the
+    period reaches 0, after max_iterations 1-trees, or if a 1-tree is a tour (then the bound is optimal).
+
+    Args:
+        instance (Instance): The (symmetric) TSP instance with at least 3 nodes.
+        max_iterations (int): Max. number of 1-trees computed (default is 1000).
+        initial_step_size (float): The initial step size (default is 1, i.e. one weight unit).
+        initial_period (int, optional): The number of iterations of the first period (default is max(n / 2, 100)).
+
+    Returns:
+        tuple: (lower_bound, pi) with the best lower bound found and the penalties attaining it.
+    """
+    n = instance.number_of_stops
+    pi = np.zeros(n)
+    tree = minimum_one_tree(instance, pi)
+    best_bound, best_pi = tree.length, pi
+    subgradient = tree.get_degrees() - 2
+    previous_subgradient = subgradient
+
+    initial_period = initial_period or max(n // 2, 100)
+    period = initial_period
+    step_size = initial_step_size
+    initial_phase = True
+    iterations = 1
+
+    while period > 0 and step_size > 0 and subgradient.any() and iterations < max_iterations:
+        p = 1
+        while p <= period and subgradient.any() and iterations < max_iterations:
+            pi = pi + step_size * (0.7 * subgradient + 0.3 * previous_subgradient)
+            tree = minimum_one_tree(instance, pi)
+            bound = tree.length - 2 * pi.sum()
+            previous_subgradient, subgradient = subgradient, tree.get_degrees() - 2
+            iterations += 1
+
+            if bound > best_bound:
+                best_bound, best_pi = bound, pi
+                if initial_phase:
+                    step_size *= 2
+                # The bound still increases at the end of the period, so extend it (up to the initial period)
+                if p == period:
+                    period = min(2 * period, initial_period)
+            elif initial_phase:
+                # The step size overshoots, so stop doubling it and restart the period
+                initial_phase = False
+                p = 0
+                step_size *= 3 / 4
+            p += 1
+
+        step_size /= 2
+        period //= 2
+
+    return best_bound, best_pi
+
+
+def alpha_rows(instance, tree: OneTree, pi: np.ndarray, rows: np.ndarray):
+    """
+    Compute the alpha-nearness values of a block of rows.
+
+    alpha(i, j) = d(i, j) - beta(i, j), where beta(i, j) is the largest transformed weight on the tree
+    path between i and j (for the special node, the larger of its two 1-tree edges). The betas of a
+    row are found with one sweep over the tree: first up the path from i to the root, then down from
+    the root level by level (Helsgaun's O(n) per row scheme, vectorized over all rows of the block).
+
+    Args:
+        instance (Instance): The (symmetric) TSP instance.
+        tree (OneTree): The minimum 1-tree under the penalties pi.
+        pi (np.ndarray): The node penalties.
+        rows (np.ndarray): The row indices.
+
+    Returns:
+        np.ndarray: A float64 array with shape (len(rows), n); alpha(i, i) is inf.
+    """
+    n = instance.number_of_stops
+    rows = np.asarray(rows, dtype=np.int64)
+    block = np.arange(len(rows))
+    d = transformed_rows(instance, rows, pi)
+
+    # beta(i, i) = -inf makes alpha(i, i) = inf
+    beta = np.full((len(rows), n), -np.inf)
+    is_ancestor = np.zeros((len(rows), n), dtype=bool)
+    is_ancestor[block, rows] = True
+
+    # Walk up from i to the root (beta of an ancestor is the largest weight on the way up)
+    current = rows.copy()
+    path_max = np.full(len(rows), -np.inf)
+    active = (rows != SPECIAL_NODE) & (rows != tree.root)
+    while active.any():
+        nodes = current[active]
+        path_max[active] = np.maximum(path_max[active], tree.dad_weight[nodes])
+        current[active] = tree.dad[nodes]
+        beta[block[active], current[active]] = path_max[active]
+        is_ancestor[block[active], current[active]] = True
+        active &= current != tree.root
+
+    # Walk down from the root level by level (beta of other nodes extends the beta of their dad)
+    depths = tree.get_depths()
+    by_depth = tree.order[np.argsort(depths[tree.order], kind="stable")]
+    levels = np.split(by_depth, np.flatnonzero(np.diff(depths[by_depth])) + 1)[1:]
+    for level in levels:
+        extended = np.maximum(beta[:, tree.dad[level]], tree.dad_weight[level])
+        beta[:, level] = np.where(is_ancestor[:, level], beta[:, level], extended)
+
+    # Edges to the special node replace its longer 1-tree edge
+    beta[:, SPECIAL_NODE] = tree.special_weight[1]
+    is_special = rows == SPECIAL_NODE
+    beta[is_special] = tree.special_weight[1]
+    beta[is_special, SPECIAL_NODE] = -np.inf
+
+    alpha = np.maximum(d - beta, 0)
+
+    # 1-tree edges of the special node have alpha 0
+    for node in tree.special:
+        alpha[rows == node, SPECIAL_NODE] = 0
+        alpha[is_special, node] = 0
+
+    return alpha
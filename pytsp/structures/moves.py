@@ -0,0 +1,328 @@
+"""
+Constant-time cost deltas and in-place application of the standard tour moves.
+
+A route is a writable integer array with the node indices (positions in instance.nodes) of a tour,
+without the return to the start (e.g., tour.indices[:-1].copy()). Moves are given by positions in
+the route. Every *_delta function returns the change of the tour weight (new - old, so negative
+values are improvements) from the O(1) edges the move removes and adds; the matching apply_*
+function performs the move on the route in place. All functions also accept an ArrayTour or a
+TwoLevelListTour as the route, on which the apply_* functions are composed of reversals.
+
+Moves that reverse a part of the tour (2-opt, reversed or-opt segments, most 3-opt cases) only
+have O(1) deltas for symmetric instances; swap, insertion, or-opt and double-bridge are exact for
+asymmetric instances as well. two_opt_delta(..., symmetric=False) is exact for asymmetric instances
+in O(j - i) time.
+"""
+from enum import Enum
+
+import numpy as np
+
+
+class OptCase(Enum):
+    """
+    Enumeration of the 8 possible 3-opt move cases.
+    Each case represents a different way to reconnect three segments.
+    """
+    OPT_CASE_1 = "opt_case_1"  # No change (original route)
+    OPT_CASE_2 = "opt_case_2"  # Reverse segment A
+    OPT_CASE_3 = "opt_case_3"  # Reverse segment C
+    OPT_CASE_4 = "opt_case_4"  # Reverse segments A and C
+    OPT_CASE_5 = "opt_case_5"  # Reverse segments A and B
+    OPT_CASE_6 = "opt_case_6"  # Reverse segment B
+    OPT_CASE_7 = "opt_case_7"  # Reverse segments B and C
+    OPT_CASE_8 = "opt_case_8"  # Reverse all segments
+
+
+def two_opt_delta(instance, route: np.ndarray, i: int, j: int, symmetric: bool = True):
+    """
+    Compute the cost change of reversing the segment route[i..j].
+
+    The edges (route[i-1], route[i]) and (route[j], route[j+1]) are replaced by
+    (route[i-1], route[j]) and (route[i], route[j+1]).
+
+    Args:
+        instance (Instance): The TSP instance (symmetric, unless symmetric is False).
+        route (np.ndarray): The node indices of the tour.
+        i (int): First position of the segment.
+        j (int): Last position of the segment (i <= j < n).
+        symmetric (bool): Whether the instance is symmetric (default is True). Otherwise, the weights of
+            the segment in both directions are compared as well, which takes O(j - i) time.
+
+    Returns:
+        int or float: The cost change (negative is an improvement).
+    """
+    n = len(route)
+
+    if not symmetric:
+        # The segment is traversed backward afterwards, so its edges change as well
+        segment = route[i:j + 1] if isinstance(route, np.ndarray) else np.array([route[p] for p in range(i, j + 1)])
+        if j - i == n - 1:
+            path, new_path = np.append(segment, segment[0]), np.append(segment[::-1], segment[-1])
+        else:
+            path = np.concatenate(([route[i - 1]], segment, [route[(j + 1) % n]]))
+            new_path = np.concatenate(([route[i - 1]], segment[::-1], [route[(j + 1) % n]]))
+        return (instance.weights(new_path[:-1], new_path[1:]).sum() - instance.weights(path[:-1], path[1:]).sum()).item()
+
+    # Reversing (almost) the whole tour only changes its direction
+    if j - i >= n - 2:
+        return 0
+
+    a, b = route[i - 1], route[i]
+    c, d = route[j], route[(j + 1) % n]
+    return instance.w(a, c) + instance.w(b, d) - instance.w(a, b) - instance.w(c, d)
+
+
+def apply_two_opt(route: np.ndarray, i: int, j: int):
+    """
+    Reverse the segment route[i..j] in place.
+    """
+    if not isinstance(route, np.ndarray):
+        route.reverse(i, j)
+        return
+    route[i:j + 1] = route[i:j + 1][::-1].copy()
+
+
+def _or_opt_positions(route: np.ndarray, i: int, length: int, j: int):
+    """
+    Return the nodes around a segment and around its new position.
+    """
+    n = len(route)
+    p, first, last, q = route[i - 1], route[i], route[i + length - 1], route[(i + length) % n]
+    a, b = route[j], route[(j + 1) % n]
+    return p, first, last, q, a, b
+
+
+def or_opt_delta(instance, route: np.ndarray, i: int, length: int, j: int, reverse: bool = False):
+    """
+    Compute the cost change of moving the segment route[i:i+length] between route[j] and route[j+1].
+
+    Args:
+        instance (Instance): The TSP instance (symmetric, if reverse is True).
+        route (np.ndarray): The node indices of the tour.
+        i (int): First position of the segment (i + length <= n).
+        length (int): Number of nodes in the segment (at most n - 2).
+        j (int): Position of the node after which the segment is inserted (outside of i-1..i+length-1).
+        reverse (bool): Insert the segment in reverse order (default is False).
+
+    Returns:
+        int or float: The cost change (negative is an improvement).
+    """
+    p, first, last, q, a, b = _or_opt_positions(route, i, length, j)
+
+    removed = instance.w(p, first) + instance.w(last, q) + instance.w(a, b)
+    if reverse:
+        added = instance.w(p, q) + instance.w(a, last) + instance.w(first, b)
+    else:
+        added = instance.w(p, q) + instance.w(a, first) + instance.w(last, b)
+    return added - removed
+
+
+def apply_or_opt(route: np.ndarray, i: int, length: int, j: int, reverse: bool = False):
+    """
+    Move the segment route[i:i+length] between route[j] and route[j+1] in place.
+
+    Only the nodes between the old and the new position of the segment are shifted.
+    """
+    if not isinstance(route, np.ndarray):
+        # S M -> M S (or M S reversed) by reversing both blocks and then each block on its own
+        if j >= i + length:
+            route.reverse(i, j)
+            route.reverse(i, j - length)
+            if not reverse:
+                route.reverse(j - length + 1, j)
+        else:
+            route.reverse(j + 1, i + length - 1)
+            route.reverse(j + 1 + length, i + length - 1)
+            if not reverse:
+                route.reverse(j + 1, j + length)
+        return
+
+    segment = route[i:i + length].copy()
+    if reverse:
+        segment = segment[::-1]
+
+    if j >= i + length:
+        # Shift the nodes after the segment forward
+        route[i:j - length + 1] = route[i + length:j + 1].copy()
+        route[j - length + 1:j + 1] = segment
+    else:
+        # Shift the nodes before the segment backward
+        route[j + 1 + length:i + length] = route[j + 1:i].copy()
+        route[j + 1:j + 1 + length] = segment
+
+
+def insertion_delta(instance, route: np.ndarray, i: int, j: int):
+    """
+    Compute the cost change of moving the node route[i] between route[j] and route[j+1].
+
+    Args:
+        instance (Instance): The TSP instance.
+        route (np.ndarray): The node indices of the tour.
+        i (int): Position of the node.
+        j (int): Position of the node after which it is inserted (j == i and j == i - 1, cyclically,
+            leave the tour unchanged).
+
+    Returns:
+        int or float: The cost change (negative is an improvement).
+    """
+    # The node already lies between route[j] and route[j+1] (e.g., i = 0 and j = n - 1)
+    if (j - i) % len(route) in (0, len(route) - 1):
+        return 0
+
+    return or_opt_delta(instance, route, i, 1, j)
+
+
+def apply_insertion(route: np.ndarray, i: int, j: int):
+    """
+    Move the node route[i] between route[j] and route[j+1] in place (no change if j == i or j == i - 1, cyclically).
+    """
+    if (j - i) % len(route) in (0, len(route) - 1):
+        return
+
+    apply_or_opt(route, i, 1, j)
+
+
+def swap_delta(instance, route: np.ndarray, i: int, j: int):
+    """
+    Compute the cost change of exchanging the nodes route[i] and route[j].
+
+    Args:
+        instance (Instance): The TSP instance.
+        route (np.ndarray): The node indices of the tour.
+        i (int): Position of the first node.
+        j (int): Position of the second node (i < j).
+
+    Returns:
+        int or float: The cost change (negative is an improvement).
+    """
+    n = len(route)
+    x, y = route[i], route[j]
+    w = instance.w
+
+    if j == i + 1:
+        # ... p x y q -> p y x q
+        p, q = route[i - 1], route[(j + 1) % n]
+        return w(p, y) + w(y, x) + w(x, q) - w(p, x) - w(x, y) - w(y, q)
+    if i == 0 and j == n - 1:
+        # y is the predecessor of x: p y x q -> p x y q
+        p, q = route[j - 1], route[i + 1]
+        return w(p, x) + w(x, y) + w(y, q) - w(p, y) - w(y, x) - w(x, q)
+
+    px, qx, py, qy = route[i - 1], route[i + 1], route[j - 1], route[(j + 1) % n]
+    return w(px, y) + w(y, qx) + w(py, x) + w(x, qy) - w(px, x) - w(x, qx) - w(py, y) - w(y, qy)
+
+
+def apply_swap(route: np.ndarray, i: int, j: int):
+    """
+    Exchange the nodes route[i] and route[j] in place.
+    """
+    if not isinstance(route, np.ndarray):
+        route.swap(i, j)
+        return
+    route[i], route[j] = route[j], route[i]
+
+
+def three_opt_delta(instance, route: np.ndarray, case: OptCase, i: int, j: int, k: int):
+    """
+    Compute the cost change of a 3-opt reconnection.
+
+    The positions split the tour into the segments route[k:] + route[:i] (A), route[i:j] (B)
+    and route[j:k] (C) (see pytsp.methods.k_opt.possible_segments), and the case selects which
+    of them are reversed.
+
+    Args:
+        instance (Instance): The (symmetric) TSP instance.
+        route (np.ndarray): The node indices of the tour.
+        case (OptCase): The 3-opt case.
+        i, j, k (int): Positions defining the segments (i < j < k <= n).
+
+    Returns:
+        int or float: The cost change (negative is an improvement).
+    """
+    n = len(route)
+    a, b = route[i - 1], route[i]
+    c, d = route[j - 1], route[j]
+    e, f = route[k - 1], route[k % n]
+    w = instance.w
+
+    if case == OptCase.OPT_CASE_1:
+        return 0
+    if case == OptCase.OPT_CASE_2:
+        return w(b, f) + w(a, e) - w(a, b) - w(e, f)
+    if case == OptCase.OPT_CASE_3:
+        return w(d, f) + w(c, e) - w(c, d) - w(e, f)
+    if case == OptCase.OPT_CASE_4:
+        return w(a, d) + w(b, f) + w(e, c) - w(a, b) - w(c, d) - w(e, f)
+    if case == OptCase.OPT_CASE_5:
+        return w(c, f) + w(b, d) + w(e, a) - w(a, b) - w(c, d) - w(e, f)
+    if case == OptCase.OPT_CASE_6:
+        return w(c, a) + w(b, d) - w(b, a) - w(d, c)
+    if case == OptCase.OPT_CASE_7:
+        return w(b, e) + w(d, f) + w(c, a) - w(a, b) - w(c, d) - w(e, f)
+    if case == OptCase.OPT_CASE_8:
+        return w(a, d) + w(c, f) + w(b, e) - w(a, b) - w(c, d) - w(e, f)
+
+
+def apply_three_opt(route: np.ndarray, case: OptCase, i: int, j: int, k: int):
+    """
+    Perform a 3-opt reconnection in place (the route starts with segment A afterwards).
+    """
+    n = len(route)
+    if case == OptCase.OPT_CASE_1:
+        return
+
+    reverse_first = case in (OptCase.OPT_CASE_2, OptCase.OPT_CASE_4, OptCase.OPT_CASE_5, OptCase.OPT_CASE_8)
+    reverse_second = case in (OptCase.OPT_CASE_5, OptCase.OPT_CASE_6, OptCase.OPT_CASE_7, OptCase.OPT_CASE_8)
+    reverse_third = case in (OptCase.OPT_CASE_3, OptCase.OPT_CASE_4, OptCase.OPT_CASE_7, OptCase.OPT_CASE_8)
+
+    if not isinstance(route, np.ndarray):
+        # Reverse the segments where they are (A wraps around the end), then let the route start with A
+        if reverse_first:
+            route.reverse(k % n, i - 1)
+        if reverse_second:
+            route.reverse(i, j - 1)
+        if reverse_third:
+            route.reverse(j, k - 1)
+        route.rotate(k % n)
+        return
+
+    # Segment A wraps around the end of the route
+    first = np.concatenate((route[k % n:], route[:i])) if (i - 1) < (k % n) else route[k % n:i]
+    second, third = route[i:j], route[j:k]
+
+    route[:] = np.concatenate((first[::-1] if reverse_first else first,
+                               second[::-1] if reverse_second else second,
+                               third[::-1] if reverse_third else third))
+
+
+def double_bridge_delta(instance, route: np.ndarray, i: int, j: int, k: int):
+    """
+    Compute the cost change of a double-bridge move, which turns the tour A B C D into A C B D
+    with B = route[i:j], C = route[j:k] (no segment is reversed).
+
+    Args:
+        instance (Instance): The TSP instance.
+        route (np.ndarray): The node indices of the tour.
+        i, j, k (int): Positions defining the segments (0 < i < j < k < n).
+
+    Returns:
+        int or float: The cost change (negative is an improvement).
+    """
+    a, b = route[i - 1], route[i]
+    c, d = route[j - 1], route[j]
+    e, f = route[k - 1], route[k]
+    w = instance.w
+    return w(a, d) + w(e, b) + w(c, f) - w(a, b) - w(c, d) - w(e, f)
+
+
+def apply_double_bridge(route: np.ndarray, i: int, j: int, k: int):
+    """
+    Perform a double-bridge move in place (only route[i:k] changes).
+    """
+    if not isinstance(route, np.ndarray):
+        # B C -> C B by reversing both segments and then each segment on its own
+        route.reverse(i, k - 1)
+        route.reverse(i, i + k - j - 1)
+        route.reverse(i + k - j, k - 1)
+        return
+    route[i:k] = np.concatenate((route[j:k], route[i:j]))
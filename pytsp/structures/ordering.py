@@ -0,0 +1,137 @@
+"""
+Locality-preserving node orders for cache-friendly distance matrix access.
+
+Node IDs in TSPLIB files are in arbitrary order, so the matrix rows of nodes that are close to each
+other (and thus adjacent in good tours and candidate lists) lie far apart in memory. Sorting the nodes
+along a space-filling curve puts nearby nodes into nearby rows and columns. An order is a permutation
+of the node indices (positions in instance.nodes); see Instance.reorder().
+"""
+import numpy as np
+
+
+def _quantize(points: np.ndarray, bits: int):
+    """
+    Map 2D points onto a (2^bits x 2^bits) integer grid (both axes with the same scale).
+
+    Args:
+        points (np.ndarray): An (n x 2) array of points.
+        bits (int): Grid resolution in bits per axis.
+
+    Returns:
+        tuple: (x, y) int64 arrays with values in [0, 2^bits).
+    """
+    points = np.asarray(points, dtype=np.float64)
+    lower = points.min(axis=0)
+    span = max((points.max(axis=0) - lower).max(), np.finfo(np.float64).tiny)
+    grid = np.floor((points - lower) / span * ((1 << bits) - 1)).astype(np.int64)
+    return grid[:, 0], grid[:, 1]
+
+
+def hilbert_keys(points: np.ndarray, bits: int = 16):
+    """
+    Compute the position of 2D points along a Hilbert curve.
+
+    Args:
+        points (np.ndarray): An (n x 2) array of points.
+        bits (int): Grid resolution in bits per axis (default is 16, at most 31).
+
+    Returns:
+        np.ndarray: An int64 array with the curve position of every point.
+    """
+    x, y = _quantize(points, bits)
+    keys = np.zeros(len(x), dtype=np.int64)
+
+    s = 1 << (bits - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        keys += s * s * ((3 * rx) ^ ry)
+
+        # Rotate the quadrant, so the curve continues in the same orientation on the next level
+        flip = ~ry & rx
+        x = np.where(flip, s - 1 - x, x)
+        y = np.where(flip, s - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+
+    return keys
+
+
+def _spread_bits(values: np.ndarray):
+    """
+    Insert a zero bit after every bit of 32-bit values (abc -> a0b0c).
+    """
+    values = values.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                        (2, 0x3333333333333333), (1, 0x5555555555555555)):
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+    return values
+
+
+def morton_keys(points: np.ndarray, bits: int = 16):
+    """
+    Compute the position of 2D points along a Morton (Z-order) curve by interleaving the bits of x and y.
+
+    Args:
+        points (np.ndarray): An (n x 2) array of points.
+        bits (int): Grid resolution in bits per axis (default is 16, at most 31).
+
+    Returns:
+        np.ndarray: A uint64 array with the curve position of every point.
+    """
+    x, y = _quantize(points, bits)
+    return _spread_bits(x) | (_spread_bits(y) << np.uint64(1))
+
+
+def _curve_order(instance, keys_function, bits: int):
+    """
+    Sort the nodes of an instance by their keys on a space-filling curve.
+    """
+    if instance.display_coordinates is None:
+        raise ValueError(f"Reordering nodes requires 2D coordinates, but {instance.name} has none.")
+
+    return np.argsort(keys_function(instance.display_coordinates, bits), kind="stable")
+
+
+def hilbert_order(instance, bits: int = 16):
+    """
+    Order the nodes of an instance along a Hilbert curve through their 2D positions.
+
+    Args:
+        instance (Instance): The TSP instance.
+        bits (int): Grid resolution in bits per axis (default is 16).
+
+    Returns:
+        np.ndarray: The node indices in curve order.
+
+    Raises:
+        ValueError: If the instance has no 2D positions.
+    """
+    return _curve_order(instance, hilbert_keys, bits)
+
+
+def morton_order(instance, bits: int = 16):
+    """
+    Order the nodes of an instance along a Morton (Z-order) curve through their 2D positions.
+
+    Morton keys are cheaper to compute than Hilbert keys, but the curve jumps between quadrants,
+    so its locality is slightly worse.
+
+    Args:
+        instance (Instance): The TSP instance.
+        bits (int): Grid resolution in bits per axis (default is 16).
+
+    Returns:
+        np.ndarray: The node indices in curve order.
+
+    Raises:
+        ValueError: If the instance has no 2D positions.
+    """
+    return _curve_order(instance, morton_keys, bits)
+
+
+# Node orders by name (see NodeOrder)
+TYPES = {
+    "hilbert": hilbert_order,
+    "morton": morton_order
+}
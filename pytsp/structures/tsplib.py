@@ -0,0 +1,333 @@
+"""
+Native TSPLIB parser that loads the data sections straight into NumPy arrays.
+
+tsplib95 tokenizes every number of a file in pure Python, which dominates the startup time for large
+instances (e.g., pla85900 or the big EXPLICIT files). read_tsplib() only parses the header line by line
+and reads each data section as one block. The tsplib95 object is still available, but only built on
+first access (see TSPLIBData.problem).
+
+The semantics follow tsplib95: nodes are the sorted IDs of NODE_COORD_SECTION (or DISPLAY_DATA_SECTION),
+otherwise 0..DIMENSION-1; triangular matrices are mirrored, and formats without diagonal have 0 on the diagonal.
+"""
+from itertools import chain
+
+import numpy as np
+
+# Column-wise triangles equal the transposed row-wise triangles (mirrored, they describe the same matrix)
+COLUMN_FORMATS = {
+    "UPPER_COL": "LOWER_ROW",
+    "LOWER_COL": "UPPER_ROW",
+    "UPPER_DIAG_COL": "LOWER_DIAG_ROW",
+    "LOWER_DIAG_COL": "UPPER_DIAG_ROW",
+}
+
+# Row-wise triangles as (triangle, diagonal offset) of np.triu_indices/np.tril_indices
+TRIANGLE_FORMATS = {
+    "UPPER_ROW": (np.triu_indices, 1),
+    "UPPER_DIAG_ROW": (np.triu_indices, 0),
+    "LOWER_ROW": (np.tril_indices, -1),
+    "LOWER_DIAG_ROW": (np.tril_indices, 0),
+}
+
+
+class TSPLIBData:
+    """
+    The contents of a TSPLIB file as NumPy arrays.
+
+    All arrays are ordered by node: row k of node_coords, display_data and edge_weights belongs to the
+    node with ID node_ids[k].
+    """
+
+    def __init__(self, specification: dict, node_ids: np.ndarray, node_coords: np.ndarray = None,
+                 display_data: np.ndarray = None, edge_weights: np.ndarray = None, path=None, problem=None):
+        """
+        Initialize the parsed data.
+
+        Args:
+            specification (dict): The header fields with lowercase keys (e.g., name, dimension, edge_weight_type).
+            node_ids (np.ndarray): The sorted node IDs.
+            node_coords (np.ndarray, optional): Node coordinates with shape (n, dimension).
+            display_data (np.ndarray, optional): Display coordinates with shape (n, 2).
+            edge_weights (np.ndarray, optional): The full (n x n) weight matrix of EXPLICIT instances.
+            path (Path, optional): The TSPLIB file (used to build the tsplib95 object on demand).
+            problem (tsplib95.models.StandardProblem, optional): An existing tsplib95 object.
+        """
+        self.specification = specification
+        self.node_ids = node_ids
+        self.node_coords = node_coords
+        self.display_data = display_data
+        self.edge_weights = edge_weights
+        self.path = path
+        self._problem = problem
+
+    @property
+    def name(self):
+        return self.specification.get("name")
+
+    @property
+    def dimension(self):
+        return len(self.node_ids)
+
+    @property
+    def edge_weight_type(self):
+        return self.specification.get("edge_weight_type")
+
+    @property
+    def edge_weight_format(self):
+        return self.specification.get("edge_weight_format")
+
+    @property
+    def display_data_type(self):
+        return self.specification.get("display_data_type")
+
+    @property
+    def problem(self):
+        """
+        The tsplib95 object of the file (loaded on first access; data without file is exported and parsed).
+        """
+        if self._problem is None:
+            # Imported here, since tsplib95 takes long to import and is rarely needed
+            import tsplib95
+            self._problem = tsplib95.load(self.path) if self.path is not None else tsplib95.parse(self.to_text())
+        return self._problem
+
+    def to_text(self):
+        """
+        Export the data as TSPLIB text.
+
+        Returns:
+            str: The TSPLIB-formatted text.
+        """
+        lines = [f"{key.upper()}: {value}" for key, value in self.specification.items() if value not in (None, "")]
+
+        if self.node_coords is not None:
+            lines.append("NODE_COORD_SECTION")
+            lines += _indexed_lines(self.node_ids, self.node_coords)
+
+        if self.edge_weights is not None:
+            lines.append("EDGE_WEIGHT_SECTION")
+            values = compress_edge_weights(self.edge_weights, self.edge_weight_format).tolist()
+            n = max(1, len(self.node_ids))
+            lines += [" ".join(map(str, values[start:start + n])) for start in range(0, len(values), n)]
+
+        if self.display_data is not None:
+            lines.append("DISPLAY_DATA_SECTION")
+            lines += _indexed_lines(self.node_ids, self.display_data)
+
+        lines.append("EOF")
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def from_problem(cls, problem):
+        """
+        Convert a tsplib95 object into arrays.
+
+        Args:
+            problem (tsplib95.models.StandardProblem): The tsplib95 object.
+
+        Returns:
+            TSPLIBData: The data of the problem (keeping a reference to the problem).
+        """
+        node_ids = np.array(list(problem.get_nodes()), dtype=np.int64)
+
+        node_coords = None
+        if problem.node_coords:
+            node_coords = np.array([problem.node_coords[n] for n in node_ids.tolist()], dtype=np.float64)
+
+        display_data = None
+        if problem.display_data:
+            display_data = np.array([problem.display_data[n] for n in node_ids.tolist()], dtype=np.float64)
+
+        edge_weights = None
+        if problem.edge_weight_type == "EXPLICIT" and problem.edge_weights:
+            values = np.array(list(chain(*problem.edge_weights)))
+            edge_weights = expand_edge_weights(values, problem.edge_weight_format, len(node_ids))
+
+        specification = {key: value for key, value in problem.as_name_dict().items() if isinstance(value, (str, int))}
+        return cls(specification=specification, node_ids=node_ids, node_coords=node_coords,
+                   display_data=display_data, edge_weights=edge_weights, problem=problem)
+
+
+def _to_numbers(tokens):
+    """
+    Convert number strings into an int64 array, or a float64 array if any token is not an integer.
+    """
+    try:
+        return np.array(tokens, dtype=np.int64)
+    except (ValueError, OverflowError):
+        return np.array(tokens, dtype=np.float64)
+
+
+def expand_edge_weights(values: np.ndarray, edge_weight_format: str, dimension: int):
+    """
+    Expand the values of an EDGE_WEIGHT_SECTION into a full (n x n) matrix.
+
+    Args:
+        values (np.ndarray): The values of the section in file order.
+        edge_weight_format (EdgeWeightFormat): The format of the section.
+        dimension (int): The number of nodes n.
+
+    Returns:
+        np.ndarray: The full (n x n) weight matrix.
+
+    Raises:
+        ValueError: If the format is unknown or the section has too few values.
+    """
+    edge_weight_format = COLUMN_FORMATS.get(edge_weight_format, edge_weight_format)
+
+    if edge_weight_format == "FULL_MATRIX":
+        if len(values) < dimension * dimension:
+            raise ValueError(f"EDGE_WEIGHT_SECTION has {len(values)} values, but FULL_MATRIX needs {dimension * dimension}.")
+        return values[:dimension * dimension].reshape(dimension, dimension)
+
+    if edge_weight_format not in TRIANGLE_FORMATS:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_FORMAT {edge_weight_format}.")
+
+    triangle, offset = TRIANGLE_FORMATS[edge_weight_format]
+    rows, columns = triangle(dimension, offset)
+    if len(values) < len(rows):
+        raise ValueError(f"EDGE_WEIGHT_SECTION has {len(values)} values, but {edge_weight_format} needs {len(rows)}.")
+
+    # Mirror the triangle (formats without diagonal keep 0 on the diagonal)
+    edge_weights = np.zeros((dimension, dimension), dtype=values.dtype)
+    edge_weights[rows, columns] = values[:len(rows)]
+    edge_weights[columns, rows] = values[:len(rows)]
+    return edge_weights
+
+
+def compress_edge_weights(edge_weights: np.ndarray, edge_weight_format: str):
+    """
+    Extract the values of an EDGE_WEIGHT_SECTION from a full (n x n) matrix (the inverse of expand_edge_weights).
+
+    Args:
+        edge_weights (np.ndarray): The full (n x n) weight matrix.
+        edge_weight_format (EdgeWeightFormat): The format of the section.
+
+    Returns:
+        np.ndarray: The values of the section in file order.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    edge_weight_format = COLUMN_FORMATS.get(edge_weight_format, edge_weight_format)
+
+    if edge_weight_format == "FULL_MATRIX":
+        return np.asarray(edge_weights).ravel()
+
+    if edge_weight_format not in TRIANGLE_FORMATS:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_FORMAT {edge_weight_format}.")
+
+    triangle, offset = TRIANGLE_FORMATS[edge_weight_format]
+    return np.asarray(edge_weights)[triangle(len(edge_weights), offset)]
+
+
+def dimension_from_count(count: int, edge_weight_format: str):
+    """
+    Return the number of nodes n of an EDGE_WEIGHT_SECTION with the given number of values.
+
+    Args:
+        count (int): The number of values.
+        edge_weight_format (EdgeWeightFormat): The format of the section.
+
+    Returns:
+        int: The number of nodes.
+    """
+    edge_weight_format = COLUMN_FORMATS.get(edge_weight_format, edge_weight_format)
+
+    if edge_weight_format == "FULL_MATRIX":
+        return int(round(np.sqrt(count)))
+
+    # Triangles hold n * (n - 1) / 2 values, plus n with diagonal
+    _, offset = TRIANGLE_FORMATS.get(edge_weight_format, (None, 0))
+    has_diagonal = offset == 0
+    return int(round((np.sqrt(8 * count + 1) + (-1 if has_diagonal else 1)) / 2))
+
+
+def _indexed_lines(ids: np.ndarray, values: np.ndarray):
+    """
+    Format the lines of a section of "ID value value ..." lines.
+    """
+    return [" ".join(map(str, [node_id, *row])) for node_id, row in zip(ids.tolist(), values.tolist())]
+
+
+def _is_keyword(line: str):
+    """
+    Check whether a line starts a new header field or section (data lines start with a number).
+    """
+    return line[:1].isalpha()
+
+
+def _read_indexed_section(lines):
+    """
+    Read a section of "ID value value ..." lines, sorted by ID.
+
+    Returns:
+        tuple: (ids, values) with an int64 array of IDs and a float64 array of values (one row per ID).
+    """
+    data = np.loadtxt(lines, dtype=np.float64, ndmin=2)
+    order = np.argsort(data[:, 0], kind="stable")
+    return data[order, 0].astype(np.int64), data[order, 1:]
+
+
+def read_tsplib(path):
+    """
+    Parse a TSPLIB file into NumPy arrays.
+
+    The header is parsed line by line; NODE_COORD_SECTION, DISPLAY_DATA_SECTION and EDGE_WEIGHT_SECTION
+    are each read as one block. Other sections (e.g., FIXED_EDGES_SECTION) are skipped; they remain
+    available through the tsplib95 object.
+
+    Args:
+        path (Path): The TSPLIB file.
+
+    Returns:
+        TSPLIBData: The parsed data.
+
+    Raises:
+        ValueError: If the EDGE_WEIGHT_SECTION does not match the EDGE_WEIGHT_FORMAT.
+    """
+    with open(path) as file:
+        lines = file.read().splitlines()
+
+    specification = {}
+    sections = {}
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        i += 1
+        if not line:
+            continue
+
+        keyword, _, value = line.partition(":")
+        keyword = keyword.strip().upper()
+        if keyword == "EOF":
+            break
+
+        if not keyword.endswith("_SECTION"):
+            specification[keyword.lower()] = value.strip()
+            continue
+
+        # The data of a section runs until the next keyword
+        start = i
+        while i < len(lines) and not _is_keyword(lines[i].lstrip()):
+            i += 1
+        sections[keyword] = [line for line in lines[start:i] if line.strip()]
+
+    if "dimension" in specification:
+        specification["dimension"] = int(specification["dimension"])
+
+    node_ids = node_coords = display_data = edge_weights = None
+    if sections.get("NODE_COORD_SECTION"):
+        node_ids, node_coords = _read_indexed_section(sections["NODE_COORD_SECTION"])
+    if sections.get("DISPLAY_DATA_SECTION"):
+        display_ids, display_data = _read_indexed_section(sections["DISPLAY_DATA_SECTION"])
+        node_ids = display_ids if node_ids is None else node_ids
+    if node_ids is None:
+        node_ids = np.arange(specification.get("dimension", 0), dtype=np.int64)
+
+    if specification.get("edge_weight_type") == "EXPLICIT" and sections.get("EDGE_WEIGHT_SECTION"):
+        values = _to_numbers(" ".join(sections["EDGE_WEIGHT_SECTION"]).split())
+        edge_weights = expand_edge_weights(values, specification.get("edge_weight_format"), len(node_ids))
+
+    return TSPLIBData(specification=specification, node_ids=node_ids, node_coords=node_coords,
+                      display_data=display_data, edge_weights=edge_weights, path=path)
@@ -37,3 +37,24 @@ DisplayDataType = Literal[
     "TWOD_DISPLAY",   # Explicit coordinates in 2-D are given
     "NO_DISPLAY"      # No graphical display is possible
 ]
+
+# Define possible storage layouts for the distance matrix of an Instance
+DistanceStorage = Literal[
+    "dense",   # Full (n x n) matrix
+    "packed",  # Upper triangle of a symmetric matrix (including the diagonal)
+    "oracle"   # Rows computed on demand from the node coordinates (LRU cached)
+]
+
+# Define possible candidate neighbor structures of an Instance
+CandidateMethod = Literal[
+    "nearest",   # The k nearest neighbors of each node
+    "quadrant",  # The k/4 nearest neighbors in each quadrant around a node (2D only)
+    "delaunay",  # The neighbors in the Delaunay triangulation (2D only)
+    "alpha"      # The k alpha-nearest neighbors from Held-Karp 1-trees
+]
+
+# Define possible locality-preserving node orders of an Instance
+NodeOrder = Literal[
+    "hilbert",  # Nodes sorted along a Hilbert curve through their 2D positions
+    "morton"    # Nodes sorted along a Morton (Z-order) curve through their 2D positions
+]
@@ -1,6 +1,16 @@
 import unittest
 
 
+def shared_tour_weight(handle):
+    """
+    Worker of test_shared_instance: attach a shared instance and return the weight of the tour 0, 1, ..., n-1.
+    """
+    instance = handle.attach()
+    n = instance.number_of_stops
+    weight = sum(instance.w(i, (i + 1) % n) for i in range(n))
+    return weight, instance.get_candidates(k=5).tolist()
+
+
 class UnitTests(unittest.TestCase):
 
     def test_create_instance_from_file(self):
@@ -70,7 +80,690 @@ class UnitTests(unittest.TestCase):
 
         # Check weight of one of the edges
         self.assertEqual(my_instance.get_weight_via_id(source_id=0, target_id=1), 153)
-    
+
+    def test_create_instance_from_arrays(self):
+        import numpy as np
+        import tsplib95
+        from pytsp.structures.Instance import create_instance_from_coordinates, create_instance_from_cost_matrix
+
+        # Arrays are used without copy and without TSPLIB text
+        coordinates = np.random.default_rng(seed=0).random((30, 2)) * 1000
+        my_instance = create_instance_from_coordinates(name="random30", coordinates=coordinates, edge_weight_type="EUC_2D")
+        self.assertIs(my_instance.coordinates, coordinates)
+        self.assertIsNone(my_instance.tsplib_data._problem)
+
+        # The exported TSPLIB text describes the same instance
+        problem = tsplib95.parse(my_instance.to_tsplib())
+        self.assertEqual([[problem.get_weight(i, j) for j in range(1, 31)] for i in range(1, 31)], my_instance.get_full_cost_matrix())
+
+        cost_matrix = np.asarray(my_instance.get_distance_matrix())
+        matrix_instance = create_instance_from_cost_matrix(name="random30_matrix", cost_matrix=cost_matrix)
+        self.assertIs(matrix_instance.tsplib_data.edge_weights, cost_matrix)
+        self.assertEqual(matrix_instance.get_weight_via_id(source_id=0, target_id=1), my_instance.get_weight_via_id(source_id=1, target_id=2))
+
+        # Triangular formats are given as the rows of the triangle
+        lower_rows = [cost_matrix[i, :i] for i in range(1, 30)]
+        lower_instance = create_instance_from_cost_matrix(name="random30_lower", cost_matrix=lower_rows, edge_weight_format="LOWER_ROW")
+        self.assertEqual(lower_instance.number_of_stops, 30)
+        np.testing.assert_array_equal(lower_instance.get_distance_matrix(), cost_matrix)
+        self.assertEqual(lower_instance.TSPLIB.get_weight(3, 7), cost_matrix[3, 7])
+
+    def test_lazy_nodes(self):
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.structures.Node import Node2D
+        from pytsp.structures.Edge import Edge
+
+        # Node IDs and coordinates are arrays, Node objects are only created on access
+        my_instance = create_instance_from_file(name='burma14')
+        self.assertIsNone(my_instance._nodes)
+        np.testing.assert_array_equal(my_instance.node_ids, np.arange(1, 15))
+        self.assertEqual(my_instance.get_info(), "TSP burma14 with 14 nodes.")
+        self.assertIsNone(my_instance._nodes)
+
+        nodes = my_instance.nodes
+        self.assertIs(nodes, my_instance.nodes)
+        self.assertIsInstance(nodes[0], Node2D)
+        self.assertEqual((nodes[0].id, nodes[0].x, nodes[0].y), (1, 16.47, 96.10))
+
+        # Nodes and edges have no __dict__
+        self.assertFalse(hasattr(nodes[0], "__dict__"))
+        self.assertFalse(hasattr(Edge(nodes[0], nodes[1]), "__dict__"))
+
+    def test_distance_matrix(self):
+        from pytsp.structures.Instance import create_instance_from_file
+
+        # Load fromt he pytsp/data/TSPLIB folder
+        my_instance = create_instance_from_file(name='burma14')
+        distance_matrix = my_instance.get_distance_matrix()
+
+        # Matrix is cached and covers all nodes
+        self.assertIs(distance_matrix, my_instance.get_distance_matrix())
+        self.assertEqual(distance_matrix.shape, (14, 14))
+
+        # Matrix entries match the TSPLIB weights via the id <-> index mapping
+        for source_id in my_instance.index_to_id:
+            for target_id in my_instance.index_to_id:
+                self.assertEqual(distance_matrix[my_instance.id_to_index[source_id], my_instance.id_to_index[target_id]],
+                                 my_instance.TSPLIB.get_weight(source_id, target_id))
+
+        # Weights are returned as native Python numbers
+        self.assertIsInstance(my_instance.get_weight_via_id(source_id=1, target_id=2), int)
+
+    def test_distance_matrix_storage(self):
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file, create_instance_from_cost_matrix
+
+        # Weights of burma14 are at most 1261 and fit into uint16
+        dense_instance = create_instance_from_file(name='burma14')
+        self.assertEqual(dense_instance.get_distance_matrix().dtype, np.uint16)
+
+        # The packed layout stores the same weights in about half the memory
+        packed_instance = create_instance_from_file(name='burma14', distance_storage="packed")
+        packed_matrix = packed_instance.get_distance_matrix()
+        self.assertEqual(packed_matrix.nbytes, 14 * 15 // 2 * 2)
+        np.testing.assert_array_equal(np.asarray(packed_matrix), dense_instance.get_distance_matrix())
+        self.assertEqual(packed_instance.get_weight_via_id(source_id=2, target_id=1), 153)
+        np.testing.assert_array_equal(packed_matrix[[0, 1], [1, 0]], [153, 153])
+
+        # Negative weights use the smallest signed type that holds the whole range
+        from pytsp.structures.DistanceMatrix import select_dtype
+        negative_instance = create_instance_from_cost_matrix(name="negative", cost_matrix=[[0, -5, 1000], [-5, 0, 2], [1000, 2, 0]])
+        self.assertEqual(negative_instance.get_distance_matrix().dtype, np.int16)
+        self.assertEqual(negative_instance.w(0, 1), -5)
+        self.assertEqual(select_dtype(-1, 127), np.int8)
+        self.assertEqual(select_dtype(-40000, 3), np.int32)
+
+        # Non-integral weights only become float32 if explicitly allowed
+        cost_matrix = [[0, 1.5, 2], [1.5, 0, 3], [2, 3, 0]]
+        self.assertEqual(create_instance_from_cost_matrix(name="float64", cost_matrix=cost_matrix).get_distance_matrix().dtype, np.float64)
+        self.assertEqual(create_instance_from_cost_matrix(name="float32", cost_matrix=cost_matrix, allow_float32=True).get_distance_matrix().dtype, np.float32)
+
+        # Asymmetric instances cannot be packed
+        asymmetric_instance = create_instance_from_cost_matrix(name="asymmetric", cost_matrix=[[0, 1], [2, 0]], distance_storage="packed")
+        with self.assertRaises(ValueError):
+            asymmetric_instance.get_distance_matrix()
+
+    def test_distance_oracle(self):
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file
+
+        # Oracle with a row cache of 10 rows (pr1002 weights fit into uint16)
+        oracle_instance = create_instance_from_file(name='pr1002', distance_storage="oracle", oracle_cache_bytes=10 * 1002 * 2)
+        oracle = oracle_instance.get_distance_matrix()
+        dense_matrix = create_instance_from_file(name='pr1002').get_distance_matrix()
+
+        # Rows, blocks and single entries match the dense matrix
+        np.testing.assert_array_equal(oracle[5], dense_matrix[5])
+        np.testing.assert_array_equal(oracle.get_rows(range(20)), dense_matrix[:20])
+        self.assertEqual(oracle[5, 7], dense_matrix[5, 7])
+        self.assertEqual(oracle_instance.get_weight(oracle_instance.nodes[3], oracle_instance.nodes[900]), dense_matrix[3, 900])
+
+        # Batched lookups
+        i_array, j_array = np.arange(0, 1000, 7), np.arange(1, 1001, 7)
+        np.testing.assert_array_equal(oracle.get_weights(i_array, j_array), dense_matrix[i_array, j_array])
+        np.testing.assert_array_equal(oracle[i_array, j_array], dense_matrix[i_array, j_array])
+
+        # The row cache stays within its memory budget
+        self.assertLessEqual(oracle.nbytes, 10 * 1002 * 2)
+
+    def test_index_weight_api(self):
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.structures.Tour import get_sequence_weight
+
+        # Load fromt he pytsp/data/TSPLIB folder
+        my_instance = create_instance_from_file(name='burma14')
+
+        # Scalar and batched lookups by index (burma14 node IDs start at 1)
+        self.assertEqual(my_instance.w(0, 1), 153)
+        self.assertIsInstance(my_instance.w(0, 1), int)
+        np.testing.assert_array_equal(my_instance.weights([0, 1, 0], [1, 0, 7]), [153, 153, 70])
+        self.assertEqual(my_instance.weights([0], [1]).dtype, np.int64)
+
+        # Node sequences and index arrays give the same sequence weight
+        nodes = my_instance.nodes + [my_instance.nodes[0]]
+        indices = np.arange(my_instance.number_of_stops)
+        self.assertEqual(get_sequence_weight(instance=my_instance, sequence=nodes),
+                         get_sequence_weight(instance=my_instance, sequence=indices, add_return_to_start=True))
+        self.assertEqual(get_sequence_weight(instance=my_instance, sequence=indices, add_return_to_start=True),
+                         sum(my_instance.w(i, (i + 1) % 14) for i in range(14)))
+
+        # Large instances evaluate tours from their coordinates without building the distance matrix
+        from pytsp.methods.nearest_neighbor import NearestNeighbor
+        from pytsp.structures import distances
+        from pytsp.structures.Tour import Tour
+        large_instance = create_instance_from_file(name='pla85900')
+        route = np.append(np.arange(large_instance.number_of_stops), 0)
+        tour = Tour(instance=large_instance, solution_method=NearestNeighbor(), sequence=route)
+        coordinates = large_instance.coordinates
+        self.assertEqual(tour.get_total_weight(), distances.compute_pairwise_weights(large_instance.edge_weight_type, coordinates[route[:-1]], coordinates[route[1:]]).sum())
+        self.assertEqual(large_instance.w(0, 1), large_instance.weights([0], [1])[0])
+        self.assertIsNone(large_instance._distance_matrix)
+
+    def test_nearest_neighbor_candidates(self):
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.structures import candidates
+
+        # GEO (sphere embedding), EUC_2D (KD-tree) and EXPLICIT (partial argsort) instances
+        for name in ["burma14", "pr1002", "gr24"]:
+            with self.subTest(instance=name):
+                my_instance = create_instance_from_file(name=name)
+                candidate_lists = my_instance.get_candidates(k=8)
+                self.assertEqual(candidate_lists.shape, (my_instance.number_of_stops, 8))
+                self.assertEqual(candidate_lists.dtype, np.int32)
+                self.assertIs(candidate_lists, my_instance.get_candidates(k=8))
+
+                # Candidate weights equal the 8 smallest weights of each row (excluding the node itself)
+                distance_matrix = np.asarray(my_instance.get_distance_matrix()).astype(np.float64)
+                np.fill_diagonal(distance_matrix, np.inf)
+                expected = np.sort(distance_matrix, axis=1)[:, :8]
+                rows = np.arange(my_instance.number_of_stops)[:, np.newaxis]
+                np.testing.assert_array_equal(distance_matrix[rows, candidate_lists], expected)
+
+                # The exact row-wise computation agrees with the spatial index
+                np.testing.assert_array_equal(distance_matrix[rows, candidates.nearest_by_rows(my_instance, k=8)], expected)
+
+    def test_quadrant_and_delaunay_candidates(self):
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.structures import candidates
+
+        # Clustered instance
+        my_instance = create_instance_from_file(name='fl417')
+        n = my_instance.number_of_stops
+        rows = np.arange(n)[:, np.newaxis]
+        distance_matrix = np.asarray(my_instance.get_distance_matrix())
+
+        for method in ["quadrant", "delaunay"]:
+            with self.subTest(method=method):
+                candidate_lists = my_instance.get_candidates(k=12, method=method)
+                self.assertEqual(candidate_lists.shape, (n, 12))
+
+                # No node is its own candidate, no candidate repeats, rows are sorted by weight
+                self.assertFalse((candidate_lists == rows).any())
+                self.assertTrue(all(len(set(row)) == 12 for row in candidate_lists))
+                self.assertTrue((np.diff(distance_matrix[rows, candidate_lists], axis=1) >= 0).all())
+
+        # Every non-empty quadrant contributes a candidate (quadrants break coordinate ties by node index)
+        quadrant_lists = my_instance.get_candidates(k=12, method="quadrant")
+        rank_x, rank_y = candidates._coordinate_ranks(my_instance.coordinates)
+        for i in range(0, n, 20):
+            for left in [True, False]:
+                for below in [True, False]:
+                    in_quadrant = ((rank_x < rank_x[i]) == left) & ((rank_y < rank_y[i]) == below) & (np.arange(n) != i)
+                    if in_quadrant.any():
+                        self.assertTrue(in_quadrant[quadrant_lists[i]].any())
+
+        # The KD-tree preselection matches the exact row-wise computation
+        exact_lists = candidates.quadrant_candidates(my_instance, k=12, spatial_index=False)
+        np.testing.assert_array_equal(np.sort(distance_matrix[rows, quadrant_lists], axis=1),
+                                      np.sort(distance_matrix[rows, exact_lists], axis=1))
+
+        # Nodes with at most 12 Delaunay neighbors keep all of them
+        from scipy.spatial import Delaunay
+        indptr, indices = Delaunay(my_instance.coordinates, qhull_options="QJ").vertex_neighbor_vertices
+        delaunay_lists = my_instance.get_candidates(k=12, method="delaunay")
+        for i in range(n):
+            neighbors = indices[indptr[i]:indptr[i + 1]]
+            if len(neighbors) <= 12:
+                self.assertLessEqual(set(neighbors), set(delaunay_lists[i]))
+
+    def test_alpha_nearness_candidates(self):
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.structures import held_karp
+
+        # The optimal tour of berlin52 has length 7542
+        my_instance = create_instance_from_file(name='berlin52')
+        n = my_instance.number_of_stops
+        lower_bound, pi = my_instance.get_held_karp_bound()
+        self.assertLessEqual(lower_bound, 7542 + 1e-6)
+        self.assertGreaterEqual(lower_bound, 0.99 * 7542)
+
+        candidate_lists = my_instance.get_candidates(k=5, method="alpha")
+        self.assertEqual(candidate_lists.shape, (n, 5))
+        self.assertFalse((candidate_lists == np.arange(n)[:, np.newaxis]).any())
+
+        # Alpha values are non-negative, sorted within each candidate row and 0 for all 1-tree edges
+        tree = held_karp.minimum_one_tree(my_instance, pi)
+        alpha = held_karp.alpha_rows(my_instance, tree, pi, np.arange(n))
+        self.assertTrue((alpha >= 0).all())
+        self.assertTrue((np.diff(np.take_along_axis(alpha, candidate_lists.astype(np.intp), axis=1), axis=1) >= 0).all())
+        children = tree.order[1:]
+        np.testing.assert_array_equal(alpha[children, tree.dad[children]], 0)
+        np.testing.assert_array_equal(alpha[0, tree.special], 0)
+
+        # Alpha equals the transformed weight minus the largest tree weight on the path (brute force for node 5)
+        transformed = np.asarray(my_instance.get_distance_matrix(), dtype=np.float64) + (pi[:, np.newaxis] + pi[np.newaxis, :])
+        for j in range(1, n):
+            path_i, path_j = [5], [j]
+            while path_i[-1] != tree.root:
+                path_i.append(tree.dad[path_i[-1]])
+            while path_j[-1] != tree.root:
+                path_j.append(tree.dad[path_j[-1]])
+            while len(path_i) > 1 and len(path_j) > 1 and path_i[-2] == path_j[-2]:
+                path_i.pop()
+                path_j.pop()
+            path_weights = [tree.dad_weight[x] for x in path_i[:-1] + path_j[:-1]]
+            if j != 5:
+                self.assertAlmostEqual(alpha[5, j], max(transformed[5, j] - max(path_weights), 0))
+
+    def test_native_tsplib_parser(self):
+        import numpy as np
+        import tsplib95
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.structures.tsplib import expand_edge_weights
+
+        # The tsplib95 object is only parsed on demand
+        my_instance = create_instance_from_file(name='gr24')
+        self.assertIsNone(my_instance.tsplib_data._problem)
+        self.assertEqual(my_instance.get_weight_via_id(source_id=0, target_id=1), 257)
+        self.assertIsNone(my_instance.tsplib_data._problem)
+        self.assertEqual(my_instance.TSPLIB.get_weight(0, 1), 257)
+
+        # Every EDGE_WEIGHT_FORMAT is expanded like tsplib95 does
+        n = 5
+        for edge_weight_format, count in [("FULL_MATRIX", 25), ("UPPER_ROW", 10), ("LOWER_ROW", 10), ("UPPER_DIAG_ROW", 15),
+                                          ("LOWER_DIAG_ROW", 15), ("UPPER_COL", 10), ("LOWER_COL", 10), ("UPPER_DIAG_COL", 15),
+                                          ("LOWER_DIAG_COL", 15)]:
+            with self.subTest(edge_weight_format=edge_weight_format):
+                values = np.arange(1, count + 1)
+                problem = tsplib95.parse(f"NAME: test\nTYPE: TSP\nDIMENSION: {n}\nEDGE_WEIGHT_TYPE: EXPLICIT\n"
+                                         f"EDGE_WEIGHT_FORMAT: {edge_weight_format}\nEDGE_WEIGHT_SECTION\n"
+                                         f"{' '.join(map(str, values))}\nEOF\n")
+                expected = [[problem.get_weight(i, j) for j in range(n)] for i in range(n)]
+                np.testing.assert_array_equal(expand_edge_weights(values, edge_weight_format, n), expected)
+
+    def test_instance_cache(self):
+        import shutil
+        import tempfile
+        from pathlib import Path
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.structures.InstanceCache import InstanceCache
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # The first load parses the file and fills the cache
+            first_instance = create_instance_from_file(name='burma14', cache_dir=cache_dir)
+            distance_matrix = first_instance.get_distance_matrix()
+            candidate_lists = first_instance.get_candidates(k=5)
+            self.assertNotIsInstance(first_instance.coordinates, np.memmap)
+
+            # The second load memory-maps the arrays
+            second_instance = create_instance_from_file(name='burma14', cache_dir=cache_dir)
+            self.assertIsInstance(second_instance.coordinates, np.memmap)
+            self.assertIsInstance(second_instance.get_distance_matrix(), np.memmap)
+            self.assertIsInstance(second_instance.get_candidates(k=5), np.memmap)
+            np.testing.assert_array_equal(second_instance.coordinates, first_instance.coordinates)
+            np.testing.assert_array_equal(second_instance.get_distance_matrix(), distance_matrix)
+            np.testing.assert_array_equal(second_instance.get_candidates(k=5), candidate_lists)
+            self.assertEqual(second_instance.get_weight_via_id(source_id=1, target_id=2), 153)
+            self.assertEqual([n.id for n in second_instance.nodes], [n.id for n in first_instance.nodes])
+
+            # Entries are keyed by the file content
+            source_path = Path(__file__).resolve().parent / "pytsp" / "data" / "TSPLIB" / "burma14.tsp"
+            copied_path = Path(cache_dir) / "burma14.tsp"
+            shutil.copy(source_path, copied_path)
+            self.assertEqual(InstanceCache(copied_path, cache_dir).directory, InstanceCache(source_path, cache_dir).directory)
+            with open(copied_path, "a") as file:
+                file.write("\n")
+            self.assertNotEqual(InstanceCache(copied_path, cache_dir).directory, InstanceCache(source_path, cache_dir).directory)
+
+    def test_shared_instance(self):
+        import multiprocessing
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.structures.SharedInstance import SharedInstance
+
+        instance = create_instance_from_file(name='burma14')
+        candidate_lists = instance.get_candidates(k=5)
+        n = instance.number_of_stops
+        expected_weight = sum(instance.w(i, (i + 1) % n) for i in range(n))
+
+        with SharedInstance.publish(instance) as handle:
+            # Attached instances are read-only views of the shared segments
+            attached = handle.attach()
+            self.assertFalse(attached.get_distance_matrix().flags.writeable)
+            np.testing.assert_array_equal(attached.get_distance_matrix(), instance.get_distance_matrix())
+            np.testing.assert_array_equal(attached.coordinates, instance.coordinates)
+            np.testing.assert_array_equal(attached.get_candidates(k=5), candidate_lists)
+            self.assertEqual(attached.get_weight_via_id(source_id=1, target_id=2), 153)
+            self.assertEqual([node.id for node in attached.nodes], [node.id for node in instance.nodes])
+
+            # Workers attach by name (the handle is all that is pickled)
+            with multiprocessing.get_context("spawn").Pool(2) as pool:
+                results = pool.map(shared_tour_weight, [handle, handle])
+            for weight, worker_candidates in results:
+                self.assertEqual(weight, expected_weight)
+                self.assertEqual(worker_candidates, candidate_lists.tolist())
+
+        # Packed distance matrices are shared as well
+        packed_instance = create_instance_from_file(name='burma14', distance_storage="packed")
+        with SharedInstance.publish(packed_instance) as handle:
+            attached = handle.attach()
+            self.assertEqual(attached.get_weight_via_id(source_id=1, target_id=2), 153)
+            self.assertFalse(attached.get_distance_matrix().data.flags.writeable)
+
+        # Segments stay mapped while attached instances are alive, and cannot be closed until they are dropped
+        self.assertIs(attached.shared, handle)
+        self.assertEqual(attached.w(0, 1), 153)
+        self.assertRaises(BufferError, handle.close)
+        del attached
+        handle.close()
+
+    def test_instance_subset(self):
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.structures.DistanceMatrix import SubsetMatrix
+
+        instance = create_instance_from_file(name='burma14')
+        distance_matrix = instance.get_distance_matrix()
+
+        # Slices are views of coordinates and matrix
+        sub_instance = instance.subset(slice(2, 9))
+        self.assertEqual(sub_instance.number_of_stops, 7)
+        self.assertTrue(np.shares_memory(sub_instance.get_distance_matrix(), distance_matrix))
+        self.assertTrue(np.shares_memory(sub_instance.coordinates, instance.coordinates))
+        self.assertEqual(sub_instance.index_to_id, instance.index_to_id[2:9])
+
+        # Index arrays remap into the parent's matrix
+        indices = np.array([13, 0, 7, 3, 5])
+        sub_instance = instance.subset(indices)
+        self.assertIsInstance(sub_instance.get_distance_matrix(), SubsetMatrix)
+        np.testing.assert_array_equal(np.asarray(sub_instance.get_distance_matrix()), distance_matrix[np.ix_(indices, indices)])
+        self.assertEqual(sub_instance.w(0, 2), instance.w(13, 7))
+        self.assertEqual(sub_instance.get_weight_via_id(source_id=14, target_id=1), instance.get_weight_via_id(source_id=14, target_id=1))
+        np.testing.assert_array_equal(sub_instance.to_parent_indices([4, 1, 0]), [5, 0, 13])
+        self.assertEqual(len(sub_instance.get_candidates(k=2)), 5)
+
+        # Explicit instances share their matrix as well, instances without matrix compute a small one
+        explicit_instance = create_instance_from_file(name='bays29')
+        sub_instance = explicit_instance.subset([4, 2, 28])
+        self.assertEqual(sub_instance.w(1, 2), explicit_instance.w(2, 28))
+        self.assertIn("EDGE_WEIGHT_SECTION", sub_instance.to_tsplib())
+
+        # Triangular formats are exported from the gathered weights as well (gr24 is LOWER_DIAG_ROW)
+        import tsplib95
+        triangular_instance = create_instance_from_file(name='gr24')
+        sub_instance = triangular_instance.subset([0, 3, 5])
+        problem = tsplib95.parse(sub_instance.to_tsplib())
+        self.assertEqual(problem.edge_weight_format, "LOWER_DIAG_ROW")
+        w = triangular_instance.w
+        self.assertEqual(sum(problem.edge_weights, []), [0, w(0, 3), 0, w(0, 5), w(3, 5), 0])
+        self.assertEqual(sub_instance.TSPLIB.dimension, 3)
+
+        large_instance = create_instance_from_file(name='pr1002')
+        sub_instance = large_instance.subset(np.arange(0, 1002, 10))
+        self.assertIsNone(large_instance._distance_matrix)
+        self.assertEqual(sub_instance.get_distance_matrix().shape, (101, 101))
+        self.assertEqual(sub_instance.w(3, 7), large_instance.get_distance_matrix()[30, 70].item())
+
+    def test_reorder_instance(self):
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.structures.ordering import hilbert_keys, morton_keys
+        from pytsp.structures.Tour import get_sequence_weight
+        from pytsp.methods.nearest_neighbor import NearestNeighbor
+
+        # Consecutive points on the curves
+        grid = np.array([[x, y] for x in range(4) for y in range(4)], dtype=float)
+        curve = grid[np.argsort(hilbert_keys(grid, bits=2))]
+        self.assertTrue(np.all(np.abs(np.diff(curve, axis=0)).sum(axis=1) == 1))
+        square = np.array([[0, 0], [1, 0], [0, 1], [1, 1]], dtype=float)
+        np.testing.assert_array_equal(morton_keys(square, bits=1), [0, 1, 2, 3])
+
+        instance = create_instance_from_file(name='berlin52')
+        distance_matrix = instance.get_distance_matrix()
+        candidate_lists = instance.get_candidates(k=5)
+
+        for order in ("hilbert", "morton"):
+            reordered = instance.reorder(order)
+            permutation = reordered.parent_indices
+            self.assertEqual(sorted(permutation.tolist()), list(range(52)))
+            np.testing.assert_array_equal(reordered.get_distance_matrix(), distance_matrix[np.ix_(permutation, permutation)])
+            np.testing.assert_array_equal(reordered.coordinates, instance.coordinates[permutation])
+            np.testing.assert_array_equal(reordered.to_parent_indices(reordered.get_candidates(k=5)), candidate_lists[permutation])
+
+            # Tours keep the TSPLIB IDs and their weight in the original instance
+            tour = NearestNeighbor().solve(instance=reordered)
+            self.assertEqual(tour.get_total_weight(), get_sequence_weight(instance=instance, sequence=tour.sequence))
+
+        # Hilbert order puts nearby nodes into nearby rows (much shorter tour along the indices)
+        reordered = instance.reorder("hilbert")
+        identity_weight = lambda inst: inst.weights(np.arange(52), (np.arange(52) + 1) % 52).sum()
+        self.assertLess(identity_weight(reordered), identity_weight(instance) / 2)
+
+    def test_collapse_duplicates(self):
+        from pytsp.structures.Instance import create_instance_from_file, create_instance_from_cost_matrix
+        from pytsp.methods.nearest_neighbor import NearestNeighbor
+
+        # a280 has two nodes with identical coordinates
+        instance = create_instance_from_file(name='a280')
+        reduced = instance.collapse_duplicates()
+        self.assertEqual(reduced.number_of_stops, 279)
+        self.assertEqual(sum(len(nodes) for nodes in reduced.duplicates.values()), 1)
+
+        # The expanded tour visits every node once and has the same weight
+        tour = NearestNeighbor().solve(instance=reduced)
+        expanded_tour = reduced.expand_tour(tour)
+        self.assertIs(expanded_tour.instance, instance)
+        self.assertEqual(len(expanded_tour.sequence), instance.number_of_stops + 1)
+        self.assertEqual(sorted(node.id for node in expanded_tour.sequence[:-1]), sorted(instance.index_to_id))
+        self.assertEqual(expanded_tour.get_total_weight(), tour.get_total_weight())
+
+        # Instances without duplicates are not reduced (GEO weights identical points of ali535 1 apart)
+        for name in ("burma14", "ali535"):
+            instance = create_instance_from_file(name=name)
+            self.assertIs(instance.collapse_duplicates(), instance)
+
+        # Explicit instances compare matrix rows and columns
+        cost_matrix = [[0, 0, 3, 4], [0, 0, 3, 4], [2, 2, 0, 5], [1, 1, 6, 0]]
+        instance = create_instance_from_cost_matrix(name="duplicates", cost_matrix=cost_matrix)
+        reduced = instance.collapse_duplicates()
+        self.assertEqual(reduced.index_to_id, [0, 2, 3])
+        self.assertEqual(reduced.duplicates, {0: [1]})
+        cost_matrix[3][1] = 2
+        instance = create_instance_from_cost_matrix(name="no_duplicates", cost_matrix=cost_matrix)
+        self.assertIs(instance.collapse_duplicates(), instance)
+
+    def test_lazy_imports(self):
+        import subprocess
+        import sys
+        from pathlib import Path
+
+        # Importing the solvers must not load plotting, pandas or optional solver backends
+        code = ("import sys\n"
+                "import pytsp.methods.nearest_neighbor, pytsp.methods.k_opt, pytsp.methods.christofides\n"
+                "import pytsp.methods.lk_heuristic, pytsp.methods.pyVRP, pytsp.structures.Experiment\n"
+                "print(*[name for name in ('pandas', 'plotly', 'tsplib95', 'networkx', 'pyvrp', 'lk_heuristic', 'scipy') if name in sys.modules])")
+        output = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).resolve().parent,
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.split(), [])
+
+    def test_array_backed_tour(self):
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.structures.Tour import Tour, get_sequence_weight
+        from pytsp.methods.nearest_neighbor import NearestNeighbor
+
+        instance = create_instance_from_file(name='burma14')
+        tour = NearestNeighbor().solve(instance=instance)
+
+        # The tour is an int32 index array, the nodes are a view of it
+        self.assertEqual(tour.indices.dtype, np.int32)
+        self.assertEqual(tour.indices.nbytes, 4 * 15)
+        self.assertFalse(tour.indices.flags.writeable)
+        self.assertEqual([node.id for node in tour.sequence], instance.node_ids[tour.indices].tolist())
+        self.assertIs(tour.sequence[-1], tour.sequence[0])
+        self.assertEqual(len(tour.sequence[:-1]), 14)
+        self.assertEqual(len(tour.sequence + [tour.sequence[0]]), 16)
+
+        # Tours from nodes and from indices are the same
+        same_tour = Tour(instance=instance, solution_method=tour.solution_method, sequence=list(tour.sequence))
+        np.testing.assert_array_equal(same_tour.indices, tour.indices)
+
+        # The weight is cached until a new sequence is assigned
+        self.assertEqual(tour.get_total_weight(), 4048)
+        self.assertEqual(tour._total_weight, 4048)
+        str(tour)
+        tour.sequence = np.append(np.arange(14), 0)
+        self.assertIsNone(tour._total_weight)
+        self.assertEqual(tour.get_total_weight(), get_sequence_weight(instance=instance, sequence=instance.nodes, add_return_to_start=True))
+
+    def test_move_deltas(self):
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.structures.Tour import get_sequence_weight
+        from pytsp.structures import moves
+        from pytsp.structures.moves import OptCase
+        from pytsp.methods.k_opt import possible_segments, get_solution_cost_change, reverse_segments
+
+        instance = create_instance_from_file(name='berlin52')
+        n = instance.number_of_stops
+        rng = np.random.default_rng(0)
+        weight = lambda route: get_sequence_weight(instance=instance, sequence=route, add_return_to_start=True)
+
+        def check(delta_function, apply_function, *args):
+            route = rng.permutation(n)
+            before = weight(route)
+            delta = delta_function(instance, route, *args)
+            apply_function(route, *args)
+            self.assertEqual(sorted(route.tolist()), list(range(n)))
+            self.assertEqual(weight(route) - before, delta)
+
+        for _ in range(200):
+            i, j = sorted(rng.choice(n, size=2, replace=False).tolist())
+            check(moves.two_opt_delta, moves.apply_two_opt, i, j)
+            check(moves.swap_delta, moves.apply_swap, i, j)
+            check(moves.insertion_delta, moves.apply_insertion, i, j)
+            check(moves.double_bridge_delta, moves.apply_double_bridge, *sorted(rng.choice(np.arange(1, n), size=3, replace=False).tolist()))
+
+            # Or-opt segments before or after their new position, both orientations
+            length = int(rng.integers(1, 4))
+            i = int(rng.integers(0, n - length + 1))
+            j = int(rng.choice([p for p in range(n) if not i - 1 <= p <= i + length - 1 and not (i == 0 and p == n - 1)]))
+            for reverse in (False, True):
+                check(moves.or_opt_delta, moves.apply_or_opt, i, length, j, reverse)
+
+        # Inserting a node after its predecessor is a no-op, also across the end of the route
+        for i, j in [(0, n - 1), (5, 4), (7, 7)]:
+            route = rng.permutation(n)
+            self.assertEqual(moves.insertion_delta(instance, route, i, j), 0)
+            before = route.copy()
+            moves.apply_insertion(route, i, j)
+            np.testing.assert_array_equal(route, before)
+
+        # Adjacent swaps (also across the end of the route)
+        check(moves.swap_delta, moves.apply_swap, 0, n - 1)
+        check(moves.swap_delta, moves.apply_swap, 5, 6)
+
+        # 3-opt matches the node-based implementation of k_opt
+        segments = list(possible_segments(n))
+        for index in rng.choice(len(segments), size=50, replace=False):
+            i, j, k = segments[index]
+            for case in OptCase:
+                route = rng.permutation(n)
+                nodes = [instance.nodes[x] for x in route]
+                self.assertEqual(moves.three_opt_delta(instance, route, case, i, j, k), -get_solution_cost_change(instance, nodes, case, i, j, k))
+                moves.apply_three_opt(route, case, i, j, k)
+                self.assertEqual([instance.nodes[x] for x in route], reverse_segments(nodes, case, i, j, k))
+
+    def test_array_tour(self):
+        import numpy as np
+        from pytsp.structures.ArrayTour import ArrayTour
+        from pytsp.structures import moves
+        from pytsp.structures.moves import OptCase
+        from pytsp.methods.k_opt import possible_segments
+
+        n = 11
+        rng = np.random.default_rng(0)
+        route = rng.permutation(n)
+        tour = ArrayTour(route)
+        segments = list(possible_segments(n))
+
+        # Every move leaves the tour exactly like the same move on a route array, even when the complement is reversed
+        for _ in range(300):
+            i, j = sorted(rng.choice(n, size=2, replace=False).tolist())
+            move = int(rng.integers(4))
+            if move == 0:
+                moves.apply_two_opt(route, i, j)
+                moves.apply_two_opt(tour, i, j)
+            elif move == 1:
+                moves.apply_swap(route, i, j)
+                moves.apply_swap(tour, i, j)
+            elif move == 2 and j not in (i, i - 1):
+                moves.apply_insertion(route, i, j)
+                moves.apply_insertion(tour, i, j)
+            else:
+                i, j, k = segments[int(rng.integers(len(segments)))]
+                case = list(OptCase)[int(rng.integers(len(OptCase)))]
+                moves.apply_three_opt(route, case, i, j, k)
+                moves.apply_three_opt(tour, case, i, j, k)
+
+            self.assertEqual(tour.route().tolist(), route.tolist())
+            for p, a in enumerate(route.tolist()):
+                self.assertEqual(tour.position(a), p)
+                self.assertEqual(tour.succ(a), route[(p + 1) % n])
+                self.assertEqual(tour.pred(a), route[p - 1])
+
+        # between() follows the tour direction (and wraps around the end)
+        a, b, c = route[n - 2], route[0], route[2]
+        self.assertTrue(tour.between(a, b, c))
+        self.assertFalse(tour.between(c, b, a))
+
+        # Reversing a long path only moves the shorter complement
+        tour.two_opt_move(route[0], route[1], route[n - 2], route[n - 1])
+        moves.apply_two_opt(route, 1, n - 2)
+        self.assertEqual(tour.route().tolist(), route.tolist())
+
+    def test_two_level_list_tour(self):
+        import numpy as np
+        from pytsp.structures.ArrayTour import ArrayTour
+        from pytsp.structures.TwoLevelListTour import TwoLevelListTour, create_working_tour, TWO_LEVEL_MIN_NODES
+        from pytsp.structures import moves
+
+        n = 50
+        rng = np.random.default_rng(1)
+        route = rng.permutation(n)
+
+        # Small segments, so that reversals split them and the segments are rebuilt several times
+        tour = TwoLevelListTour(route, segment_size=4)
+
+        for _ in range(300):
+            i, j = sorted(rng.choice(n, size=2, replace=False).tolist())
+            move = int(rng.integers(4))
+            if move == 0:
+                # Cyclic reversal (wraps around the end for j < i)
+                i, j = rng.integers(n, size=2).tolist()
+                positions = (i + np.arange((j - i) % n + 1)) % n
+                route[positions] = route[positions[::-1]]
+                tour.reverse(i, j)
+            elif move == 1:
+                moves.apply_two_opt(route, i, j)
+                moves.apply_two_opt(tour, i, j)
+            elif move == 2 and j > i + 2:
+                moves.apply_or_opt(route, i, 2, j, True)
+                moves.apply_or_opt(tour, i, 2, j, True)
+            elif 0 < i < j - 1 < n - 2:
+                moves.apply_double_bridge(route, i, j, j + 1)
+                moves.apply_double_bridge(tour, i, j, j + 1)
+
+            self.assertEqual(tour.route().tolist(), route.tolist())
+            self.assertEqual([tour[p] for p in range(n)], route.tolist())
+            for p, a in enumerate(route.tolist()):
+                self.assertEqual(tour.position(a), p)
+                self.assertEqual(tour.succ(a), route[(p + 1) % n])
+                self.assertEqual(tour.pred(a), route[p - 1])
+
+        # Reversals only split segments until they are rebuilt
+        self.assertLessEqual(tour._count, tour._max_segments)
+
+        # Large routes use the two-level list as working representation
+        self.assertIsInstance(create_working_tour(np.arange(100)), ArrayTour)
+        self.assertIsInstance(create_working_tour(np.arange(TWO_LEVEL_MIN_NODES)), TwoLevelListTour)
+
     def test_solve_christofides(self):
         from pytsp.structures.Instance import create_instance_from_file
         from pytsp.methods.christofides import Christofidesx
@@ -95,9 +788,24 @@ class UnitTests(unittest.TestCase):
         tour = my_solver.solve(instance=my_instance)
         self.assertEqual(tour.get_total_weight(), 3336)
 
+        # Moves pruned by candidate lists give a valid tour that is no longer than the start tour
+        from pytsp.structures.Tour import get_sequence_weight
+        from pytsp.methods.nearest_neighbor import NearestNeighbor
+        my_instance = create_instance_from_file(name='berlin52')
+        start_tour = NearestNeighbor(logging_level=50).solve(instance=my_instance)
+        tour = ThreeOpt(logging_level=50, max_runtime_in_sec=10, k=8).solve(instance=my_instance, tour=start_tour)
+        self.assertEqual(sorted(tour.indices[:-1].tolist()), list(range(my_instance.number_of_stops)))
+        self.assertEqual(tour.get_total_weight(), get_sequence_weight(instance=my_instance, sequence=tour.indices))
+        self.assertLess(tour.get_total_weight(), start_tour.get_total_weight())
+
     def test_solve_two_opt(self):
-        from pytsp.structures.Instance import create_instance_from_file
-        from pytsp.methods.k_opt import TwoOpt
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file, create_instance_from_cost_matrix
+        from pytsp.structures.Tour import get_sequence_weight
+        from pytsp.structures.ArrayTour import ArrayTour
+        from pytsp.structures import moves
+        from pytsp.methods.k_opt import TwoOpt, candidate_pairs
+        from pytsp.methods.nearest_neighbor import NearestNeighbor
 
         # Load fromt he pytsp/data/TSPLIB folder
         my_instance = create_instance_from_file(name='burma14')
@@ -106,6 +814,34 @@ class UnitTests(unittest.TestCase):
         my_solver = TwoOpt(logging_level=50, max_runtime_in_sec=3)
         tour = my_solver.solve(instance=my_instance)
         self.assertEqual(tour.get_total_weight(), 4040)
+
+        # Moves pruned by candidate lists give a valid tour that no candidate move improves
+        berlin52 = create_instance_from_file(name='berlin52')
+        start_tour = NearestNeighbor(logging_level=50).solve(instance=berlin52)
+        tour = TwoOpt(logging_level=50, max_runtime_in_sec=10, k=8).solve(instance=berlin52, tour=start_tour)
+        self.assertEqual(sorted(tour.indices[:-1].tolist()), list(range(berlin52.number_of_stops)))
+        self.assertEqual(tour.get_total_weight(), get_sequence_weight(instance=berlin52, sequence=tour.indices))
+        self.assertLess(tour.get_total_weight(), start_tour.get_total_weight())
+        route = ArrayTour(tour.indices[:-1])
+        self.assertTrue(all(moves.two_opt_delta(berlin52, route, i, j) >= 0 for i, j in candidate_pairs(berlin52, route, berlin52.get_candidates(k=8))))
+
+        # Asymmetric instances: reversals are evaluated exactly, so 2-opt never ends worse than its start
+        rng = np.random.default_rng(1)
+        for _ in range(10):
+            cost_matrix = rng.integers(1, 100, size=(12, 12))
+            np.fill_diagonal(cost_matrix, 0)
+            asymmetric_instance = create_instance_from_cost_matrix(name="asymmetric12", cost_matrix=cost_matrix.tolist())
+            self.assertFalse(asymmetric_instance.is_symmetric())
+            start_tour = NearestNeighbor(logging_level=50).solve(instance=asymmetric_instance)
+            tour = my_solver.solve(instance=asymmetric_instance, tour=start_tour)
+            self.assertLessEqual(tour.get_total_weight(), start_tour.get_total_weight())
+
+            route = rng.permutation(12)
+            for i, j in [(0, 11), (0, 10), (1, 11), (3, 7)]:
+                before = get_sequence_weight(instance=asymmetric_instance, sequence=route, add_return_to_start=True)
+                delta = moves.two_opt_delta(asymmetric_instance, route, i, j, symmetric=False)
+                moves.apply_two_opt(route, i, j)
+                self.assertEqual(get_sequence_weight(instance=asymmetric_instance, sequence=route, add_return_to_start=True) - before, delta)
     
     def test_solve_lk_heuristic(self):
         from pytsp.structures.Instance import create_instance_from_file
@@ -124,6 +860,39 @@ class UnitTests(unittest.TestCase):
         tour = my_solver.solve(instance=my_instance)
         self.assertIsInstance(tour.get_total_weight(), int) # Assert only the type, since LKHeuristic's inherent randomness may affect the value.
 
+    def test_solve_greedy_edge(self):
+        from pytsp.structures.Instance import create_instance_from_file, create_instance_from_cost_matrix
+        from pytsp.methods.greedy_edge import GreedyEdge
+
+        # Load fromt he pytsp/data/TSPLIB folder
+        my_instance = create_instance_from_file(name='burma14')
+
+        # Solve instance
+        my_solver = GreedyEdge(logging_level=50)
+        tour = my_solver.solve(instance=my_instance)
+        self.assertEqual(tour.get_total_weight(), 3889)
+
+        # With all edges as candidates, the tour is the one of the textbook greedy matching over all sorted edges
+        instance = create_instance_from_file(name='berlin52')
+        n = instance.number_of_stops
+        edges = sorted((instance.w(u, v), u, v) for u in range(n) for v in range(u + 1, n))
+        degree, fragment, weight, count = [0] * n, list(range(n)), 0, 0
+        for w, u, v in edges:
+            if degree[u] < 2 and degree[v] < 2 and fragment[u] != fragment[v]:
+                old, new = fragment[u], fragment[v]
+                fragment = [new if f == old else f for f in fragment]
+                degree[u], degree[v], weight, count = degree[u] + 1, degree[v] + 1, weight + w, count + 1
+        end_u, end_v = [i for i in range(n) if degree[i] < 2]
+        self.assertEqual(count, n - 1)
+
+        tour = GreedyEdge(logging_level=50, k=n - 1).solve(instance=instance)
+        self.assertEqual(sorted(tour.indices[:-1].tolist()), list(range(n)))
+        self.assertEqual(tour.get_total_weight(), weight + instance.w(end_u, end_v))
+
+        # Undirected edges cannot represent asymmetric weights
+        asymmetric_instance = create_instance_from_cost_matrix(name="asymmetric3", cost_matrix=[[0, 1, 2], [3, 0, 4], [2, 4, 0]])
+        self.assertRaises(ValueError, my_solver.solve, asymmetric_instance)
+
     def test_solve_nearest_neighbor(self):
         from pytsp.structures.Instance import create_instance_from_file
         from pytsp.methods.nearest_neighbor import NearestNeighbor
@@ -135,7 +904,80 @@ class UnitTests(unittest.TestCase):
         my_solver = NearestNeighbor(logging_level=50)
         tour = my_solver.solve(instance=my_instance)
         self.assertEqual(tour.get_total_weight(), 4048)
-    
+
+    def test_nearest_neighbor_candidate_lookup(self):
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.methods.nearest_neighbor import NearestNeighbor
+
+        # a280 has many equal distances, which are broken by the lowest index
+        instance = create_instance_from_file(name='a280')
+        route, remaining = [0], set(range(1, instance.number_of_stops))
+        while remaining:
+            route.append(min(remaining, key=lambda j: (instance.w(route[-1], j), j)))
+            remaining.remove(route[-1])
+
+        tour = NearestNeighbor(logging_level=50).solve(instance=instance)
+        self.assertEqual(tour.indices[:-1].tolist(), route)
+
+        # Looking at the candidates first yields the same tour
+        for k in (1, 5, instance.number_of_stops - 1):
+            self.assertEqual(NearestNeighbor(logging_level=50, k=k).solve(instance=instance).indices[:-1].tolist(), route)
+
+    def test_multi_start_nearest_neighbor(self):
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.methods.nearest_neighbor import NearestNeighbor, nearest_neighbor_routes
+
+        instance = create_instance_from_file(name='berlin52')
+        n = instance.number_of_stops
+
+        # The batched kernel builds the same route as a single start
+        routes = nearest_neighbor_routes(instance, [0, 7, 0])
+        self.assertEqual(routes[0].tolist(), NearestNeighbor(logging_level=50).solve(instance=instance).indices[:-1].tolist())
+        self.assertEqual(routes[2].tolist(), routes[0].tolist())
+        self.assertEqual(routes[1, 0], 7)
+
+        # The top tours over all starts, in a process pool and in this process
+        routes = nearest_neighbor_routes(instance, range(n))
+        single_starts = sorted(sum(instance.w(route[i - 1], route[i]) for i in range(n)) for route in routes.tolist())
+        for processes in (1, 2):
+            solver = NearestNeighbor(logging_level=50, starts="all", processes=processes, batch_size=16)
+            tours = solver.solve_multi_start(instance=instance, top_k=3)
+            self.assertEqual([tour.get_total_weight() for tour in tours], single_starts[:3])
+            self.assertEqual(solver.solve(instance=instance).get_total_weight(), single_starts[0])
+            self.assertLessEqual(single_starts[0], NearestNeighbor(logging_level=50).solve(instance=instance).get_total_weight())
+
+    def test_spatial_grid(self):
+        import numpy as np
+        from pytsp.structures.Instance import create_instance_from_file
+        from pytsp.structures.SpatialGrid import SpatialGrid
+        from pytsp.methods.nearest_neighbor import NearestNeighbor
+
+        # Random queries match a scan of the matrix row while nodes are removed (and the grid is rebuilt)
+        instance = create_instance_from_file(name='att532')
+        matrix = np.asarray(instance.get_distance_matrix()).astype(np.float64)
+        grid = SpatialGrid(instance)
+        rng = np.random.default_rng(0)
+        for node in rng.permutation(instance.number_of_stops)[:-1].tolist():
+            grid.remove(node)
+            query = int(rng.integers(instance.number_of_stops))
+            row = np.where(grid.remaining, matrix[query], np.inf)
+            row[query] = np.inf
+            self.assertEqual(grid.nearest(query), row.argmin())
+        self.assertEqual(len(grid), 1)
+
+        # The spatial index yields the same tour as scanning all nodes
+        for name in ('a280', 'pr1002'):
+            instance = create_instance_from_file(name=name)
+            tour = NearestNeighbor(logging_level=50).solve(instance=instance)
+            spatial_tour = NearestNeighbor(logging_level=50, spatial_index=True).solve(instance=instance)
+            self.assertEqual(spatial_tour.indices.tolist(), tour.indices.tolist())
+
+        # Spherical instances fall back to scanning all nodes
+        instance = create_instance_from_file(name='burma14')
+        with self.assertRaises(ValueError):
+            SpatialGrid(instance)
+        self.assertEqual(NearestNeighbor(logging_level=50, spatial_index=True).solve(instance=instance).get_total_weight(), 4048)
+
     def test_solve_permutation(self):
         from pytsp.structures.Instance import create_instance_from_file
         from pytsp.methods.permutations import Permutations
@@ -197,5 +1039,78 @@ class UnitTests(unittest.TestCase):
         self.assertEqual(len(my_experiment.df_results), 4) # Assert the type, which should be a dataframe
 
 
+class EdgeWeightParityTests(unittest.TestCase):
+    """
+    Checks that the vectorized distance functions reproduce tsplib95 exactly on all bundled TSPLIB files.
+    """
+
+    def test_vectorized_weights_match_tsplib95(self):
+        from pathlib import Path
+        import numpy as np
+        import tsplib95
+        from pytsp.structures import distances
+
+        paths = sorted((Path(__file__).resolve().parent / "pytsp" / "data" / "TSPLIB").glob("*.tsp"))
+        self.assertEqual(len(paths), 111)
+
+        for path in paths:
+            with self.subTest(instance=path.stem):
+                problem = tsplib95.load(path)
+                if problem.edge_weight_type not in distances.TYPES:
+                    continue
+
+                nodes = list(problem.get_nodes())
+                coordinates = np.array([problem.node_coords[n] for n in nodes], dtype=np.float64)
+                n = len(nodes)
+
+                if n <= 200:
+                    # Compare the whole matrix for small instances
+                    weights = distances.compute_weights(problem.edge_weight_type, coordinates)
+                    expected = [[problem.get_weight(i, j) for j in nodes] for i in nodes]
+                else:
+                    # Compare a block of rows plus random node pairs for larger instances
+                    rng = np.random.default_rng(seed=0)
+                    rows = rng.choice(n, size=2, replace=False)
+                    columns = rng.integers(0, n, size=(2, 5000))
+                    weights = np.concatenate((
+                        distances.compute_weights(problem.edge_weight_type, coordinates, rows).ravel(),
+                        distances.compute_pairwise_weights(problem.edge_weight_type, coordinates[columns[0]], coordinates[columns[1]])
+                    ))
+                    expected = [problem.get_weight(nodes[i], nodes[j]) for i in rows for j in range(n)]
+                    expected += [problem.get_weight(nodes[i], nodes[j]) for i, j in zip(*columns)]
+
+                np.testing.assert_array_equal(weights, np.array(expected))
+
+    def test_native_parser_matches_tsplib95(self):
+        from pathlib import Path
+        import numpy as np
+        import tsplib95
+        from pytsp.structures.tsplib import read_tsplib, TSPLIBData
+
+        for path in sorted((Path(__file__).resolve().parent / "pytsp" / "data" / "TSPLIB").glob("*.tsp")):
+            with self.subTest(instance=path.stem):
+                data = read_tsplib(path)
+                expected = TSPLIBData.from_problem(tsplib95.load(path))
+
+                self.assertEqual(data.name, expected.name)
+                self.assertEqual(data.edge_weight_type, expected.edge_weight_type)
+                np.testing.assert_array_equal(data.node_ids, expected.node_ids)
+                for section in ["node_coords", "display_data", "edge_weights"]:
+                    if getattr(expected, section) is None:
+                        self.assertIsNone(getattr(data, section))
+                    else:
+                        np.testing.assert_array_equal(getattr(data, section), getattr(expected, section))
+
+    def test_instance_matrix_matches_tsplib95(self):
+        from pytsp.structures.Instance import create_instance_from_file
+
+        # Covers a vectorized (GEO, EUC_2D, ATT) and an explicit (UPPER_ROW, LOWER_DIAG_ROW) instance each
+        for name in ["burma14", "berlin52", "att48", "bayg29", "gr24"]:
+            with self.subTest(instance=name):
+                my_instance = create_instance_from_file(name=name)
+                expected = [[my_instance.TSPLIB.get_weight(i, j) for j in my_instance.index_to_id] for i in my_instance.index_to_id]
+                self.assertEqual(my_instance.get_full_cost_matrix(), expected)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file